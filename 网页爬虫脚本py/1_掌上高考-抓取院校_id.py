@@ -1,13 +1,28 @@
+import asyncio
 import calendar
 from datetime import date
 
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-from playwright_utils import launch_browser, wait_for_manual_login
+from playwright.async_api import async_playwright
+from playwright_utils import (
+    close_browser,
+    close_browser_async,
+    install_resource_blocking,
+    install_resource_blocking_async,
+    launch_browser,
+    launch_browser_async,
+    wait_for_manual_login,
+    wait_for_manual_login_async,
+)
+from gaokao_http import GaokaoSchoolInfoClient, build_cookie_header
 import pandas as pd
 import os
 import time
 import random
 import csv
+import io
+import heapq
+from collections import deque
 
 
 SCHOOL_NAME_SELECTOR = "div.school-tab_name__3pOZK"
@@ -17,19 +32,235 @@ CSV_HEADER = ["院校名称", "代码", "状态", "错误信息", "日期"]
 DONE_STATUSES = frozenset({"成功", "无效"})
 FRESH_MONTHS = 6
 
+# 逐条结果先追加到 journal（每条 O(1) 写入），累计到阈值或退出时再合并回主 CSV
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_COMPACT_EVERY = 200
+FILE_WRITE_MAX_RETRIES = 5
+FILE_WRITE_RETRY_DELAY_SEC = 0.3
+
+# 并发开关：True 时启用多标签页异步并发（共享同一登录态）；False 时单标签页顺序执行
+ENABLE_CONCURRENT = False
+CONCURRENT_WORKERS = 4
+
+# 资源拦截：屏蔽图片 / 字体 / 视频 / 统计广告脚本，结束时打印拦截统计
+ENABLE_RESOURCE_BLOCKING = True
+
+# 免渲染快速通道：先用 HTTP 直接请求院校 JSON 解析校名，结论不明确时才回退浏览器
+ENABLE_HTTP_FAST_PATH = True
+
+# 自适应 ID 范围：按历史结果划分 ID 段，空段只抽样探测；扫到顶后继续向上扩展，
+# 直到最后一个成功 ID 之后连续 MAX_CONSECUTIVE_INVALID 个 ID 都无院校为止
+INITIAL_ID_RANGE = 4000
+ID_BAND_SIZE = 100
+EMPTY_BAND_MIN_KNOWN = 50
+EMPTY_BAND_PROBE_STEP = 10
+MAX_CONSECUTIVE_INVALID = 300
+
+# 增量刷新：设为分钟数（如 30）时不做全量扫描，只在时间预算内按「日期」从旧到新
+# 重拉已有记录（失败行优先），每行抓取后写入当天日期；None 表示常规全量扫描
+REFRESH_BUDGET_MINUTES = None
+
 # 是否按「日期」跳过：True=半年内成功/无效跳过；False=只看状态，成功/无效一律跳过（不校验日期）
 ENABLE_DATE_SKIP = False
 
 
+def _code_sort_key(code):
+    return (0, int(code), "") if code.isdigit() else (1, 0, code)
+
+
+class IdSweepPlanner:
+    """
+    自适应 ID 调度：
+
+    1. 已知有院校（成功）且需重拉的 ID 最先处理；
+    2. 有院校的 ID 段 / 未探测过的 ID 段，按 ID 顺序全量处理；
+    3. 历史上全部无效的「空段」只抽样探测（每次运行按日期轮换抽样位置），
+       探测到成功后才把该段剩余 ID 补入队列；
+    4. 队列耗尽后从已知最大 ID 继续向上扩展，直到最后一个成功 ID 之后
+       连续 max_consecutive_invalid 个 ID 都没有院校。
+
+    next_id() 返回 None 且 has_in_flight() 为 False 时调度结束；
+    并发 worker 在 None 但仍有在途 ID 时应稍后重试（在途 ID 可能扩展范围）。
+    """
+
+    def __init__(
+        self,
+        records,
+        should_process,
+        id_range=INITIAL_ID_RANGE,
+        band_size=ID_BAND_SIZE,
+        empty_band_min_known=EMPTY_BAND_MIN_KNOWN,
+        probe_step=EMPTY_BAND_PROBE_STEP,
+        max_consecutive_invalid=MAX_CONSECUTIVE_INVALID,
+    ):
+        self.band_size = band_size
+        self.max_consecutive_invalid = max_consecutive_invalid
+        self._should_process = should_process
+        self._queue = deque()
+        self._deferred = {}
+        self._in_flight = set()
+
+        known_ids = [int(code) for code in records if code.isdigit()]
+        valid_ids = [
+            int(code)
+            for code, record in records.items()
+            if code.isdigit() and record[2] == "成功"
+        ]
+        self.top_id = max([id_range, *known_ids])
+        self._max_valid_id = max(valid_ids, default=0)
+        self._frontier = self.top_id + 1
+
+        empty_bands = self._find_empty_bands(records, empty_band_min_known)
+        probe_offset = date.today().toordinal() % probe_step
+
+        known_valid, ordinary, probes = [], [], []
+        for school_id in range(1, self.top_id + 1):
+            if not should_process(school_id):
+                continue
+
+            record = records.get(str(school_id))
+            band = self._band_of(school_id)
+            if record and record[2] == "成功":
+                known_valid.append(school_id)
+            elif band not in empty_bands:
+                ordinary.append(school_id)
+            elif school_id % probe_step == probe_offset:
+                probes.append(school_id)
+            else:
+                self._deferred.setdefault(band, []).append(school_id)
+
+        self._queue.extend(known_valid + ordinary + probes)
+        self.planned_count = len(self._queue)
+        self.deferred_count = sum(len(ids) for ids in self._deferred.values())
+        self.empty_band_count = len(empty_bands)
+
+    def describe(self):
+        return (
+            f"空 ID 段 {self.empty_band_count} 个，仅抽样探测，"
+            f"暂缓 {self.deferred_count} 个；扫到 {self.top_id} 后"
+            f"继续扩展，直到连续 {self.max_consecutive_invalid} 个 ID 无院校"
+        )
+
+    def _band_of(self, school_id):
+        return (school_id - 1) // self.band_size
+
+    def _find_empty_bands(self, records, min_known):
+        band_stats = {}
+        for code, record in records.items():
+            if not code.isdigit():
+                continue
+            stats = band_stats.setdefault(self._band_of(int(code)), [0, 0])
+            if record[2] == "成功":
+                stats[0] += 1
+            elif record[2] == "无效":
+                stats[1] += 1
+
+        return {
+            band
+            for band, (valid_count, invalid_count) in band_stats.items()
+            if valid_count == 0 and invalid_count >= min_known
+        }
+
+    def next_id(self):
+        if self._queue:
+            school_id = self._queue.popleft()
+            self._in_flight.add(school_id)
+            return school_id
+
+        while self._frontier <= self._max_valid_id + self.max_consecutive_invalid:
+            school_id = self._frontier
+            self._frontier += 1
+            self.top_id = max(self.top_id, school_id)
+            if self._should_process(school_id):
+                self._in_flight.add(school_id)
+                return school_id
+
+        return None
+
+    def has_in_flight(self):
+        return bool(self._in_flight)
+
+    def report(self, school_id, status):
+        self._in_flight.discard(school_id)
+        if status != "成功":
+            return
+
+        self._max_valid_id = max(self._max_valid_id, school_id)
+        band_ids = self._deferred.pop(self._band_of(school_id), None)
+        if band_ids:
+            print(f"【调度】空段探测到院校 {school_id}，补扫该段剩余 {len(band_ids)} 个 ID")
+            self._queue.extend(band_ids)
+
+
+class RefreshPlanner:
+    """
+    按时间预算增量刷新：用优先队列按「日期」从旧到新取已有记录，
+    失败行和无日期的行最先；预算用完后不再派发新 ID（在途 ID 照常完成）。
+    接口与 IdSweepPlanner 一致。
+    """
+
+    def __init__(self, records, parse_record_date, budget_minutes):
+        self.budget_minutes = budget_minutes
+        self._deadline = None
+        self._in_flight = set()
+        self._heap = []
+
+        for code, record in records.items():
+            if not code.isdigit():
+                continue
+            record_date = parse_record_date(record[4]) or date.min
+            is_failed = record[2] not in DONE_STATUSES
+            self._heap.append((not is_failed, record_date, int(code)))
+        heapq.heapify(self._heap)
+
+        self.planned_count = len(self._heap)
+        self.oldest_date = min((item[1] for item in self._heap), default=None)
+        self.top_id = max((item[2] for item in self._heap), default=0)
+
+    def describe(self):
+        oldest = "无日期" if self.oldest_date == date.min else self.oldest_date
+        return (
+            f"增量刷新模式：预算 {self.budget_minutes} 分钟，"
+            f"按日期从旧到新重拉（最旧 {oldest}）"
+        )
+
+    def next_id(self):
+        if self._deadline is None:
+            self._deadline = time.monotonic() + self.budget_minutes * 60
+
+        if not self._heap or time.monotonic() >= self._deadline:
+            return None
+
+        school_id = heapq.heappop(self._heap)[2]
+        self._in_flight.add(school_id)
+        return school_id
+
+    def has_in_flight(self):
+        return bool(self._in_flight)
+
+    def report(self, school_id, status):
+        self._in_flight.discard(school_id)
+
+    def remaining_count(self):
+        return len(self._heap)
+
+
 class UniversityScraper:
     def __init__(
         self,
-        num_urls,
+        id_range,
         save_csv_path,
         save_excel_path,
         base_dir,
+        enable_concurrent=ENABLE_CONCURRENT,
+        concurrent_workers=CONCURRENT_WORKERS,
+        enable_http_fast_path=ENABLE_HTTP_FAST_PATH,
+        enable_resource_blocking=ENABLE_RESOURCE_BLOCKING,
+        refresh_budget_minutes=REFRESH_BUDGET_MINUTES,
     ):
-        self.num_urls = num_urls
+        self.id_range = id_range
+        self.refresh_budget_minutes = refresh_budget_minutes
+        self.planner = None
         self.page = None
         self.context = None
         self.playwright = None
@@ -37,6 +268,18 @@ class UniversityScraper:
         self.save_csv_path = save_csv_path
         self.save_excel_path = save_excel_path
         self.base_dir = base_dir
+        self.enable_concurrent = enable_concurrent
+        self.concurrent_workers = max(1, concurrent_workers if enable_concurrent else 1)
+        self.enable_http_fast_path = enable_http_fast_path
+        self.enable_resource_blocking = enable_resource_blocking
+        self.resource_blocker = None
+        self.http_client = None
+        self._fast_path_hits = 0
+        self._browser_fallbacks = 0
+        self.journal_path = f"{save_csv_path}{JOURNAL_SUFFIX}"
+        self._journal_pending = 0
+        # 异步模式下由 _journal_writer 单独写 journal，worker 只把记录放进队列
+        self._journal_queue = None
 
         self._load_existing_results()
 
@@ -104,6 +347,32 @@ class UniversityScraper:
             if code:
                 self.records[code] = normalized
 
+    def _replay_journal(self):
+        """
+        把上次未合并的 journal 记录覆盖到内存，崩溃时最多丢最后一条：
+        末尾没有换行的半行直接丢弃，列数与 CSV_HEADER 不一致的行也不回放。
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        # 半行可能截断在多字节字符中间，按 replace 解码，随后整行丢弃
+        with open(
+            self.journal_path, newline="", encoding="utf-8", errors="replace"
+        ) as journal_file:
+            content = journal_file.read()
+
+        if not content.endswith("\n"):
+            content = content[: content.rfind("\n") + 1]
+
+        rows = [
+            row
+            for row in csv.reader(io.StringIO(content, newline=""))
+            if len(row) == len(CSV_HEADER)
+        ]
+
+        self._load_rows_into_records(rows)
+        return len(rows)
+
     def _load_existing_results(self):
         if os.path.exists(self.save_csv_path):
             with open(self.save_csv_path, newline="", encoding="utf-8-sig") as csvfile:
@@ -117,23 +386,34 @@ class UniversityScraper:
         else:
             print("未找到已存在的结果文件，从头开始")
 
-        pending_count = sum(
-            1 for school_id in range(1, self.num_urls + 1) if self._should_process(school_id)
-        )
-        done_count = sum(
-            1
-            for school_id in range(1, self.num_urls + 1)
-            if self._is_fresh_done(self.records.get(str(school_id)))
-        )
+        replayed = self._replay_journal()
+        if replayed:
+            print(f"已从 journal 回放 {replayed} 条未合并记录")
+            self._compact_journal()
+
+        self.planner = self._build_planner()
+        done_count = sum(1 for record in self.records.values() if self._is_fresh_done(record))
 
         skip_hint = "超过半年数据重拉" if ENABLE_DATE_SKIP else "不校验日期"
         done_hint = "半年内已完成" if ENABLE_DATE_SKIP else "已完成（不校验日期）"
 
         print(
             f"已加载 {len(self.records)} 条记录，"
-            f"待处理 {pending_count} 条（含失败重试、{skip_hint}），"
+            f"待处理 {self.planner.planned_count} 条（含失败重试、{skip_hint}），"
             f"{done_hint} {done_count} 条（成功 + 无效）"
         )
+        print(self.planner.describe())
+
+    def _build_planner(self):
+        if self.refresh_budget_minutes:
+            return RefreshPlanner(
+                self.records, self._parse_record_date, self.refresh_budget_minutes
+            )
+        return IdSweepPlanner(self.records, self._should_process, self.id_range)
+
+    def _print_refresh_summary(self):
+        if isinstance(self.planner, RefreshPlanner):
+            print(f"【刷新】预算内已完成，剩余 {self.planner.remaining_count()} 条待下次刷新")
 
     def _should_process(self, school_id):
         record = self.records.get(str(school_id))
@@ -145,6 +425,37 @@ class UniversityScraper:
         self.playwright = sync_playwright().start()
         self.context, self.page = launch_browser(self.playwright, self.base_dir)
         wait_for_manual_login(self.page)
+        # 登录完成后再装拦截：登录二维码 / 验证码图片不能被替换成透明图
+        if self.enable_resource_blocking:
+            self.resource_blocker = install_resource_blocking(self.context, "gaokao.cn")
+        self._init_http_client(self.context.cookies())
+
+    def _init_http_client(self, cookies):
+        """登录完成后从持久化 profile 导出 cookie，供 HTTP 快速通道复用。"""
+        if not self.enable_http_fast_path:
+            return
+
+        self.http_client = GaokaoSchoolInfoClient(cookie_header=build_cookie_header(cookies))
+        print("【提示】已启用 HTTP 快速通道，浏览器仅在结论不明确时兜底")
+
+    def _print_resource_summary(self):
+        if self.resource_blocker:
+            print(self.resource_blocker.summary())
+
+    def _close_http_client(self):
+        if self.http_client:
+            self.http_client.close()
+            print(
+                f"【统计】HTTP 快速通道命中 {self._fast_path_hits} 个，"
+                f"回退浏览器 {self._browser_fallbacks} 个"
+            )
+
+    def _count_fast_path_result(self, resolved):
+        if resolved:
+            self._fast_path_hits += 1
+        else:
+            self._browser_fallbacks += 1
+        return resolved
 
     def _normalize_url(self, url):
         return url.split("?")[0].rstrip("/")
@@ -157,36 +468,124 @@ class UniversityScraper:
 
     def _save_record(self, row):
         self.records[row[1]] = row
-        self._flush_csv()
 
-    def _flush_csv(self):
-        with open(self.save_csv_path, "w", newline="", encoding="utf-8-sig") as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(CSV_HEADER)
+        if self.planner and row[1].isdigit():
+            self.planner.report(int(row[1]), row[2])
 
-            for school_id in range(1, self.num_urls + 1):
-                record = self.records.get(str(school_id))
-                if record:
-                    writer.writerow(record)
+        if self._journal_queue is not None:
+            self._journal_queue.put_nowait(row)
+            return
+
+        self._append_journal([row])
+        if self._journal_pending >= JOURNAL_COMPACT_EVERY:
+            self._compact_journal()
+
+    def _append_journal(self, rows):
+        with open(self.journal_path, "a", newline="", encoding="utf-8") as journal_file:
+            csv.writer(journal_file).writerows(rows)
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+        self._journal_pending += len(rows)
+
+    async def _journal_writer(self):
+        """
+        异步模式下唯一的 journal 写入者：把队列里已有的记录攒成一批，
+        追加（含 fsync）与定期合并都放到线程池执行，不阻塞各标签页。
+        合并用的是入线程前在事件循环里取的 records 快照；快照之后的记录随后追加进新 journal。
+        """
+        stopping = False
+        while not stopping:
+            rows = [await self._journal_queue.get()]
+            while not self._journal_queue.empty():
+                rows.append(self._journal_queue.get_nowait())
+            if None in rows:
+                stopping = True
+                rows = [row for row in rows if row is not None]
+            if not rows:
+                continue
+
+            try:
+                await asyncio.to_thread(self._append_journal, rows)
+            except OSError as err:
+                print(f"【警告】journal 写入失败，{len(rows)} 条记录仅保留在内存: {err}")
+                continue
+
+            if self._journal_pending >= JOURNAL_COMPACT_EVERY:
+                await asyncio.to_thread(self._compact_journal, dict(self.records))
+
+    def _compact_journal(self, records=None):
+        """journal 合并进主 CSV；主 CSV 被 Excel 占用时保留 journal，下次再合并。"""
+        try:
+            self._flush_csv(records)
+        except PermissionError as err:
+            print(f"【警告】主 CSV 被占用，journal 暂不合并，稍后重试: {err}")
+            self._journal_pending = 0
+            return False
+
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self._journal_pending = 0
+        return True
+
+    def _flush_csv(self, records=None):
+        if records is None:
+            records = self.records
+        temp_path = f"{self.save_csv_path}.tmp"
+        last_err = None
+
+        for attempt in range(FILE_WRITE_MAX_RETRIES):
+            try:
+                with open(temp_path, "w", newline="", encoding="utf-8-sig") as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(CSV_HEADER)
+
+                    for code in sorted(records, key=_code_sort_key):
+                        writer.writerow(records[code])
+
+                os.replace(temp_path, self.save_csv_path)
+                return
+            except PermissionError as err:
+                last_err = err
+                if attempt < FILE_WRITE_MAX_RETRIES - 1:
+                    time.sleep(FILE_WRITE_RETRY_DELAY_SEC * (attempt + 1))
+            finally:
+                if os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+
+        raise last_err
 
     def _throttle(self):
         time.sleep(random.uniform(0.01, 0.32))
 
-    def _wait_for_page_loaded(self, timeout_ms=1600):
-        self.page.wait_for_selector(PAGE_LOADED_SELECTOR, timeout=timeout_ms)
+    async def _throttle_async(self):
+        await asyncio.sleep(random.uniform(0.01, 0.32))
 
-    def _resolve_school_page(self, url):
-        """导航 logo 出现即视为页面加载完成，再判断首页/校名/无效。"""
-        self._wait_for_page_loaded()
+    def _build_school_url(self, school_id):
+        return f"https://www.gaokao.cn/school/{school_id}"
 
-        current_url = self.page.url
+    def _wait_for_page_loaded(self, timeout_ms=1600):
+        self.page.wait_for_selector(PAGE_LOADED_SELECTOR, timeout=timeout_ms)
 
+    def _classify_loaded_page(self, current_url, url):
         if self._is_homepage(current_url):
             return "invalid", "ID不存在"
 
         if self._normalize_url(current_url) != self._normalize_url(url):
             return "failed", "页面跳转失败"
 
+        return None
+
+    def _resolve_school_page(self, url):
+        """导航 logo 出现即视为页面加载完成，再判断首页/校名/无效。"""
+        self._wait_for_page_loaded()
+
+        classified = self._classify_loaded_page(self.page.url, url)
+        if classified:
+            return classified
+
         try:
             self.page.wait_for_selector(SCHOOL_NAME_SELECTOR, timeout=1500)
             school_name = self.page.locator(SCHOOL_NAME_SELECTOR).first.inner_text().strip()
@@ -197,68 +596,200 @@ class UniversityScraper:
 
         return "invalid", "ID不存在"
 
-    def _process_url(self, school_id):
+    async def _resolve_school_page_async(self, page, url):
+        """_resolve_school_page 的 async 版本，判断规则完全一致。"""
+        await page.wait_for_selector(PAGE_LOADED_SELECTOR, timeout=1600)
+
+        classified = self._classify_loaded_page(page.url, url)
+        if classified:
+            return classified
+
+        try:
+            await page.wait_for_selector(SCHOOL_NAME_SELECTOR, timeout=1500)
+            school_name = (
+                await page.locator(SCHOOL_NAME_SELECTOR).first.inner_text()
+            ).strip()
+            if school_name:
+                return "success", school_name
+        except PlaywrightTimeoutError:
+            pass
+
+        return "invalid", "ID不存在"
+
+    def _save_resolved_result(self, school_id, status, payload, log_prefix=""):
+        """按解析结果写记录；返回是否需要节流（无效 ID 立刻扫下一个）。"""
         school_code = str(school_id)
-        url = f"https://www.gaokao.cn/school/{school_id}"
+
+        if status == "invalid":
+            self._save_record(self._build_record("", school_code, "无效", payload))
+            print(f"{log_prefix}[{school_id}/{self.planner.top_id}] {school_code} 无效（ID无院校）")
+            return False
+
+        if status == "success":
+            self._save_record(self._build_record(payload, school_code, "成功"))
+            print(f"{log_prefix}[{school_id}/{self.planner.top_id}] {school_code} {payload}")
+            return True
+
+        self._save_record(self._build_record("", school_code, "失败", payload))
+        self._log_fail(school_code, payload)
+        return True
+
+    def _save_failed_result(self, school_id, error):
+        if isinstance(error, PlaywrightTimeoutError):
+            error_msg = "页面加载超时"
+        else:
+            error_msg = str(error).split("\n")[0]
+
+        school_code = str(school_id)
+        self._save_record(self._build_record("", school_code, "失败", error_msg))
+        self._log_fail(school_code, error_msg)
+
+    def _process_url(self, school_id):
+        url = self._build_school_url(school_id)
         need_throttle = True
 
         try:
+            if self.http_client:
+                resolved = self._count_fast_path_result(self.http_client.resolve(school_id))
+                if resolved:
+                    need_throttle = self._save_resolved_result(school_id, *resolved)
+                    return
+
             self.page.goto(url, wait_until="domcontentloaded", timeout=3000)
             status, payload = self._resolve_school_page(url)
+            need_throttle = self._save_resolved_result(school_id, status, payload)
+        except Exception as e:
+            self._save_failed_result(school_id, e)
+        finally:
+            if need_throttle:
+                self._throttle()
 
-            if status == "invalid":
-                self._save_record(self._build_record("", school_code, "无效", payload))
-                print(f"[{school_id}/{self.num_urls}] {school_code} 无效（ID无院校）")
-                need_throttle = False
-                return
-
-            if status == "success":
-                self._save_record(self._build_record(payload, school_code, "成功"))
-                print(f"[{school_id}/{self.num_urls}] {school_code} {payload}")
-                return
-
-            self._save_record(self._build_record("", school_code, "失败", payload))
-            self._log_fail(school_code, payload)
+    async def _process_url_async(self, page, school_id, worker_id):
+        url = self._build_school_url(school_id)
+        need_throttle = True
 
-        except PlaywrightTimeoutError:
-            self._save_record(self._build_record("", school_code, "失败", "页面加载超时"))
-            self._log_fail(school_code, "页面加载超时")
+        try:
+            if self.http_client:
+                resolved = self._count_fast_path_result(
+                    await asyncio.to_thread(self.http_client.resolve, school_id)
+                )
+                if resolved:
+                    need_throttle = self._save_resolved_result(
+                        school_id, *resolved, log_prefix=f"[W{worker_id}] "
+                    )
+                    return
+
+            await page.goto(url, wait_until="domcontentloaded", timeout=3000)
+            status, payload = await self._resolve_school_page_async(page, url)
+            need_throttle = self._save_resolved_result(
+                school_id, status, payload, log_prefix=f"[W{worker_id}] "
+            )
         except Exception as e:
-            error_msg = str(e).split("\n")[0]
-            self._save_record(self._build_record("", school_code, "失败", error_msg))
-            self._log_fail(school_code, error_msg)
+            self._save_failed_result(school_id, e)
         finally:
             if need_throttle:
-                self._throttle()
+                await self._throttle_async()
+
+    async def _worker(self, worker_id, page):
+        while True:
+            school_id = self.planner.next_id()
+            if school_id is None:
+                if not self.planner.has_in_flight():
+                    break
+                # 其他 worker 的在途结果可能继续向上扩展范围
+                await asyncio.sleep(0.2)
+                continue
+
+            await self._process_url_async(page, school_id, worker_id)
+
+    async def _init_worker_pages(self, context, login_page):
+        """登录后创建 worker 标签页，全部共享同一个持久化登录上下文。"""
+        worker_pages = [login_page]
+        for _ in range(1, self.concurrent_workers):
+            worker_pages.append(await context.new_page())
+
+        print(f"【浏览器】已打开 {len(worker_pages)} 个并发标签页")
+        return worker_pages
+
+    async def _scrape_async(self):
+        async with async_playwright() as playwright:
+            context, login_page = await launch_browser_async(playwright, self.base_dir)
+
+            try:
+                await wait_for_manual_login_async(login_page)
+                # 登录完成后再装拦截：登录二维码 / 验证码图片不能被替换成透明图
+                if self.enable_resource_blocking:
+                    self.resource_blocker = await install_resource_blocking_async(
+                        context, "gaokao.cn"
+                    )
+                self._init_http_client(await context.cookies())
+                worker_pages = await self._init_worker_pages(context, login_page)
+
+                print(
+                    f"开始抓取，计划 {self.planner.planned_count} 个 ID，"
+                    f"模式：并发 {self.concurrent_workers} 标签页"
+                )
+                self._journal_queue = asyncio.Queue()
+                journal_task = asyncio.create_task(self._journal_writer())
+                workers = [
+                    asyncio.create_task(
+                        self._worker(worker_id + 1, worker_pages[worker_id])
+                    )
+                    for worker_id in range(self.concurrent_workers)
+                ]
+                try:
+                    await asyncio.gather(*workers)
+                finally:
+                    self._journal_queue.put_nowait(None)
+                    await journal_task
+                    self._journal_queue = None
+            finally:
+                await close_browser_async(context)
+                self._close_http_client()
+                self._print_resource_summary()
 
     def scrape(self):
+        if self.enable_concurrent:
+            try:
+                asyncio.run(self._scrape_async())
+            finally:
+                self._compact_journal()
+                self._print_refresh_summary()
+            return
+
         self._init_browser()
 
         try:
-            for school_id in range(1, self.num_urls + 1):
-                if not self._should_process(school_id):
-                    continue
+            while True:
+                school_id = self.planner.next_id()
+                if school_id is None:
+                    break
 
                 self._process_url(school_id)
         finally:
             if self.context:
-                self.context.close()
+                close_browser(self.context)
             if self.playwright:
                 self.playwright.stop()
 
-            self._flush_csv()
+            self._close_http_client()
+            self._print_resource_summary()
+            self._compact_journal()
+            self._print_refresh_summary()
 
 
 if __name__ == "__main__":
     current_dir = os.path.dirname(os.path.abspath(__file__))
-    num_urls = 4000
     save_csv_path = os.path.join(current_dir, "高考教育院校id_map_表.csv")
     save_excel_path = os.path.join(current_dir, "高考教育院校id_map_表.xlsx")
 
     scraper = UniversityScraper(
-        num_urls,
+        INITIAL_ID_RANGE,
         save_csv_path,
         save_excel_path,
         current_dir,
+        enable_concurrent=ENABLE_CONCURRENT,
+        concurrent_workers=CONCURRENT_WORKERS,
+        refresh_budget_minutes=REFRESH_BUDGET_MINUTES,
     )
     scraper.scrape()
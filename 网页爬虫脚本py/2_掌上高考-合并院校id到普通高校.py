@@ -1,4 +1,7 @@
 import os
+import pickle
+import re
+from collections import Counter, defaultdict
 
 import pandas as pd
 
@@ -6,6 +9,27 @@ import pandas as pd
 ID_COLUMN = "id"
 CAMPUS_KEYWORD = "校区"
 
+# 模糊候选：仅为末尾新增行给出建议，不自动改写 id
+ENABLE_FUZZY_CANDIDATES = True
+CANDIDATE_NAME_COLUMN = "候选学校名称"
+CANDIDATE_SCORE_COLUMN = "候选得分"
+CANDIDATE_REVIEW_COLUMN = "需人工复核"
+FUZZY_MIN_SCORE = 0.5  # 低于此分不给候选
+FUZZY_ACCEPT_SCORE = 0.9  # 达到此分视为高置信，无需复核
+FUZZY_MAX_POSTING = 300  # 出现次数超过此值的 bigram（如「大学」「学院」）不参与召回
+FUZZY_TOP_K = 20  # 每个名称只对共享 bigram 最多的前 K 个候选精算得分
+
+BRACKET_TRANSLATION = str.maketrans({"（": "(", "）": ")", "【": "(", "】": ")", "[": "(", "]": ")"})
+BRACKET_CONTENT_PATTERN = re.compile(r"\([^()]*\)")
+CAMPUS_SUFFIX_PATTERN = re.compile(r"(?<=大学|学院)[一-龥]{1,8}校区$")
+
+# 合并缓存：输入无变化时跳过整次合并与写出；只有 id_map 变化时按与上次的差异
+# 只改写受影响的普通高校行、只为新出现的新增行校名计算模糊候选，其余沿用上次的合并结果
+ENABLE_MERGE_CACHE = True
+MERGE_STATE_SUFFIX = ".merge_state.pkl"  # 挂在输出文件旁
+XLS_CACHE_SUFFIX = ".cache.pkl"  # 挂在 普通高校.xls 旁，按 mtime/大小 失效
+MERGE_STATE_VERSION = 2
+
 
 def normalize_name(name):
     if pd.isna(name):
@@ -14,6 +38,101 @@ def normalize_name(name):
     return str(name).replace(" ", "").replace("　", "").strip()
 
 
+def normalize_name_series(names):
+    """normalize_name 的向量化版本。"""
+    return (
+        names.fillna("")
+        .astype(str)
+        .str.replace(" ", "", regex=False)
+        .str.replace("　", "", regex=False)
+        .str.strip()
+    )
+
+
+def canonical_name(name):
+    """统一全角 / 半角括号并去空格，作为模糊比对的基础形式。"""
+    return normalize_name(name).translate(BRACKET_TRANSLATION)
+
+
+def alias_name(name):
+    """别名形式：去掉括号内容（如「（原××学院）」「（威海）」）和末尾「××校区」。"""
+    alias = BRACKET_CONTENT_PATTERN.sub("", canonical_name(name))
+    return CAMPUS_SUFFIX_PATTERN.sub("", alias) or alias
+
+
+def name_bigrams(name):
+    if len(name) < 2:
+        return {name} if name else set()
+    return {name[i : i + 2] for i in range(len(name) - 1)}
+
+
+class NameCandidateIndex:
+    """
+    普通高校名称的字符 bigram 倒排索引。
+
+    查询时只召回与之共享「低频」bigram 的学校（高频的「大学」「学院」不参与召回），
+    再对共享 bigram 最多的前 FUZZY_TOP_K 个候选计算 Dice 系数，避免两两全量比较。
+    别名形式（去括号 / 去校区后缀）完全相同的候选额外保底 ALIAS_SCORE 分。
+    """
+
+    ALIAS_SCORE = 0.85
+
+    def __init__(self, names, max_posting=FUZZY_MAX_POSTING, top_k=FUZZY_TOP_K):
+        self.names = list(names)
+        self.top_k = top_k
+        self._grams = [name_bigrams(canonical_name(name)) for name in self.names]
+        self._alias_index = defaultdict(list)
+        postings = defaultdict(list)
+        for position, name in enumerate(self.names):
+            self._alias_index[alias_name(name)].append(position)
+            for gram in name_bigrams(alias_name(name)):
+                postings[gram].append(position)
+        self._postings = {
+            gram: positions for gram, positions in postings.items() if len(positions) <= max_posting
+        }
+
+    def best_match(self, name):
+        """返回 (候选名称, 得分)；无可用候选时返回 (None, 0.0)。"""
+        query_grams = name_bigrams(canonical_name(name))
+        query_alias = alias_name(name)
+
+        shared = Counter()
+        for gram in name_bigrams(query_alias):
+            shared.update(self._postings.get(gram, ()))
+        candidates = {position for position, _ in shared.most_common(self.top_k)}
+        alias_hits = set(self._alias_index.get(query_alias, ()))
+        candidates |= alias_hits
+
+        best_position, best_score = None, 0.0
+        for position in candidates:
+            grams = self._grams[position]
+            total = len(query_grams) + len(grams)
+            score = 2 * len(query_grams & grams) / total if total else 0.0
+            if position in alias_hits:
+                score = max(score, self.ALIAS_SCORE)
+            if score > best_score:
+                best_position, best_score = position, score
+
+        if best_position is None:
+            return None, 0.0
+        return self.names[best_position], round(best_score, 3)
+
+
+def build_candidate_columns(index, school_name):
+    candidate, score = index.best_match(school_name)
+    if candidate is None or score < FUZZY_MIN_SCORE:
+        return {
+            CANDIDATE_NAME_COLUMN: pd.NA,
+            CANDIDATE_SCORE_COLUMN: pd.NA,
+            CANDIDATE_REVIEW_COLUMN: "是",
+        }
+    return {
+        CANDIDATE_NAME_COLUMN: candidate,
+        CANDIDATE_SCORE_COLUMN: score,
+        CANDIDATE_REVIEW_COLUMN: "否" if score >= FUZZY_ACCEPT_SCORE else "是",
+    }
+
+
 def build_empty_row(columns, next_index, school_name, school_id):
     row = {col: pd.NA for col in columns if col != "_match_name"}
     row["序号"] = next_index
@@ -22,65 +141,350 @@ def build_empty_row(columns, next_index, school_name, school_id):
     return row
 
 
-def append_school_row(school_df, school_name, school_id):
+def build_appended_rows(school_df, new_rows, known_candidates=None):
+    """
+    新增行（校区 / 未匹配）并填模糊候选列；known_candidates（校名 -> 候选列）中已有的校名直接沿用，
+    只对其余校名建索引计算。返回 (新增行, 新算候选数)。
+    """
     next_index = int(school_df["序号"].max()) + 1 if len(school_df) else 1
-    new_row = build_empty_row(school_df.columns, next_index, school_name, school_id)
-    school_df = pd.concat([school_df, pd.DataFrame([new_row])], ignore_index=True)
-    school_df.loc[school_df.index[-1], "_match_name"] = normalize_name(school_name)
+    appended_rows = [
+        build_empty_row(school_df.columns, next_index + offset, school_name, school_id)
+        for offset, (school_name, school_id) in enumerate(new_rows)
+    ]
+    if not ENABLE_FUZZY_CANDIDATES:
+        return appended_rows, 0
+
+    known_candidates = known_candidates or {}
+    index = None
+    computed = 0
+    for row in appended_rows:
+        candidate = known_candidates.get(row["学校名称"])
+        if candidate is None:
+            if index is None:
+                index = NameCandidateIndex(school_df["学校名称"].dropna().astype(str))
+            candidate = build_candidate_columns(index, row["学校名称"])
+            computed += 1
+        row.update(candidate)
+    return appended_rows, computed
+
+
+def collect_candidates(appended_rows):
+    """新增行的 校名 -> 候选列，存入合并状态供下次沿用。"""
+    columns = (CANDIDATE_NAME_COLUMN, CANDIDATE_SCORE_COLUMN, CANDIDATE_REVIEW_COLUMN)
+    return {
+        row["学校名称"]: {column: row[column] for column in columns}
+        for row in appended_rows
+        if CANDIDATE_REVIEW_COLUMN in row
+    }
+
+
+def append_school_rows(school_df, new_rows):
+    """一次性追加所有新增行（校区 / 未匹配），避免逐行 concat 的平方级复制。"""
+    if not new_rows:
+        return school_df
+    return pd.concat([school_df, pd.DataFrame(new_rows)], ignore_index=True)
+
+
+def build_merge_plan(gaokao_df, school_df):
+    """
+    按 id_map 顺序逐行合并的语义，用哈希连接一次算完：
+
+    - 含「校区」的院校：每行都新增一行；
+    - 名称与普通高校表匹配：写入第一条同名行的 id（多条映射到同一行时后者覆盖）；
+    - 未匹配：同名院校只在首次出现时新增一行，之后的同名行（或更早新增的同名校区行）
+      视为匹配到该新增行并覆盖其 id。
+
+    返回 (基表行号 -> id, 新增行 [(学校名称, id)]，计数字典，匹配表 {代码: 目标行})。
+    匹配表中目标行为 ("base", 基表行号) 或 ("append", 新增行序号)。
+    """
+    items = pd.DataFrame(
+        {
+            "name": gaokao_df["院校名称"].to_numpy(),
+            "id": gaokao_df["代码"].astype(str).str.strip().to_numpy(),
+        }
+    )
+    items["norm"] = normalize_name_series(items["name"])
+    items["pos"] = range(len(items))
+    items["is_campus"] = items["name"].str.contains(CAMPUS_KEYWORD, regex=False)
+
+    base_first_index = (
+        school_df["_match_name"]
+        .reset_index()
+        .drop_duplicates("_match_name", keep="first")
+        .set_index("_match_name")["index"]
+    )
+
+    regular = items[~items["is_campus"]]
+    base_target = regular["norm"].map(base_first_index)
+    matched_base = regular[base_target.notna()].assign(target=base_target.dropna())
+    unmatched = regular[base_target.isna()]
+
+    # 未匹配行：同名的最早新增行（首个未匹配行或更早的同名校区行）即为其目标行
+    campus = items[items["is_campus"]]
+    first_campus_pos = campus.groupby("norm")["pos"].min()
+    first_unmatched_pos = unmatched.groupby("norm")["pos"].min()
+    target_pos = unmatched["norm"].map(first_unmatched_pos)
+    earlier_campus_pos = unmatched["norm"].map(first_campus_pos)
+    target_pos = target_pos.where(
+        earlier_campus_pos.isna() | (earlier_campus_pos > target_pos),
+        earlier_campus_pos,
+    ).astype(int)
+    unmatched = unmatched.assign(target_pos=target_pos)
+    creates = unmatched[unmatched["pos"] == unmatched["target_pos"]]
+    appended_matches = unmatched[unmatched["pos"] != unmatched["target_pos"]]
+
+    base_updates = (
+        matched_base.sort_values("pos")
+        .drop_duplicates("target", keep="last")
+        .set_index("target")["id"]
+    )
+    base_updates.index = base_updates.index.astype(school_df.index.dtype)
+
+    created = pd.concat([campus, creates]).sort_values("pos")
+    latest_ids = (
+        pd.concat(
+            [
+                created[["pos", "id"]].assign(target_pos=created["pos"]),
+                appended_matches[["pos", "id", "target_pos"]],
+            ]
+        )
+        .sort_values("pos")
+        .drop_duplicates("target_pos", keep="last")
+        .set_index("target_pos")["id"]
+    )
+    new_rows = [
+        (name, latest_ids[pos]) for name, pos in zip(created["name"], created["pos"])
+    ]
+
+    append_order = {pos: order for order, pos in enumerate(created["pos"])}
+    matches = {
+        code: ("base", int(target))
+        for code, target in zip(matched_base["id"], matched_base["target"])
+    }
+    matches.update(
+        (code, ("append", append_order[pos])) for code, pos in zip(created["id"], created["pos"])
+    )
+    matches.update(
+        (code, ("append", append_order[pos]))
+        for code, pos in zip(appended_matches["id"], appended_matches["target_pos"])
+    )
+
+    counters = {
+        "campus_added": len(campus),
+        "matched_updated": len(matched_base) + len(appended_matches),
+        "unmatched_added": len(creates),
+    }
+    return base_updates, new_rows, counters, matches
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_pickle(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def _dump_pickle(obj, path):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def load_school_table(xls_path):
+    """读取 普通高校.xls；解析结果按文件 mtime/大小 缓存为 pickle，未改动时免去 xlrd 解析。"""
+    cache_path = f"{xls_path}{XLS_CACHE_SUFFIX}"
+    key = _file_key(xls_path)
+    cached = _load_pickle(cache_path) if ENABLE_MERGE_CACHE else None
+    if isinstance(cached, dict) and cached.get("key") == key:
+        return cached["df"].copy()
+
+    school_df = pd.read_excel(xls_path)
+    if ENABLE_MERGE_CACHE:
+        try:
+            _dump_pickle({"key": key, "df": school_df}, cache_path)
+        except OSError as e:
+            print(f"【警告】普通高校表缓存写入失败，下次将重新解析：{e}")
     return school_df
 
 
+def build_row_fingerprints(gaokao_df):
+    """id_map 行指纹：按文件顺序的 代码 -> 院校名称（顺序参与合并语义，也一并比较）。"""
+    codes = gaokao_df["代码"].astype(str).str.strip()
+    return dict(zip(codes, gaokao_df["院校名称"]))
+
+
+def diff_merge_state(previous, fingerprints, matches):
+    """对比上次的指纹与匹配表，返回 (新增, 变更, 删除) 的代码列表。"""
+    old_rows = previous.get("rows", {}) if previous else {}
+    old_matches = previous.get("matches", {}) if previous else {}
+    inserted = [code for code in fingerprints if code not in old_rows]
+    removed = [code for code in old_rows if code not in fingerprints]
+    changed = [
+        code
+        for code in fingerprints
+        if code in old_rows
+        and (old_rows[code] != fingerprints[code] or old_matches.get(code) != matches.get(code))
+    ]
+    return inserted, changed, removed
+
+
+def affected_base_rows(previous, matches, inserted, changed, removed):
+    """差异涉及的普通高校行号：变更 / 删除映射的旧目标行与新增 / 变更映射的新目标行。"""
+    old_matches = previous.get("matches", {})
+    targets = [old_matches.get(code) for code in changed + removed]
+    targets += [matches.get(code) for code in inserted + changed]
+    return sorted({target[1] for target in targets if target and target[0] == "base"})
+
+
+def apply_merge_diff(base_df, school_df, base_updates, rows):
+    """
+    在上次合并后的普通高校表 base_df 上只改写 rows 这些行的 id：本次仍有映射的写本次 id，
+    不再有映射的恢复原表中的值。返回新表（不修改 base_df）。
+    """
+    merged = base_df.copy()
+    if rows:
+        merged.loc[rows, ID_COLUMN] = [
+            base_updates.get(row, school_df.at[row, ID_COLUMN]) for row in rows
+        ]
+    return merged
+
+
+def can_apply_merge_diff(previous, output_path, xls_key, fingerprints):
+    """
+    上次的合并结果可按差异修补：设置与普通高校表未变、输出文件未被改动，且仍在的映射相对顺序不变
+    （同一行有多条映射时后者覆盖，顺序变化会改变结果，此时完整重算）。
+    """
+    if not previous or "base_df" not in previous or not os.path.exists(output_path):
+        return False
+    old_rows = previous.get("rows", {})
+    return (
+        previous.get("settings") == build_state_settings()
+        and previous.get("xls_key") == xls_key
+        and previous.get("output_key") == _file_key(output_path)
+        and [code for code in old_rows if code in fingerprints]
+        == [code for code in fingerprints if code in old_rows]
+    )
+
+
+def build_state_settings():
+    return {
+        "version": MERGE_STATE_VERSION,
+        "fuzzy": (ENABLE_FUZZY_CANDIDATES, FUZZY_MIN_SCORE, FUZZY_ACCEPT_SCORE),
+    }
+
+
+def is_output_current(previous, output_path, xls_key, fingerprints):
+    """上次输出仍有效：设置、普通高校表、id_map 行（含顺序）均未变，且输出文件未被改动。"""
+    if not previous or not os.path.exists(output_path):
+        return False
+    return (
+        previous.get("settings") == build_state_settings()
+        and previous.get("xls_key") == xls_key
+        and list(previous.get("rows", {}).items()) == list(fingerprints.items())
+        and previous.get("output_key") == _file_key(output_path)
+    )
+
+
 def main():
     current_dir = os.path.dirname(os.path.abspath(__file__))
     csv_path = os.path.join(current_dir, "高考教育院校id_map_表.csv")
     xls_path = os.path.join(current_dir, "普通高校.xls")
     output_xlsx_path = os.path.join(current_dir, "普通高校_带id.xlsx")
 
-    gaokao_df = pd.read_csv(csv_path, encoding="utf-8-sig")
-    school_df = pd.read_excel(xls_path)
-
-    if ID_COLUMN not in school_df.columns:
-        school_df[ID_COLUMN] = pd.NA
+    state_path = f"{output_xlsx_path}{MERGE_STATE_SUFFIX}"
 
+    gaokao_df = pd.read_csv(csv_path, encoding="utf-8-sig")
     gaokao_df = gaokao_df[gaokao_df["状态"] == "成功"].copy()
     gaokao_df["院校名称"] = gaokao_df["院校名称"].fillna("").astype(str).str.strip()
     gaokao_df = gaokao_df[gaokao_df["院校名称"] != ""]
 
-    school_df["_match_name"] = school_df["学校名称"].map(normalize_name)
+    fingerprints = build_row_fingerprints(gaokao_df)
+    xls_key = _file_key(xls_path)
+    previous = _load_pickle(state_path) if ENABLE_MERGE_CACHE else None
+    if ENABLE_MERGE_CACHE and is_output_current(
+        previous, output_xlsx_path, xls_key, fingerprints
+    ):
+        print("合并结果已是最新（id_map 与 普通高校.xls 均无变化），跳过写出")
+        print(f"- 输出文件: {output_xlsx_path}")
+        return
 
-    campus_added = 0
-    matched_updated = 0
-    unmatched_added = 0
+    school_df = load_school_table(xls_path)
 
-    for _, item in gaokao_df.iterrows():
-        school_name = item["院校名称"]
-        school_id = str(item["代码"]).strip()
-        normalized_name = normalize_name(school_name)
+    if ID_COLUMN not in school_df.columns:
+        school_df[ID_COLUMN] = pd.NA
+    school_df[ID_COLUMN] = school_df[ID_COLUMN].astype(object)
+
+    school_df["_match_name"] = normalize_name_series(school_df["学校名称"])
 
-        if CAMPUS_KEYWORD in school_name:
-            school_df = append_school_row(school_df, school_name, school_id)
-            campus_added += 1
-            continue
+    base_updates, new_rows, counters, matches = build_merge_plan(gaokao_df, school_df)
+    school_df = school_df.drop(columns=["_match_name"])
+    inserted, changed, removed = diff_merge_state(previous, fingerprints, matches)
 
-        matched_rows = school_df[school_df["_match_name"] == normalized_name]
+    incremental = ENABLE_MERGE_CACHE and can_apply_merge_diff(
+        previous, output_xlsx_path, xls_key, fingerprints
+    )
+    if incremental:
+        # 沿用上次的合并结果，只改写差异涉及的行
+        rows = affected_base_rows(previous, matches, inserted, changed, removed)
+        base_df = apply_merge_diff(previous["base_df"], school_df, base_updates, rows)
+        known_candidates = previous.get("candidates", {})
+    else:
+        base_df = school_df.copy()
+        base_df.loc[base_updates.index, ID_COLUMN] = base_updates.to_numpy()
+        known_candidates = None
 
-        if len(matched_rows) > 0:
-            row_index = matched_rows.index[0]
-            school_df.at[row_index, ID_COLUMN] = school_id
-            matched_updated += 1
-            continue
+    appended_rows, computed_candidates = build_appended_rows(
+        school_df, new_rows, known_candidates
+    )
+    review_count = sum(row.get(CANDIDATE_REVIEW_COLUMN) == "是" for row in appended_rows)
 
-        school_df = append_school_row(school_df, school_name, school_id)
-        unmatched_added += 1
+    output_df = append_school_rows(base_df, appended_rows)
+    output_df.to_excel(output_xlsx_path, index=False)
 
-    school_df = school_df.drop(columns=["_match_name"])
-    school_df.to_excel(output_xlsx_path, index=False)
+    if ENABLE_MERGE_CACHE:
+        try:
+            _dump_pickle(
+                {
+                    "settings": build_state_settings(),
+                    "xls_key": xls_key,
+                    "rows": fingerprints,
+                    "matches": matches,
+                    "base_df": base_df,
+                    "candidates": collect_candidates(appended_rows),
+                    "output_key": _file_key(output_xlsx_path),
+                },
+                state_path,
+            )
+        except OSError as e:
+            print(f"【警告】合并状态保存失败，下次将无法跳过：{e}")
 
-    print("合并完成")
+    if incremental:
+        print(
+            f"合并完成（按差异修补：改写普通高校 {len(rows)} 行，"
+            f"新算候选 {computed_candidates} 条）"
+        )
+    else:
+        print("合并完成")
     print(f"- 输入 CSV（仅成功）: {len(gaokao_df)} 条")
-    print(f"- 校区新增行: {campus_added} 条")
-    print(f"- 名称匹配并写入 id: {matched_updated} 条")
-    print(f"- 未匹配新增行: {unmatched_added} 条")
+    print(f"- 校区新增行: {counters['campus_added']} 条")
+    print(f"- 名称匹配并写入 id: {counters['matched_updated']} 条")
+    print(f"- 未匹配新增行: {counters['unmatched_added']} 条")
+    if ENABLE_FUZZY_CANDIDATES:
+        print(f"- 新增行中需人工复核候选: {review_count} 条（见「{CANDIDATE_REVIEW_COLUMN}」列）")
+    if ENABLE_MERGE_CACHE and previous:
+        print(
+            f"- 相比上次: 新增映射 {len(inserted)} 条，变更 {len(changed)} 条，"
+            f"删除 {len(removed)} 条"
+        )
     print(f"- 输出文件: {output_xlsx_path}（原 普通高校.xls 未修改）")
 
 
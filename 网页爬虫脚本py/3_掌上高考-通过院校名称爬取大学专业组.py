@@ -1,4 +1,7 @@
 import os
+import re
+import csv
+import json
 import time
 import asyncio
 import random
@@ -12,15 +15,140 @@ from playwright.async_api import (
     TimeoutError as PlaywrightTimeoutError,
 )
 
-from playwright_utils import get_profile_dir, USER_AGENT, LOGIN_URL
+from playwright_utils import (
+    LOGIN_URL,
+    close_browser_async,
+    install_resource_blocking_async,
+    launch_browser_async,
+    wait_for_manual_login_async,
+)
+from adaptive_concurrency import AimdController
 
 # 并发开关：True 时启用多标签页并发；False 时单标签页顺序执行
 ENABLE_CONCURRENT = True
 CONCURRENT_WORKERS = 3
 
+# 自适应并发：CONCURRENT_WORKERS 为初始活跃标签页数，登录后预先打开 ADAPTIVE_MAX_WORKERS 个标签页，
+# 由 AIMD 控制器按最近的耗时与失败率增减活跃数量，并调整每所院校前 0.3~0.8s 的随机间隔
+ENABLE_ADAPTIVE_CONCURRENCY = True
+ADAPTIVE_MAX_WORKERS = 6
+ADAPTIVE_MIN_WORKERS = 1
+
+# 资源拦截：屏蔽图片 / 字体 / 视频 / 统计广告脚本，结束时打印拦截统计
+ENABLE_RESOURCE_BLOCKING = True
+
+# 落盘：状态与结果只更新内存，由后台任务定时在线程池中批量写 Excel，不阻塞各标签页
+STATUS_FLUSH_INTERVAL_SEC = 2.0
+FILE_WRITE_MAX_RETRIES = 5
+FILE_WRITE_RETRY_DELAY_SEC = 0.3
+
+# 名称 -> ID 解析：先查 1_ 抓取的 id_map 表与历次搜索学到的别名缓存，命中则直接打开
+# school/{id}，只有未命中时才走 headSearch 搜索；搜索成功后把 ID 写回别名缓存
+ENABLE_ID_RESOLVER = True
+ID_MAP_CSV_FILE_NAME = "高考教育院校id_map_表.csv"
+ALIAS_CACHE_FILE_NAME = "院校名称id缓存.json"
+
+# 标签页复用：搜索结果优先读取链接 href 在 worker 自己的标签页内打开，不再每校弹出新标签页
+# （取不到 href 时仍回退到点击弹窗）；每个 worker 处理 PAGE_RECYCLE_EVERY 所院校后换一个新标签页，释放渲染进程内存
+ENABLE_TAB_REUSE = True
+PAGE_RECYCLE_EVERY = 50
+
 SCHOOL_NAME_SELECTOR = (
     ".head-search_schoolSearchItem__vOFho .head-search_schoolName__2ozme em"
 )
+SCHOOL_TAB_SELECTOR = ".school-tab_tabNavs__1wdWg img"
+SCHOOL_TITLE_SELECTOR = ".school-tab_name__3pOZK"
+SCHOOL_ID_URL_PATTERN = re.compile(r"/school/(\d+)")
+
+
+def _normalize_school_name(name):
+    return str(name).replace(" ", "").replace("　", "").strip()
+
+
+class SchoolIdResolver:
+    """
+    院校名称 -> 掌上高考 ID。
+
+    id_map 表（状态=成功）为权威来源；别名缓存记录 headSearch 搜索命中的结果，
+    用于 id_map 中没有的名称。learn / forget 在事件循环中调用，save 在落盘线程中调用。
+    """
+
+    def __init__(self, id_map_csv_path, alias_cache_path):
+        self.alias_cache_path = alias_cache_path
+        self._id_map = self._load_id_map(id_map_csv_path)
+        self._aliases = self._load_aliases(alias_cache_path)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def _load_id_map(self, csv_path):
+        id_map = {}
+        if not os.path.exists(csv_path):
+            print(f"【提示】未找到 {os.path.basename(csv_path)}，仅使用别名缓存")
+            return id_map
+
+        with open(csv_path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                name = _normalize_school_name(row.get("院校名称") or "")
+                code = str(row.get("代码") or "").strip()
+                if row.get("状态") == "成功" and name and code:
+                    id_map.setdefault(name, code)
+        return id_map
+
+    def _load_aliases(self, cache_path):
+        if not os.path.exists(cache_path):
+            return {}
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                aliases = json.load(f)
+        except (OSError, ValueError) as err:
+            print(f"【警告】别名缓存读取失败，将重新学习: {err}")
+            return {}
+        return aliases if isinstance(aliases, dict) else {}
+
+    def lookup(self, school_name):
+        name = _normalize_school_name(school_name)
+        with self._lock:
+            school_id = self._id_map.get(name) or self._aliases.get(name)
+        if school_id:
+            self.hit_count += 1
+        else:
+            self.miss_count += 1
+        return school_id
+
+    def learn(self, school_name, school_id):
+        name = _normalize_school_name(school_name)
+        with self._lock:
+            if self._id_map.get(name) == school_id or self._aliases.get(name) == school_id:
+                return
+            self._aliases[name] = school_id
+            self._dirty = True
+
+    def forget(self, school_name):
+        """打开后校名对不上：视为映射失效，移除后改走搜索重新学习。"""
+        name = _normalize_school_name(school_name)
+        with self._lock:
+            self._id_map.pop(name, None)
+            if self._aliases.pop(name, None) is not None:
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._aliases)
+            self._dirty = False
+
+        temp_path = f"{self.alias_cache_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(temp_path, self.alias_cache_path)
+        except OSError:
+            with self._lock:
+                self._dirty = True
+            raise
 
 
 class MajorsScraper:
@@ -32,6 +160,12 @@ class MajorsScraper:
         base_dir,
         enable_concurrent=ENABLE_CONCURRENT,
         concurrent_workers=CONCURRENT_WORKERS,
+        enable_resource_blocking=ENABLE_RESOURCE_BLOCKING,
+        enable_id_resolver=ENABLE_ID_RESOLVER,
+        enable_tab_reuse=ENABLE_TAB_REUSE,
+        page_recycle_every=PAGE_RECYCLE_EVERY,
+        enable_adaptive=ENABLE_ADAPTIVE_CONCURRENCY,
+        adaptive_max_workers=ADAPTIVE_MAX_WORKERS,
     ):
         self.school_name_excel_path = school_name_excel_path
         self.js_script_path = js_script_path
@@ -39,11 +173,25 @@ class MajorsScraper:
         self.base_dir = base_dir
         self.enable_concurrent = enable_concurrent
         self.concurrent_workers = max(1, concurrent_workers if enable_concurrent else 1)
+        self.enable_resource_blocking = enable_resource_blocking
+        self.enable_tab_reuse = enable_tab_reuse
+        self.page_recycle_every = page_recycle_every
+        self.enable_adaptive = enable_adaptive and self.enable_concurrent
+        self.adaptive_max_workers = max(self.concurrent_workers, adaptive_max_workers)
+        self._controller = None
 
         self.df = None
         self.majors_df = None
         self.js_code = None
         self._save_lock = threading.Lock()
+        self._status_dirty = False
+        self._pending_majors_frames = []
+        self.id_resolver = None
+        if enable_id_resolver:
+            self.id_resolver = SchoolIdResolver(
+                os.path.join(base_dir, ID_MAP_CSV_FILE_NAME),
+                os.path.join(base_dir, ALIAS_CACHE_FILE_NAME),
+            )
 
     def _init_read_school_name_excel(self):
         self.df = pd.read_excel(self.school_name_excel_path)
@@ -67,19 +215,109 @@ class MajorsScraper:
     def _build_search_url(self, school_name):
         return f"https://www.gaokao.cn/headSearch?search={school_name}"
 
+    def _build_school_url(self, school_id):
+        return f"https://www.gaokao.cn/school/{school_id}"
+
     def _save_status(self, row_index, status):
         with self._save_lock:
             self.df.at[row_index, "状态"] = status
-            self.df.to_excel(self.school_name_excel_path, index=False)
+            self._status_dirty = True
 
     def _append_majors_result(self, school_majors_data):
+        python_2d_list = [list(row) for row in school_majors_data]
+        new_df = pd.DataFrame(python_2d_list)
         with self._save_lock:
-            python_2d_list = [list(row) for row in school_majors_data]
-            new_df = pd.DataFrame(python_2d_list)
-            self.majors_df = pd.concat([self.majors_df, new_df], ignore_index=True)
-            self.majors_df.to_excel(
-                self.save_majors_excel_path, index=False, header=False
-            )
+            self._pending_majors_frames.append(new_df)
+
+    def _atomic_replace_file(self, file_path, write_fn, label="文件"):
+        temp_path = f"{file_path}.tmp"
+        last_err = None
+
+        for attempt in range(FILE_WRITE_MAX_RETRIES):
+            try:
+                write_fn(temp_path)
+                os.replace(temp_path, file_path)
+                return
+            except PermissionError as err:
+                last_err = err
+                if attempt < FILE_WRITE_MAX_RETRIES - 1:
+                    delay = FILE_WRITE_RETRY_DELAY_SEC * (attempt + 1)
+                    print(
+                        f"【警告】{label}写入被占用，"
+                        f"{delay:.1f}s 后重试 ({attempt + 1}/{FILE_WRITE_MAX_RETRIES})"
+                    )
+                    time.sleep(delay)
+            finally:
+                if os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+
+        raise last_err
+
+    def _flush_to_disk(self):
+        """
+        在线程池中执行：锁内只取快照，锁外写 Excel（先结果、后状态）。
+        写入失败时把快照放回，等下一轮重试。
+        """
+        if self.id_resolver:
+            self.id_resolver.save()
+
+        with self._save_lock:
+            frames = self._pending_majors_frames
+            self._pending_majors_frames = []
+            status_df = self.df.copy() if self._status_dirty else None
+            self._status_dirty = False
+
+        if not frames and status_df is None:
+            return False
+
+        try:
+            if frames:
+                majors_df = pd.concat([self.majors_df, *frames], ignore_index=True)
+                self._atomic_replace_file(
+                    self.save_majors_excel_path,
+                    lambda path: majors_df.to_excel(
+                        path, index=False, header=False, engine="openpyxl"
+                    ),
+                    label="专业组明细表",
+                )
+                self.majors_df = majors_df
+                frames = []
+
+            if status_df is not None:
+                self._atomic_replace_file(
+                    self.school_name_excel_path,
+                    lambda path: status_df.to_excel(path, index=False, engine="openpyxl"),
+                    label="状态表",
+                )
+        except PermissionError:
+            with self._save_lock:
+                self._pending_majors_frames = frames + self._pending_majors_frames
+                self._status_dirty = self._status_dirty or status_df is not None
+            raise
+
+        return True
+
+    async def _flush_loop(self, stop_event):
+        while True:
+            try:
+                await asyncio.to_thread(self._flush_to_disk)
+            except OSError as err:
+                print(f"【警告】落盘失败，将在下次定时重试: {err}")
+
+            if stop_event.is_set():
+                break
+            try:
+                await asyncio.wait_for(stop_event.wait(), STATUS_FLUSH_INTERVAL_SEC)
+            except asyncio.TimeoutError:
+                pass
+
+        try:
+            await asyncio.to_thread(self._flush_to_disk)
+        except OSError as err:
+            print(f"【警告】退出前落盘失败: {err}")
 
     async def _wait_for_element(self, page, selector, timeout_ms=4000):
         try:
@@ -89,11 +327,11 @@ class MajorsScraper:
             print(f"等待元素 {selector} 超时")
             return False
 
-    async def _init_worker_pages(self, context, login_page):
+    async def _init_worker_pages(self, context, login_page, page_count=None):
         """登录后创建 worker 标签页（同一浏览器窗口内的多个 tab）"""
         worker_pages = []
 
-        for worker_id in range(self.concurrent_workers):
+        for worker_id in range(page_count or self.concurrent_workers):
             if worker_id == 0:
                 page = login_page
             else:
@@ -112,52 +350,109 @@ class MajorsScraper:
         )
         return worker_pages
 
-    async def _scrape_school(self, page, row_index, school_name, worker_id):
+    async def _open_school_by_id(self, page, school_id, school_name, worker_id):
+        """已知 ID：在 worker 标签页内直接打开院校页；打不开或校名不符时返回 False 改走搜索。"""
+        try:
+            await page.goto(self._build_school_url(school_id), wait_until="domcontentloaded")
+            await page.wait_for_selector(SCHOOL_TAB_SELECTOR, timeout=6000)
+            page_name = await page.locator(SCHOOL_TITLE_SELECTOR).first.inner_text()
+        except PlaywrightTimeoutError:
+            print(f"[W{worker_id}] 按 ID {school_id} 打开超时，改用搜索: {school_name}")
+            return False
+
+        if _normalize_school_name(page_name) != _normalize_school_name(school_name):
+            print(
+                f"[W{worker_id}] ID {school_id} 对应「{page_name.strip()}」，"
+                f"与「{school_name}」不符，改用搜索"
+            )
+            self.id_resolver.forget(school_name)
+            return False
+        return True
+
+    async def _open_school_by_search(self, page, row_index, school_name, worker_id):
+        """
+        headSearch 搜索并打开结果：复用模式下在当前标签页打开结果链接，否则点击弹出新标签页。
+        返回院校页（可能就是 page 本身）；失败时记录状态并返回 None。
+        """
         url = self._build_search_url(school_name)
-        school_page = None
+        await page.goto(url, wait_until="domcontentloaded")
 
-        try:
-            await page.bring_to_front()
-            await asyncio.sleep(random.uniform(0.3, 0.8))
-            await page.goto(url, wait_until="domcontentloaded")
+        current_url = page.url
+        encoded_url = quote(url, safe=":/?=")
+        if encoded_url not in current_url:
+            print(
+                f"[W{worker_id}] 页面跳转失败，被重定向：{url} -> {current_url}"
+            )
+            self._save_status(row_index, "失败")
+            return None
 
-            current_url = page.url
-            encoded_url = quote(url, safe=":/?=")
-            if encoded_url not in current_url:
-                print(
-                    f"[W{worker_id}] 页面跳转失败，被重定向：{url} -> {current_url}"
-                )
-                self._save_status(row_index, "失败")
-                return
+        if not await self._wait_for_element(page, SCHOOL_NAME_SELECTOR, 8000):
+            print(f"[W{worker_id}] 加载失败，找不到院校名称元素: {school_name}")
+            self._save_status(row_index, "失败")
+            return None
 
-            if not await self._wait_for_element(page, SCHOOL_NAME_SELECTOR, 8000):
-                print(f"[W{worker_id}] 加载失败，找不到院校名称元素: {school_name}")
-                self._save_status(row_index, "失败")
-                return
+        await asyncio.sleep(random.uniform(0.1, 0.3))
 
-            await asyncio.sleep(random.uniform(0.1, 0.3))
+        school_item = page.locator(".head-search_schoolSearchItem__vOFho").first
+        school_name_element = school_item.locator(
+            ".head-search_schoolName__2ozme em span"
+        ).first
+        matched_name = (await school_name_element.inner_text()).strip()
 
-            school_item = page.locator(".head-search_schoolSearchItem__vOFho").first
-            school_name_element = school_item.locator(
-                ".head-search_schoolName__2ozme em span"
-            ).first
-            matched_name = (await school_name_element.inner_text()).strip()
+        if matched_name != school_name:
+            print(
+                f"[W{worker_id}] 搜索结果名称不匹配：页面「{matched_name}」，"
+                f"Excel「{school_name}」"
+            )
+            self._save_status(row_index, "失败")
+            return None
 
-            if matched_name != school_name:
-                print(
-                    f"[W{worker_id}] 搜索结果名称不匹配：页面「{matched_name}」，"
-                    f"Excel「{school_name}」"
-                )
-                self._save_status(row_index, "失败")
-                return
+        school_href = ""
+        if self.enable_tab_reuse:
+            school_href = await school_name_element.evaluate(
+                "el => el.closest('a')?.href || ''"
+            )
 
+        if school_href:
+            await page.goto(school_href, wait_until="domcontentloaded")
+            school_page = page
+        else:
             async with page.context.expect_page() as new_page_info:
                 await school_name_element.click()
-
             school_page = await new_page_info.value
-            await school_page.wait_for_selector(
-                ".school-tab_tabNavs__1wdWg img", timeout=6000
-            )
+
+        await school_page.wait_for_selector(SCHOOL_TAB_SELECTOR, timeout=6000)
+
+        id_match = SCHOOL_ID_URL_PATTERN.search(school_page.url)
+        if self.id_resolver and id_match:
+            self.id_resolver.learn(school_name, id_match.group(1))
+        return school_page
+
+    async def _scrape_school(self, page, row_index, school_name, worker_id):
+        """成功返回 True；失败时已记录状态，返回 False。"""
+        popup_page = None
+
+        try:
+            await page.bring_to_front()
+            if self._controller:
+                await asyncio.sleep(self._controller.next_delay())
+            else:
+                await asyncio.sleep(random.uniform(0.3, 0.8))
+
+            school_id = self.id_resolver.lookup(school_name) if self.id_resolver else None
+            if school_id and await self._open_school_by_id(
+                page, school_id, school_name, worker_id
+            ):
+                school_page = page
+            else:
+                school_page = await self._open_school_by_search(
+                    page, row_index, school_name, worker_id
+                )
+                if school_page is None:
+                    return False
+                if school_page is not page:
+                    popup_page = school_page
+
             await school_page.evaluate(self.js_code)
             await school_page.wait_for_selector(
                 "#schoolMajorsExcelDataStatus", timeout=64000
@@ -169,6 +464,7 @@ class MajorsScraper:
             self._append_majors_result(school_majors_data)
             self._save_status(row_index, "成功")
             print(f"[W{worker_id}] 成功 | 行号 {row_index} | {school_name}")
+            return True
 
         except PlaywrightTimeoutError as err:
             self._save_status(row_index, "失败")
@@ -177,21 +473,56 @@ class MajorsScraper:
             self._save_status(row_index, "失败")
             print(f"[W{worker_id}] 出错 | 行号 {row_index} | {school_name} | {err}")
         finally:
-            if school_page and not school_page.is_closed():
-                await school_page.close()
+            if popup_page and not popup_page.is_closed():
+                await popup_page.close()
             print(
                 f"[W{worker_id}] 完成 | 行号 {row_index} | "
                 f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
             )
+        return False
 
-    async def _worker(self, worker_id, page, queue):
+    async def _recycle_worker_page(self, page, worker_id):
+        """先开新标签页再关旧的，上下文中始终至少保留一个页面。"""
+        new_page = await page.context.new_page()
+        try:
+            await new_page.goto(LOGIN_URL, wait_until="domcontentloaded")
+            await new_page.evaluate(f"document.title = '[Worker {worker_id}] 掌上高考'")
+        except PlaywrightTimeoutError:
+            pass  # 首页加载慢不影响后续直接打开院校页
+        if not page.is_closed():
+            await page.close()
+        print(f"[W{worker_id}] 已回收标签页")
+        return new_page
+
+    async def _worker(self, worker_id, worker_pages, queue):
+        processed = 0
+        controller = self._controller
         while True:
+            if controller and not await controller.wait_for_slot(worker_id):
+                break
             try:
                 row_index, school_name = queue.get_nowait()
             except asyncio.QueueEmpty:
+                if controller:
+                    await controller.close()
                 break
 
-            await self._scrape_school(page, row_index, school_name, worker_id)
+            page = worker_pages[worker_id - 1]
+            started = time.monotonic()
+            ok = await self._scrape_school(page, row_index, school_name, worker_id)
+            if controller:
+                await controller.record(time.monotonic() - started, ok)
+
+            processed += 1
+            if (
+                self.enable_tab_reuse
+                and self.page_recycle_every
+                and processed % self.page_recycle_every == 0
+                and not queue.empty()
+            ):
+                worker_pages[worker_id - 1] = await self._recycle_worker_page(
+                    page, worker_id
+                )
 
     async def _run_async(self):
         start_time = time.time()
@@ -212,55 +543,80 @@ class MajorsScraper:
             print("没有待爬取的院校。")
             return
 
-        profile_dir = get_profile_dir(self.base_dir)
-        os.makedirs(profile_dir, exist_ok=True)
-
-        async with async_playwright() as playwright:
-            context = await playwright.chromium.launch_persistent_context(
-                user_data_dir=profile_dir,
-                headless=False,
-                user_agent=USER_AGENT,
-                ignore_https_errors=True,
-                viewport={"width": 1280, "height": 900},
-            )
-
-            login_page = context.pages[0] if context.pages else await context.new_page()
-            print("=" * 56)
-            print("浏览器已打开（有头模式）。")
-            print("请在浏览器中完成登录（扫码 / 账号均可）。")
-            print("登录完成后，回到此终端按【回车键】继续爬取...")
-            print("=" * 56)
-            await login_page.goto(LOGIN_URL, wait_until="domcontentloaded")
-            await login_page.evaluate("document.title = '[Worker 1] 掌上高考'")
-            await asyncio.to_thread(input)
-
-            print(f"\n正在打开 {self.concurrent_workers} 个并发标签页...")
-            worker_pages = await self._init_worker_pages(context, login_page)
-
-            queue = asyncio.Queue()
-            for task in pending_tasks:
-                await queue.put(task)
-
-            mode_text = (
-                f"并发 {self.concurrent_workers} 标签页"
-                if self.enable_concurrent
-                else "单标签页顺序执行"
-            )
-            print(f"开始爬取，共 {len(pending_tasks)} 所院校，模式：{mode_text}")
+        stop_flush = asyncio.Event()
+        flush_task = asyncio.create_task(self._flush_loop(stop_flush))
 
-            workers = [
-                asyncio.create_task(
-                    self._worker(worker_id + 1, worker_pages[worker_id], queue)
+        try:
+            async with async_playwright() as playwright:
+                context, login_page = await launch_browser_async(
+                    playwright, self.base_dir
+                )
+                await wait_for_manual_login_async(login_page)
+                # 登录完成后再装拦截：登录二维码 / 验证码图片不能被替换成透明图
+                resource_blocker = None
+                if self.enable_resource_blocking:
+                    resource_blocker = await install_resource_blocking_async(
+                        context, "gaokao.cn"
+                    )
+                await login_page.evaluate("document.title = '[Worker 1] 掌上高考'")
+
+                page_count = self.concurrent_workers
+                if self.enable_adaptive:
+                    page_count = self.adaptive_max_workers
+                    self._controller = AimdController(
+                        initial_limit=self.concurrent_workers,
+                        max_limit=page_count,
+                        min_limit=ADAPTIVE_MIN_WORKERS,
+                        delay_range=(0.3, 0.8),
+                    )
+
+                print(f"\n正在打开 {page_count} 个并发标签页...")
+                worker_pages = await self._init_worker_pages(
+                    context, login_page, page_count
                 )
-                for worker_id in range(self.concurrent_workers)
-            ]
-            await asyncio.gather(*workers)
 
-            for page in worker_pages[1:]:
-                if not page.is_closed():
-                    await page.close()
+                queue = asyncio.Queue()
+                for task in pending_tasks:
+                    await queue.put(task)
 
-            await context.close()
+                mode_text = (
+                    f"并发 {self.concurrent_workers} 标签页"
+                    if self.enable_concurrent
+                    else "单标签页顺序执行"
+                )
+                if self._controller:
+                    mode_text = (
+                        f"自适应并发，初始 {self.concurrent_workers} 标签页，"
+                        f"范围 {self._controller.min_limit}~{page_count}"
+                    )
+                print(f"开始爬取，共 {len(pending_tasks)} 所院校，模式：{mode_text}")
+                print(f"落盘：内存更新，每 {STATUS_FLUSH_INTERVAL_SEC:g}s 后台批量写入一次")
+
+                workers = [
+                    asyncio.create_task(
+                        self._worker(worker_id + 1, worker_pages, queue)
+                    )
+                    for worker_id in range(page_count)
+                ]
+                await asyncio.gather(*workers)
+                if self._controller:
+                    print(self._controller.summary())
+
+                for page in worker_pages[1:]:
+                    if not page.is_closed():
+                        await page.close()
+
+                await close_browser_async(context)
+                if resource_blocker:
+                    print(resource_blocker.summary())
+        finally:
+            stop_flush.set()
+            await flush_task
+            if self.id_resolver:
+                print(
+                    f"【提示】ID 缓存命中 {self.id_resolver.hit_count} 所，"
+                    f"搜索 {self.id_resolver.miss_count} 所"
+                )
 
         end_time = time.time()
         print(
@@ -285,5 +641,6 @@ if __name__ == "__main__":
         base_dir=current_dir,
         enable_concurrent=ENABLE_CONCURRENT,
         concurrent_workers=CONCURRENT_WORKERS,
+        enable_resource_blocking=ENABLE_RESOURCE_BLOCKING,
     )
     scraper.run()
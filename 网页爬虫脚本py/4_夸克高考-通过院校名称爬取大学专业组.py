@@ -1,62 +1,52 @@
 import os
 import time
 import asyncio
-import random
-import csv
-import threading
-from urllib.parse import quote
-
-import pandas as pd
-from playwright.async_api import (
-    async_playwright,
-    TimeoutError as PlaywrightTimeoutError,
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from quark_engine import (
+    SOURCE_EXTRA_RESULT_COLUMNS,
+    SOURCE_INFO_RESULT_COLUMNS,
+    QuarkScrapeEngine,
+    build_target_matrix,
+)
+from quark_card import (
+    FILTER_TAB_SELECTORS,
+    FILTER_VALUE_POLL_INTERVAL,
+    LIST_CHANGE_DEBOUNCE_SEC,
+    LIST_READY_TIMEOUT_MS,
+    NO_ENROLLMENT_HINT_SELECTOR,
+    NO_ENROLLMENT_MIN_SIZE_PX,
+    NO_ENROLLMENT_SETTLE_SEC,
+    SCORE_LOADING_SELECTOR,
+    VALUE_ONLY_FILTERS,
+    QuarkCardExtractor,
 )
 
+
 # 爬取目标（修改此处即可切换省份/年份）
 TARGET_PROVINCE = "广东"
 TARGET_YEAR = "2025"
 TARGET_BATCH = "本科批"
 TARGET_GENRE = "首选物理"
 
-# 并发开关：True 时启用多标签页并发；False 时单标签页顺序执行
-ENABLE_CONCURRENT = True
-CONCURRENT_WORKERS = 16
-
-# 状态表落盘：内存更新后由后台定时批量写入，降低 Windows 下 os.replace 冲突
-STATUS_FLUSH_INTERVAL_SEC = 1.0
-FILE_WRITE_MAX_RETRIES = 5
-FILE_WRITE_RETRY_DELAY_SEC = 0.3
+# 多目标矩阵：每所院校只打开一次页面，在页面内依次切换筛选覆盖 省份×年份×批次×科类 全部组合。
+# 只有一个组合时沿用「状态」列与 夸克-省份-年份-院校专业组表.csv；
+# 多个组合时每个组合单独一列「状态-省份-年份-批次-科类」、一个结果表
+TARGET_PROVINCES = [TARGET_PROVINCE]  # 例如 ["广东", "浙江", "江苏", "湖北", "湖南"]
+TARGET_YEARS = [TARGET_YEAR]
+TARGET_BATCHES = [TARGET_BATCH]
+TARGET_GENRES = [TARGET_GENRE]  # 例如 ["首选物理", "首选历史"]
 
-# 结果表：源表带入字段
-SOURCE_INFO_RESULT_COLUMNS = [
-    "主管部门",
-]
+# 页面内切换筛选（ENABLE_IN_PAGE_FILTER_SWITCH 等）、tab 切换参数见 quark_card.py（夸克 3_/4_ 共用）
+# 合并爬取（5_夸克高考-合并爬取专业与专业组.py）时点击 SPA 内的「招生计划」tab 取卡片（见 quark_card.py）
+SPA_TAB_LABEL = "招生计划"
 
-# 结果表：新源表额外字段（普通高校.csv 遍历时带入，不含序号/学校名称/状态）
-# 源表「省份」写入「院校省份」，避免与爬取筛选条件「省份」重名
-SOURCE_EXTRA_RESULT_COLUMNS = [
-    "院校省份",
-    "城市",
-    "985",
-    "211",
-    "双一流",
-    "类型",
-    "层次",
-    "性质",
-]
+# 并发标签页数、资源拦截等调度参数见 quark_engine.py（夸克 3_/4_/5_ 共用）
 
-SOURCE_EXTRA_COLUMN_MAP = {
-    "院校省份": "省份",
-    "城市": "城市",
-    "985": "985",
-    "211": "211",
-    "双一流": "双一流",
-    "类型": "类型",
-    "层次": "层次",
-    "性质": "性质",
-}
-
-CSV_READ_ENCODINGS = ("utf-8-sig", "utf-8", "gbk", "gb18030")
+# 分阶段耗时指标：每个 (院校, 组合) 的各阶段耗时与结果追加写入 METRICS_FILE_NAME（JSONL，与结果表同目录），
+# 运行结束打印各阶段 p50/p95/p99 与最慢院校；历史记录可用 python phase_metrics.py <文件> [latest] 汇总
+METRICS_FILE_NAME = "夸克-院校专业组-耗时指标.jsonl"
 
 RESULT_COLUMNS = [
     "查询院校名称",
@@ -80,16 +70,6 @@ MAJOR_NAME_INDEX = RESULT_COLUMNS.index("专业")
 MAJOR_GROUP_INDEX = RESULT_COLUMNS.index("专业组")
 
 
-def read_csv_with_encodings(file_path):
-    last_err = None
-    for encoding in CSV_READ_ENCODINGS:
-        try:
-            return pd.read_csv(file_path, encoding=encoding)
-        except UnicodeDecodeError as err:
-            last_err = err
-    raise last_err
-
-
 def format_major_plan_entry(major_name, remark, plan_count):
     """招生计划专业条目：专业名-(备注)-人数。"""
     major_text = str(major_name or "").strip()
@@ -109,9 +89,6 @@ def format_major_plan_entry(major_name, remark, plan_count):
     return entry
 
 
-VALUE_ONLY_FILTERS = ["批次", "科类"]
-SKIP_STATUSES = {"成功", "无效数据", "本省未招生", "失败-无数据"}
-
 PLAN_CARD_SELECTOR = ".quark-page-wrapper-ZhaoShengJiHua .zhaoshengjihua-card"
 PLAN_CARD_READY_SIGNALS = [
     ".select-tabs-jihua",
@@ -122,447 +99,76 @@ PLAN_CARD_READY_SIGNALS = [
 PLAN_CARD_READY_TIMEOUT_MS = 20000
 MAJOR_GROUP_ITEM_SELECTOR = ".major-group-list .major-group-item"
 PLAN_LIST_SELECTOR = ".pc-zhaosheng .content-List-li"
-NO_ENROLLMENT_HINT_SELECTOR = ".nodata-fenshuxian"
-NO_ENROLLMENT_SETTLE_SEC = 0.1
-NO_ENROLLMENT_MIN_SIZE_PX = 20
 EARLY_NO_ENROLLMENT_POLL_TIMEOUT_MS = 8000
 MAJOR_GROUP_CHANGE_TIMEOUT_MS = 3000
-MAJOR_GROUP_CHANGE_DEBOUNCE_SEC = 0.2
 MAJOR_GROUP_CLICK_SETTLE_SEC = 0.1
-PLAN_LIST_READY_TIMEOUT_MS = 10000
-SCORE_LOADING_SELECTOR = ".qk-loading.qk-loading-container"
-SCORE_LOADING_APPEAR_TIMEOUT_MS = 3000
-SCORE_LOADING_DISAPPEAR_TIMEOUT_MS = 8000
-FILTER_VALUE_POLL_COUNT = 15
-FILTER_VALUE_POLL_INTERVAL = 0.2
-
-FILTER_TAB_SELECTORS = {
-    "省份": ".select-tabs-tab-chengshi",
-    "年份": ".select-tabs-tab-nianfen",
-    "批次": ".select-tabs-tab-pici",
-    "科类": ".select-tabs-tab-kemu",
-}
-
-FILTER_HAS_VALUE_LOCATORS = {
-    "批次": ".qk-button-title",
-    "科类": ".select-tabs-genre",
-}
-
-
-def build_quark_result_path(output_dir, province, year):
-    return os.path.join(output_dir, f"夸克-{province}-{year}-院校专业组表.csv")
-
-
-class QuarkMajorGroupsScraper:
-    def __init__(
-        self,
-        school_source_path,
-        status_save_path,
-        result_path=None,
-        target_province=TARGET_PROVINCE,
-        target_year=TARGET_YEAR,
-        target_batch=TARGET_BATCH,
-        target_genre=TARGET_GENRE,
-        enable_concurrent=ENABLE_CONCURRENT,
-        concurrent_workers=CONCURRENT_WORKERS,
-    ):
-        self.school_source_path = school_source_path
-        self.status_save_path = status_save_path
-        self.target_province = target_province
-        self.target_year = target_year
-        self.target_batch = target_batch
-        self.target_genre = target_genre
-        self.required_filter_values = {
-            "省份": target_province,
-            "年份": target_year,
+PLAN_COUNT_LABEL = "25计划"
+
+# 一次 evaluate 在页面内把当前专业组的招生计划列表序列化为结构化行，
+# 避免每行 count / inner_text / 统计项循环的多次 locator 往返；evaluate 出错时回退逐行解析
+ENABLE_SINGLE_EVALUATE_EXTRACT = True
+PLAN_ROWS_EXTRACT_JS = """
+(card, { listSelector, planLabel }) => {
+    const text = (root, selector) => (root.querySelector(selector)?.innerText || '').trim();
+    const statValue = (row) => {
+        for (const item of row.querySelectorAll('.content-stats-item')) {
+            if (text(item, '.content-stats-label .qk-paragraph-text') === planLabel) {
+                return text(item, '.content-stats-value .qk-paragraph-text');
+            }
         }
-        if result_path is None:
-            output_dir = os.path.dirname(os.path.abspath(school_source_path))
-            result_path = build_quark_result_path(
-                output_dir, target_province, target_year
-            )
-        self.result_path = result_path
-        self.enable_concurrent = enable_concurrent
-        self.concurrent_workers = max(1, concurrent_workers if enable_concurrent else 1)
-
-        self.df = None
-        self._save_lock = threading.Lock()
-        self._status_dirty = False
-        self._progress_lock = threading.Lock()
-        self._total_schools = 0
-        self._total_pending = 0
-        self._skip_count = 0
-        self._started_count = 0
-        self._finished_count = 0
-
-    def _read_source_table(self, file_path):
-        if file_path.endswith(".csv"):
-            return read_csv_with_encodings(file_path)
-        if file_path.endswith(".xlsx"):
-            return pd.read_excel(file_path, engine="openpyxl")
-        return pd.read_excel(file_path)
-
-    def _atomic_replace_file(self, file_path, write_fn, label="文件"):
-        temp_path = f"{file_path}.tmp"
-        last_err = None
-
-        for attempt in range(FILE_WRITE_MAX_RETRIES):
-            try:
-                write_fn(temp_path)
-                os.replace(temp_path, file_path)
-                return
-            except PermissionError as err:
-                last_err = err
-                if attempt < FILE_WRITE_MAX_RETRIES - 1:
-                    delay = FILE_WRITE_RETRY_DELAY_SEC * (attempt + 1)
-                    print(
-                        f"【警告】{label}写入被占用，"
-                        f"{delay:.1f}s 后重试 ({attempt + 1}/{FILE_WRITE_MAX_RETRIES})"
-                    )
-                    time.sleep(delay)
-            finally:
-                if os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                    except OSError:
-                        pass
-
-        raise last_err
-
-    def _save_status_dataframe(self):
-        def write_status(temp_path):
-            self.df.to_csv(temp_path, index=False, encoding="utf-8-sig")
-
-        self._atomic_replace_file(
-            self.status_save_path, write_status, label="状态表"
-        )
-
-    def _flush_status_to_disk(self):
-        with self._save_lock:
-            if not self._status_dirty:
-                return False
-            self._save_status_dataframe()
-            self._status_dirty = False
-            return True
-
-    async def _status_flush_loop(self, stop_event):
-        while True:
-            try:
-                self._flush_status_to_disk()
-            except PermissionError as err:
-                with self._save_lock:
-                    self._status_dirty = True
-                print(f"【警告】状态表落盘失败，将在下次定时重试: {err}")
-
-            if stop_event.is_set():
-                break
-            await asyncio.sleep(STATUS_FLUSH_INTERVAL_SEC)
-
-        try:
-            self._flush_status_to_disk()
-        except PermissionError as err:
-            with self._save_lock:
-                self._status_dirty = True
-            print(f"【警告】退出前状态表落盘失败: {err}")
-
-    def _migrate_legacy_xlsx_status(self):
-        legacy_xlsx = f"{os.path.splitext(self.status_save_path)[0]}.xlsx"
-        if not os.path.exists(legacy_xlsx):
-            return False
-
-        try:
-            status_df = pd.read_excel(legacy_xlsx, engine="openpyxl")
-        except Exception as err:
-            backup_path = f"{legacy_xlsx}.corrupt.bak"
-            if os.path.exists(backup_path):
-                os.remove(backup_path)
-            os.replace(legacy_xlsx, backup_path)
-            print(
-                f"【警告】旧 xlsx 状态表已损坏，已备份为 {os.path.basename(backup_path)}"
-                f"（原因: {err}）"
-            )
-            return False
-
-        temp_path = f"{self.status_save_path}.tmp"
-        status_df.to_csv(temp_path, index=False, encoding="utf-8-sig")
-        os.replace(temp_path, self.status_save_path)
-        backup_path = f"{legacy_xlsx}.bak"
-        if os.path.exists(backup_path):
-            os.remove(backup_path)
-        os.replace(legacy_xlsx, backup_path)
-        print(
-            f"【提示】已将旧 xlsx 状态表迁移为 csv，保留 {len(status_df)} 行，"
-            f"旧文件备份为 {os.path.basename(backup_path)}"
-        )
-        return True
-
-    def _load_status_dataframe(self):
-        if not os.path.exists(self.status_save_path):
-            if self._migrate_legacy_xlsx_status():
-                return read_csv_with_encodings(self.status_save_path)
-            return self._read_source_table(self.school_source_path)
-
-        try:
-            return read_csv_with_encodings(self.status_save_path)
-        except Exception as err:
-            backup_path = f"{self.status_save_path}.corrupt.bak"
-            if os.path.exists(backup_path):
-                os.remove(backup_path)
-            os.replace(self.status_save_path, backup_path)
-            print(
-                f"【警告】状态文件已损坏，已备份为 {os.path.basename(backup_path)}，"
-                f"将从源表重新初始化（原因: {err}）"
-            )
-            if self._migrate_legacy_xlsx_status():
-                return read_csv_with_encodings(self.status_save_path)
-            return self._read_source_table(self.school_source_path)
-
-    def _init_source_excel(self):
-        self.df = self._load_status_dataframe()
-        if "状态" not in self.df.columns:
-            self.df["状态"] = ""
-        self.df["状态"] = self.df["状态"].fillna("").astype(str)
-
-    @staticmethod
-    def _normalize_cell_value(value):
-        if pd.isna(value):
-            return ""
-        if isinstance(value, float) and value == int(value):
-            text = str(int(value))
-        else:
-            text = str(value).strip()
-        if text.lower() == "nan":
-            return ""
-        if text.endswith(".0") and text[:-2].isdigit():
-            text = text[:-2]
-        return text
-
-    def _get_school_info(self, row_index):
-        row = self.df.loc[row_index]
-        school_info = {
-            "主管部门": self._normalize_cell_value(row.get("主管部门", "")),
+        return '';
+    };
+    const subjectText = (row) => {
+        const direct = text(row, '.pc-subtitle-two-margin .qk-paragraph-text');
+        if (direct) return direct;
+        for (const paragraph of row.querySelectorAll('.qk-paragraph-text')) {
+            const value = (paragraph.innerText || '').trim();
+            if (value.includes('选科要求')) return value;
         }
-        for result_col, source_col in SOURCE_EXTRA_COLUMN_MAP.items():
-            school_info[result_col] = self._normalize_cell_value(
-                row.get(source_col, "")
-            )
-        return school_info
-
-    def _create_empty_result_file(self):
-        with open(
-            self.result_path, mode="w", encoding="utf-8-sig", newline=""
-        ) as f:
-            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-            writer.writerow(RESULT_COLUMNS)
-
-    def _read_result_dataframe(self, file_path):
-        try:
-            return read_csv_with_encodings(file_path)
-        except Exception as err:
-            backup_path = f"{file_path}.corrupt.bak"
-            if os.path.exists(backup_path):
-                os.remove(backup_path)
-            os.replace(file_path, backup_path)
-            print(
-                f"【警告】结果文件已损坏，已备份为 {os.path.basename(backup_path)}，"
-                f"将重建空表（原因: {err}）"
-            )
-            return pd.DataFrame(columns=RESULT_COLUMNS)
-
-    def _migrate_result_dataframe(self, existing_df):
-        if existing_df is None or existing_df.empty:
-            return pd.DataFrame(columns=RESULT_COLUMNS)
-
-        source_columns = list(existing_df.columns)
-        if source_columns == RESULT_COLUMNS:
-            return existing_df[RESULT_COLUMNS].copy()
-
-        migrated_df = pd.DataFrame(index=existing_df.index)
-        for column_name in RESULT_COLUMNS:
-            if column_name in existing_df.columns:
-                migrated_df[column_name] = existing_df[column_name]
-            else:
-                migrated_df[column_name] = ""
-
-        if "专业备注" in source_columns:
-            migrated_df["备注"] = existing_df["专业备注"]
-
-        return migrated_df[RESULT_COLUMNS]
-
-    def _save_result_dataframe(self, result_df):
-        def write_result(temp_path):
-            result_df.to_csv(temp_path, index=False, encoding="utf-8-sig")
-
-        self._atomic_replace_file(
-            self.result_path, write_result, label="结果表"
-        )
-
-    def _migrate_legacy_xlsx_result(self):
-        legacy_xlsx = f"{os.path.splitext(self.result_path)[0]}.xlsx"
-        if not os.path.exists(legacy_xlsx):
-            return False
-
-        try:
-            existing_df = pd.read_excel(legacy_xlsx, engine="openpyxl")
-        except Exception as err:
-            backup_path = f"{legacy_xlsx}.corrupt.bak"
-            if os.path.exists(backup_path):
-                os.remove(backup_path)
-            os.replace(legacy_xlsx, backup_path)
-            print(
-                f"【警告】旧 xlsx 结果表已损坏，已备份为 {os.path.basename(backup_path)}"
-                f"（原因: {err}）"
-            )
-            return False
-
-        migrated_df = self._migrate_result_dataframe(existing_df)
-        self._save_result_dataframe(migrated_df)
-        backup_path = f"{legacy_xlsx}.bak"
-        if os.path.exists(backup_path):
-            os.remove(backup_path)
-        os.replace(legacy_xlsx, backup_path)
-        print(
-            f"【提示】已将旧 xlsx 结果表迁移为 csv，保留 {len(migrated_df)} 行，"
-            f"旧文件备份为 {os.path.basename(backup_path)}"
-        )
-        return True
-
-    def _init_result_file(self):
-        if not os.path.exists(self.result_path):
-            if self._migrate_legacy_xlsx_result():
-                return
-            self._create_empty_result_file()
-            print("【提示】结果表不存在，已创建空 csv，后续仅追加写入")
-            return
-
-        existing_df = self._read_result_dataframe(self.result_path)
-        row_count = len(existing_df)
-
-        if list(existing_df.columns) == RESULT_COLUMNS:
-            print(f"【提示】结果表已存在 {row_count} 行，后续仅追加写入")
-            return
-
-        migrated_df = self._migrate_result_dataframe(existing_df)
-        self._save_result_dataframe(migrated_df)
-        print(
-            f"【提示】结果表表头已对齐，保留 {len(migrated_df)} 行，"
-            f"后续仅追加写入"
-        )
-
-    def _mark_task_started(self, school_name, worker_id):
-        with self._progress_lock:
-            self._started_count += 1
-            traversed = self._skip_count + self._started_count
-        print(
-            f"[W{worker_id}] [{traversed}/{self._total_schools}] "
-            f"开始 | {school_name}"
-        )
-        return traversed
-
-    def _mark_task_finished(self, school_name, worker_id, result_text):
-        with self._progress_lock:
-            self._finished_count += 1
-            traversed = self._skip_count + self._finished_count
-            remaining = self._total_pending - self._finished_count
-        print(
-            f"[W{worker_id}] [{traversed}/{self._total_schools}] "
-            f"完成(剩{remaining}) | {school_name} | {result_text}"
-        )
-
-    def _build_url(self, school_name):
-        encoded_school = quote(school_name)
-        params = quote(
-            f'{{"province":"{self.target_province}","year":"{self.target_year}",'
-            f'"batch":"{self.target_batch}","genre":"{self.target_genre}"}}'
-        )
-        return (
-            "https://vt.quark.cn/blm/gaokao-college-794/tab"
-            f"?app=ZhaoShengJiHua&university_name={encoded_school}&params={params}"
-        )
-
-    def _save_status(self, row_index, status):
-        with self._save_lock:
-            self.df.at[row_index, "状态"] = status
-            self._status_dirty = True
-
-    def _append_result_rows(self, rows_data):
-        if not rows_data:
-            return
-
-        with self._save_lock:
-            last_err = None
-            for attempt in range(FILE_WRITE_MAX_RETRIES):
-                try:
-                    with open(
-                        self.result_path,
-                        mode="a",
-                        encoding="utf-8-sig",
-                        newline="",
-                    ) as f:
-                        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-                        writer.writerows(rows_data)
-                        f.flush()
-                        os.fsync(f.fileno())
-                    return
-                except PermissionError as err:
-                    last_err = err
-                    if attempt < FILE_WRITE_MAX_RETRIES - 1:
-                        delay = FILE_WRITE_RETRY_DELAY_SEC * (attempt + 1)
-                        print(
-                            f"【警告】结果表追加被占用，"
-                            f"{delay:.1f}s 后重试 ({attempt + 1}/{FILE_WRITE_MAX_RETRIES})"
-                        )
-                        time.sleep(delay)
-            raise last_err
-
-    async def _get_locator_text(self, locator):
-        if await locator.count() == 0:
-            return ""
-        return (await locator.first.inner_text()).strip()
-
-    def _parse_subject_requirement(self, text):
-        if not text:
-            return ""
-        if "选科要求：" in text:
-            return text.split("选科要求：")[-1].strip()
-        if "选科要求" in text:
-            return (
-                text.split("选科要求")[-1]
-                .replace(":", "")
-                .replace("：", "")
-                .strip()
-            )
-        return text.strip()
+        return '';
+    };
+    return Array.from(card.querySelectorAll(listSelector))
+        .map((row) => ({
+            major_name: text(row, '.content-List-li-major .qk-paragraph-text'),
+            remark: text(row, '.fold-icon .qk-paragraph-text'),
+            plan_count: statValue(row),
+            subject_text: subjectText(row),
+        }))
+        .filter((row) => row.major_name);
+}
+"""
+
+CARD_WAIT_SELECTORS = {
+    "card": {"css": PLAN_CARD_SELECTOR, "title": "", "titleText": ""},
+    "list": PLAN_LIST_SELECTOR,
+    "nodata": NO_ENROLLMENT_HINT_SELECTOR,
+    "nodataMinPx": NO_ENROLLMENT_MIN_SIZE_PX,
+    "loading": SCORE_LOADING_SELECTOR,
+    "filters": {
+        "省份": [f"{FILTER_TAB_SELECTORS['省份']} .qk-button-title"],
+        "年份": [f"{FILTER_TAB_SELECTORS['年份']} .qk-button-title"],
+        "批次": [f"{FILTER_TAB_SELECTORS['批次']} .qk-button-title"],
+        "科类": [
+            f"{FILTER_TAB_SELECTORS['科类']} .select-tabs-genre span",
+            f"{FILTER_TAB_SELECTORS['科类']} .select-tabs-genre",
+        ],
+    },
+}
 
-    async def _get_page_school_name(self, page, timeout=5000):
-        name_locator = page.locator(".university-logo-left .qk-title-text em")
-        try:
-            await name_locator.first.wait_for(state="visible", timeout=timeout)
-        except PlaywrightTimeoutError:
-            return None
-        return (await name_locator.first.inner_text()).strip()
 
-    async def _get_card_filters(self, card):
-        genre_text = await self._get_locator_text(
-            card.locator(f"{FILTER_TAB_SELECTORS['科类']} .select-tabs-genre span")
-        )
-        if not genre_text:
-            genre_text = await self._get_locator_text(
-                card.locator(f"{FILTER_TAB_SELECTORS['科类']} .select-tabs-genre")
-            )
+class QuarkMajorGroupsExtractor(QuarkCardExtractor):
+    """夸克院校页「招生计划」tab 的卡片提取，调度由 quark_engine.QuarkScrapeEngine 负责。"""
 
-        return {
-            "省份": await self._get_locator_text(
-                card.locator(f"{FILTER_TAB_SELECTORS['省份']} .qk-button-title")
-            ),
-            "年份": await self._get_locator_text(
-                card.locator(f"{FILTER_TAB_SELECTORS['年份']} .qk-button-title")
-            ),
-            "批次": await self._get_locator_text(
-                card.locator(f"{FILTER_TAB_SELECTORS['批次']} .qk-button-title")
-            ),
-            "科类": genre_text,
-        }
+    NAME = "招生计划"
+    RESULT_COLUMNS = RESULT_COLUMNS
+    RESULT_FILE_LABEL = "院校专业组表"
+    METRICS_FILE_NAME = METRICS_FILE_NAME
+    SPA_TAB_LABEL = SPA_TAB_LABEL
+    CARD_TITLE = "招生计划"
+    URL_APP = "ZhaoShengJiHua"
+    CARD_WAIT_SELECTORS = CARD_WAIT_SELECTORS
+    # 筛选读回与目标不符但列表已有数据时继续抓取（页面筛选区偶尔滞后于列表）
+    ALLOW_FILTER_MISMATCH_WITH_LIST = True
 
     async def _get_row_subject_requirement(self, row):
         sub_req_text = await self._get_locator_text(
@@ -593,25 +199,21 @@ class QuarkMajorGroupsScraper:
             )
         return ""
 
-    async def _get_content_list_fingerprint(self, card):
-        plan_container = card.locator(".pc-zhaosheng")
-        if await plan_container.count() == 0:
-            return ""
-        return await plan_container.first.evaluate(
-            """(container) => {
-                const items = container.querySelectorAll('.content-List-li');
-                return Array.from(items)
-                    .map((item) => (item.textContent || '').trim())
-                    .join('|');
-            }"""
+    async def _wait_for_content_list_change(self, card, previous_fingerprint):
+        reason, _ = await self._wait_for_card_state(
+            card,
+            "list_changed",
+            MAJOR_GROUP_CHANGE_TIMEOUT_MS,
+            expected=previous_fingerprint,
         )
+        if reason is not None:
+            return bool(reason)
 
-    async def _wait_for_content_list_change(self, card, previous_fingerprint):
         deadline = time.monotonic() + MAJOR_GROUP_CHANGE_TIMEOUT_MS / 1000
         while time.monotonic() < deadline:
             current_fingerprint = await self._get_content_list_fingerprint(card)
             if current_fingerprint != previous_fingerprint:
-                await asyncio.sleep(MAJOR_GROUP_CHANGE_DEBOUNCE_SEC)
+                await asyncio.sleep(LIST_CHANGE_DEBOUNCE_SEC)
                 return True
             await asyncio.sleep(0.1)
         return False
@@ -619,7 +221,7 @@ class QuarkMajorGroupsScraper:
     async def _wait_for_plan_list_ready(self, card, school_name):
         """筛选框就绪后，轮询等待列表或 nodata 提前终止。"""
         poll_result = await self._poll_list_or_no_enrollment(
-            card, PLAN_LIST_READY_TIMEOUT_MS
+            card, LIST_READY_TIMEOUT_MS
         )
         if poll_result in {"has_data", "no_enrollment"}:
             return True, ""
@@ -678,7 +280,7 @@ class QuarkMajorGroupsScraper:
         remark = await self._get_locator_text(
             row.locator(".fold-icon .qk-paragraph-text")
         )
-        plan_count = await self._get_plan_stat_value(row, "25计划")
+        plan_count = await self._get_plan_stat_value(row, PLAN_COUNT_LABEL)
         subject_requirement = await self._get_row_subject_requirement(row)
 
         return {
@@ -688,7 +290,35 @@ class QuarkMajorGroupsScraper:
             "subject_requirement": subject_requirement,
         }
 
+    async def _extract_current_plan_rows(self, card):
+        """单次 evaluate 读取当前列表；出错返回 None 由调用方回退逐行解析。"""
+        try:
+            raw_rows = await card.evaluate(
+                PLAN_ROWS_EXTRACT_JS,
+                {"listSelector": PLAN_LIST_SELECTOR, "planLabel": PLAN_COUNT_LABEL},
+            )
+        except Exception as err:
+            print(f"【警告】批量提取招生计划失败，回退逐行解析: {err}")
+            return None
+
+        return [
+            {
+                "major_name": raw_row["major_name"],
+                "remark": raw_row["remark"],
+                "plan_count": raw_row["plan_count"],
+                "subject_requirement": self._parse_subject_requirement(
+                    raw_row["subject_text"]
+                ),
+            }
+            for raw_row in raw_rows
+        ]
+
     async def _scrape_current_plan_rows(self, card):
+        if ENABLE_SINGLE_EVALUATE_EXTRACT:
+            parsed_rows = await self._extract_current_plan_rows(card)
+            if parsed_rows is not None:
+                return parsed_rows
+
         major_rows = card.locator(PLAN_LIST_SELECTOR)
         row_count = await major_rows.count()
         parsed_rows = []
@@ -759,141 +389,19 @@ class QuarkMajorGroupsScraper:
             "",
         ]
 
-    def _log_card_filters(self, filters, stage, school_name):
-        def show(value):
-            text = str(value).strip() if value is not None else ""
-            return text if text else "(空)"
-
-        print(
-            f"【筛选】{stage} | "
-            f"省份={show(filters.get('省份'))}，"
-            f"年份={show(filters.get('年份'))}，"
-            f"批次={show(filters.get('批次'))}，"
-            f"科类={show(filters.get('科类'))} "
-            f"[{school_name}]"
-        )
-
-    def _is_invalid_filter_value(self, actual, expected):
-        actual_text = str(actual).strip()
-        return bool(actual_text) and actual_text != expected
-
-    def _validate_card_filters(self, filters):
-        for key, expected in self.required_filter_values.items():
-            actual = str(filters.get(key, "")).strip()
-            if actual != expected:
-                return False, key, expected, actual
-
-        for key in VALUE_ONLY_FILTERS:
-            actual = str(filters.get(key, "")).strip()
-            if not actual:
-                return False, key, "有值", actual
-
-        return True, "", "", ""
-
-    async def _is_nodata_visually_active(self, card):
-        """nodata 默认 block 但高度为 0；宽高均 > 20px 才表示真正展示出来。"""
-        no_data = card.locator(NO_ENROLLMENT_HINT_SELECTOR)
-        if await no_data.count() == 0:
-            return False
-
-        return await no_data.first.evaluate(
-            f"""(el) => {{
-                const rect = el.getBoundingClientRect();
-                return rect.width > {NO_ENROLLMENT_MIN_SIZE_PX}
-                    && rect.height > {NO_ENROLLMENT_MIN_SIZE_PX};
-            }}"""
-        )
-
-    async def _has_plan_list_data(self, card):
-        return await card.locator(PLAN_LIST_SELECTOR).count() > 0
-
-    async def _is_score_loading_visible(self, card):
-        loading = card.locator(SCORE_LOADING_SELECTOR)
-        if await loading.count() == 0:
-            return False
-        return await loading.first.is_visible()
-
-    async def _wait_for_score_loading_hidden(self, card, timeout_ms):
-        loading = card.locator(SCORE_LOADING_SELECTOR)
-        if await loading.count() == 0:
-            return True
-        if not await loading.first.is_visible():
-            return True
-
-        try:
-            await loading.first.wait_for(state="hidden", timeout=timeout_ms)
-            return True
-        except PlaywrightTimeoutError:
-            return False
-
-    async def _wait_loading_gone_then_settle(self, card, timeout_ms):
-        """loading 可见则等到不可见，消失后再等 100ms。"""
-        if not await self._is_score_loading_visible(card):
-            return True
-
-        if not await self._wait_for_score_loading_hidden(card, timeout_ms):
-            return False
-
-        await asyncio.sleep(NO_ENROLLMENT_SETTLE_SEC)
-        return True
-
-    async def _should_early_stop_no_enrollment(self, card):
-        """列表无数据、loading 已消失并 settle、nodata 已展示 → 本省未招生。"""
-        if await self._has_plan_list_data(card):
-            return False
-
-        if not await self._wait_loading_gone_then_settle(
-            card, SCORE_LOADING_DISAPPEAR_TIMEOUT_MS
-        ):
-            return False
-
-        if await self._has_plan_list_data(card):
-            return False
-
-        return await self._is_nodata_visually_active(card)
-
-    async def _poll_list_or_no_enrollment(self, card, timeout_ms):
-        """
-        轮询列表与 nodata：有列表=有招生；
-        loading 可见则 wait_for(hidden) 后再等 100ms；
-        nodata 宽高>20px 则提前终止。
-        返回 has_data | no_enrollment | timeout
-        """
-        deadline = time.monotonic() + timeout_ms / 1000
-
-        while time.monotonic() < deadline:
-            if await self._has_plan_list_data(card):
-                return "has_data"
-
-            remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
-
-            if await self._is_score_loading_visible(card):
-                if not await self._wait_loading_gone_then_settle(card, remaining_ms):
-                    break
-
-                if await self._has_plan_list_data(card):
-                    return "has_data"
-
-                if await self._is_nodata_visually_active(card):
-                    return "no_enrollment"
-
-                continue
-
-            if await self._is_nodata_visually_active(card):
-                return "no_enrollment"
-
-            await asyncio.sleep(NO_ENROLLMENT_SETTLE_SEC)
-
-        if await self._has_plan_list_data(card):
-            return "has_data"
-
-        if await self._should_early_stop_no_enrollment(card):
-            return "no_enrollment"
-
-        return "timeout"
-
     async def _poll_after_province_year_ready(self, card, school_name):
         """省份/年份就绪后，边等批次科类边检测本省未招生或列表是否已出。"""
+        reason, state = await self._wait_for_card_state(
+            card, "filters_filled_or_nodata", EARLY_NO_ENROLLMENT_POLL_TIMEOUT_MS
+        )
+        if reason == "no_enrollment":
+            self._log_card_filters(
+                state["filters"], "省份年份就绪后本省未招生", school_name
+            )
+            return "no_enrollment", state["filters"]
+        if reason is not None:
+            return "continue", state["filters"]
+
         deadline = time.monotonic() + EARLY_NO_ENROLLMENT_POLL_TIMEOUT_MS / 1000
 
         while time.monotonic() < deadline:
@@ -909,7 +417,7 @@ class QuarkMajorGroupsScraper:
             if batch and genre:
                 return "continue", filters
 
-            if await self._has_plan_list_data(card):
+            if await self._has_list_data(card):
                 return "continue", filters
 
             if await self._should_early_stop_no_enrollment(card):
@@ -923,129 +431,10 @@ class QuarkMajorGroupsScraper:
         filters = await self._get_card_filters(card)
         return "continue", filters
 
-    async def _wait_for_score_module_settled(self, card, school_name):
-        loading = card.locator(SCORE_LOADING_SELECTOR)
-        loading_appeared = False
-
-        appear_deadline = time.monotonic() + SCORE_LOADING_APPEAR_TIMEOUT_MS / 1000
-        while time.monotonic() < appear_deadline:
-            if await self._is_score_loading_visible(card):
-                loading_appeared = True
-                break
-            await asyncio.sleep(FILTER_VALUE_POLL_INTERVAL)
-
-        if loading_appeared:
-            try:
-                await loading.first.wait_for(
-                    state="hidden", timeout=SCORE_LOADING_DISAPPEAR_TIMEOUT_MS
-                )
-            except PlaywrightTimeoutError:
-                return False, "load", "分数模块loading未消失"
-        else:
-            await asyncio.sleep(0.5)
-
-        poll_result = await self._poll_list_or_no_enrollment(
-            card, PLAN_LIST_READY_TIMEOUT_MS
-        )
-        if poll_result == "no_enrollment":
-            filters = await self._get_card_filters(card)
-            self._log_card_filters(filters, "分数模块加载后nodata显示", school_name)
-            return False, "no_enrollment", "nodata-fenshuxian已展示"
-
-        return True, "", ""
-
-    async def _wait_for_filter_has_value(self, card, field_name, school_name):
-        tab_selector = FILTER_TAB_SELECTORS[field_name]
-        value_selector = FILTER_HAS_VALUE_LOCATORS.get(
-            field_name, ".qk-button-title"
-        )
-        value_locator = card.locator(f"{tab_selector} {value_selector}").first
-
-        try:
-            await value_locator.wait_for(state="visible", timeout=5000)
-        except PlaywrightTimeoutError:
-            filters = await self._get_card_filters(card)
-            self._log_card_filters(filters, f"{field_name}筛选框未出现", school_name)
-            return False, "load", f"{field_name}筛选框未出现", filters
-
-        for _ in range(FILTER_VALUE_POLL_COUNT):
-            if await self._should_early_stop_no_enrollment(card):
-                filters = await self._get_card_filters(card)
-                self._log_card_filters(
-                    filters, f"{field_name}等待期间本省未招生", school_name
-                )
-                return False, "no_enrollment", "nodata-fenshuxian已展示", filters
-
-            filters = await self._get_card_filters(card)
-            actual = str(filters.get(field_name, "")).strip()
-            if actual:
-                self._log_card_filters(filters, f"{field_name}有值", school_name)
-                return True, "", "", filters
-            await asyncio.sleep(FILTER_VALUE_POLL_INTERVAL)
-
-        if await self._should_early_stop_no_enrollment(card):
-            filters = await self._get_card_filters(card)
-            self._log_card_filters(
-                filters, f"{field_name}超时后本省未招生", school_name
-            )
-            return False, "no_enrollment", "nodata-fenshuxian已展示", filters
-
-        filters = await self._get_card_filters(card)
-        self._log_card_filters(filters, f"{field_name}值未就绪", school_name)
-        return False, "load", f"{field_name}值为空", filters
-
-    async def _wait_for_filter_value(self, card, field_name, expected_value, school_name):
-        tab_selector = FILTER_TAB_SELECTORS[field_name]
-        title_locator = card.locator(f"{tab_selector} .qk-button-title").first
-
-        try:
-            await title_locator.wait_for(state="visible", timeout=5000)
-        except PlaywrightTimeoutError:
-            filters = await self._get_card_filters(card)
-            self._log_card_filters(filters, f"{field_name}筛选框未出现", school_name)
-            return False, "load", f"{field_name}筛选框未出现", filters
-
-        for _ in range(15):
-            actual = await self._get_locator_text(
-                card.locator(f"{tab_selector} .qk-button-title")
-            )
-            if actual == expected_value:
-                filters = await self._get_card_filters(card)
-                self._log_card_filters(filters, f"{field_name}就绪", school_name)
-                return True, "", "", filters
-
-            if await self._has_plan_list_data(card):
-                filters = await self._get_card_filters(card)
-                self._log_card_filters(
-                    filters, f"{field_name}未就绪但列表已有数据", school_name
-                )
-                return True, "", "", filters
-
-            await asyncio.sleep(0.2)
-
-        filters = await self._get_card_filters(card)
-        actual = str(filters.get(field_name, "")).strip()
-        if actual == expected_value:
-            self._log_card_filters(filters, f"{field_name}就绪", school_name)
-            return True, "", "", filters
-
-        if await self._has_plan_list_data(card):
-            self._log_card_filters(
-                filters, f"{field_name}超时但列表已有数据", school_name
-            )
-            return True, "", "", filters
-
-        if self._is_invalid_filter_value(actual, expected_value):
-            self._log_card_filters(filters, f"{field_name}无效", school_name)
-            return False, "invalid", f"{field_name}={actual}", filters
-
-        self._log_card_filters(filters, f"{field_name}值未就绪", school_name)
-        return False, "load", f"{field_name}值未就绪", filters
-
-    async def _wait_for_card_filters(self, card, school_name):
+    async def _wait_for_card_filters(self, card, school_name, target):
         province_ready, province_error_type, province_error, filters = (
             await self._wait_for_filter_value(
-                card, "省份", self.required_filter_values["省份"], school_name
+                card, "省份", target["省份"], school_name
             )
         )
         if not province_ready:
@@ -1053,7 +442,7 @@ class QuarkMajorGroupsScraper:
 
         year_ready, year_error_type, year_error, filters = (
             await self._wait_for_filter_value(
-                card, "年份", self.required_filter_values["年份"], school_name
+                card, "年份", target["年份"], school_name
             )
         )
         if not year_ready:
@@ -1088,9 +477,6 @@ class QuarkMajorGroupsScraper:
         self._log_card_filters(filters, "筛选就绪", school_name)
         return True, "", "", filters
 
-    def _get_plan_card(self, page):
-        return page.locator(PLAN_CARD_SELECTOR).first
-
     async def _get_plan_card_ready_debug(self, card):
         signal_states = {}
         for signal in PLAN_CARD_READY_SIGNALS:
@@ -1148,7 +534,7 @@ class QuarkMajorGroupsScraper:
             and box.get("height", 0) > 200
         )
 
-    async def _wait_for_plan_card(self, page, school_name, worker_id):
+    async def _wait_for_card(self, page, school_name, worker_id):
         card = page.locator(PLAN_CARD_SELECTOR)
 
         try:
@@ -1168,150 +554,71 @@ class QuarkMajorGroupsScraper:
         await self._log_plan_card_debug(page, school_name, worker_id, "内容区未就绪")
         return None
 
-    async def _has_no_local_enrollment_hint(self, card):
-        return await self._should_early_stop_no_enrollment(card)
-
-    async def _scrape_school(self, page, row_index, school_name, worker_id):
-        url = self._build_url(school_name)
-        result_text = "失败"
-
-        try:
-            await page.bring_to_front()
-            await asyncio.sleep(random.uniform(0.1, 0.32))
-            await page.goto(url, wait_until="domcontentloaded")
-
-            page_school_name = await self._get_page_school_name(page)
-            if page_school_name is None:
-                print(
-                    f"[W{worker_id}] 【失败】未等到院校名 em 元素: {school_name}"
-                )
-                await asyncio.sleep(3)
-                self._save_status(row_index, "失败-未加载")
-                result_text = "失败-未加载"
-                return
+    async def _extract_card(
+        self, card, row_index, school_name, target, worker_id, filters, page_school_name, phases
+    ):
+        print(
+            f"[W{worker_id}] 【成功】{filters['省份']} {filters['年份']} "
+            f"{filters['批次']} {filters['科类']}，"
+            f"页面院校: {page_school_name or '未知'}，开始提取专业组: {school_name}"
+        )
 
-            if page_school_name == "undefined":
+        list_ready, list_error = await phases.timed(
+            "list_ready", self._wait_for_plan_list_ready(card, school_name)
+        )
+        if not list_ready:
+            print(
+                f"[W{worker_id}] 【失败】{list_error}: {school_name}"
+            )
+            self.engine.save_status(row_index, target, "失败-未加载")
+            result_text = "失败-未加载"
+            return result_text
+
+        phases.begin("extract")
+        has_no_enrollment_hint = await self._has_no_local_enrollment_hint(card)
+        major_group_targets = await self._get_major_group_targets(card)
+        school_info = self.engine.get_school_info(row_index)
+        result_rows = []
+        group_summaries = []
+
+        if not major_group_targets:
+            parsed_rows = await self._scrape_current_plan_rows(card)
+            if not parsed_rows and has_no_enrollment_hint:
                 print(
-                    f"[W{worker_id}] 【本省未招生】页面院校名为 undefined 字符串，"
-                    f"判定该省未招生: {school_name}"
+                    f"[W{worker_id}] 【本省未招生】"
+                    f"{target['label']} 下无专业组列表，"
+                    f"且出现无数据提示: {school_name}"
                 )
-                self._save_status(row_index, "本省未招生")
+                self.engine.save_status(row_index, target, "本省未招生")
                 result_text = "本省未招生"
-                return
-
-            card = await self._wait_for_plan_card(page, school_name, worker_id)
-            if card is None:
-                print(
-                    f"[W{worker_id}] 【失败】未找到招生计划模块: {school_name} "
-                    f"（等待 {PLAN_CARD_SELECTOR} 挂载且筛选区/列表就绪，"
-                    f"超时 {PLAN_CARD_READY_TIMEOUT_MS}ms）"
-                )
-                await asyncio.sleep(3)
-                self._save_status(row_index, "失败-未加载")
-                result_text = "失败-未加载"
-                return
-
-            if not page_school_name:
-                print(f"[W{worker_id}] 【警告】未读取到页面院校名称: {school_name}")
-            elif page_school_name != school_name:
-                print(
-                    f"[W{worker_id}] 【提示】名称不一致，查询「{school_name}」，"
-                    f"页面「{page_school_name}」"
-                )
-
-            filters_ready, error_type, filter_error, filters = (
-                await self._wait_for_card_filters(card, school_name)
+                return result_text
+
+            group_row = self._build_group_result_row(
+                "",
+                parsed_rows,
+                filters,
+                school_name,
+                page_school_name,
+                school_info,
             )
-            if not filters_ready:
-                if error_type == "invalid":
-                    print(
-                        f"[W{worker_id}] 【无效数据】{filter_error}，"
-                        f"非{self.target_province}/{self.target_year}: {school_name}"
-                    )
-                    self._save_status(row_index, "无效数据")
-                    result_text = "无效数据"
-                elif error_type == "no_enrollment":
+            if group_row:
+                result_rows.append(group_row)
+                group_summaries.append("默认")
+        else:
+            for group_index, group_name in major_group_targets:
+                activated = await self._activate_major_group(
+                    card, group_index, worker_id, group_name
+                )
+                if not activated:
                     print(
-                        f"[W{worker_id}] 【本省未招生】"
-                        f"{self.target_province}/{self.target_year} 已就绪，"
-                        f"{filter_error or '该地区暂无录取信息'}: "
+                        f"[W{worker_id}] 【跳过】专业组 {group_name} 无数据: "
                         f"{school_name}"
                     )
-                    self._save_status(row_index, "本省未招生")
-                    result_text = "本省未招生"
-                else:
-                    print(f"[W{worker_id}] 【失败】{filter_error}: {school_name}")
-                    self._save_status(row_index, "失败-未加载")
-                    result_text = "失败-未加载"
-                return
-
-            filter_ok, filter_key, expected, actual = self._validate_card_filters(
-                filters
-            )
-            if not filter_ok:
-                self._log_card_filters(filters, "校验失败", school_name)
-                actual_text = str(actual).strip()
-                has_list_data = await self._has_plan_list_data(card)
-
-                if has_list_data:
-                    print(
-                        f"[W{worker_id}] 【警告】「{filter_key}」"
-                        f"期望「{expected}」实际「{actual_text}」，"
-                        f"但列表已有数据，继续抓取: {school_name}"
-                    )
-                elif filter_key in self.required_filter_values and actual_text:
-                    print(
-                        f"[W{worker_id}] 【无效数据】「{filter_key}」"
-                        f"期望「{expected}」实际「{actual_text}」: {school_name}"
-                    )
-                    self._save_status(row_index, "无效数据")
-                    result_text = "无效数据"
-                    return
-                else:
-                    print(
-                        f"[W{worker_id}] 【失败】「{filter_key}」不符: {school_name}"
-                    )
-                    self._save_status(row_index, f"失败-{filter_key}错误")
-                    result_text = f"失败-{filter_key}错误"
-                    return
+                    continue
 
-            print(
-                f"[W{worker_id}] 【成功】{filters['省份']} {filters['年份']} "
-                f"{filters['批次']} {filters['科类']}，"
-                f"页面院校: {page_school_name or '未知'}，开始提取专业组: {school_name}"
-            )
-
-            list_ready, list_error = await self._wait_for_plan_list_ready(
-                card, school_name
-            )
-            if not list_ready:
-                print(
-                    f"[W{worker_id}] 【失败】{list_error}: {school_name}"
-                )
-                self._save_status(row_index, "失败-未加载")
-                result_text = "失败-未加载"
-                return
-
-            has_no_enrollment_hint = await self._has_no_local_enrollment_hint(card)
-            major_group_targets = await self._get_major_group_targets(card)
-            school_info = self._get_school_info(row_index)
-            result_rows = []
-            group_summaries = []
-
-            if not major_group_targets:
                 parsed_rows = await self._scrape_current_plan_rows(card)
-                if not parsed_rows and has_no_enrollment_hint:
-                    print(
-                        f"[W{worker_id}] 【本省未招生】"
-                        f"{self.target_province}/{self.target_year} 下无专业组列表，"
-                        f"且出现无数据提示: {school_name}"
-                    )
-                    self._save_status(row_index, "本省未招生")
-                    result_text = "本省未招生"
-                    return
-
                 group_row = self._build_group_result_row(
-                    "",
+                    group_name,
                     parsed_rows,
                     filters,
                     school_name,
@@ -1320,196 +627,26 @@ class QuarkMajorGroupsScraper:
                 )
                 if group_row:
                     result_rows.append(group_row)
-                    group_summaries.append("默认")
-            else:
-                for group_index, group_name in major_group_targets:
-                    activated = await self._activate_major_group(
-                        card, group_index, worker_id, group_name
-                    )
-                    if not activated:
-                        print(
-                            f"[W{worker_id}] 【跳过】专业组 {group_name} 无数据: "
-                            f"{school_name}"
-                        )
-                        continue
-
-                    parsed_rows = await self._scrape_current_plan_rows(card)
-                    group_row = self._build_group_result_row(
-                        group_name,
-                        parsed_rows,
-                        filters,
-                        school_name,
-                        page_school_name,
-                        school_info,
-                    )
-                    if group_row:
-                        result_rows.append(group_row)
-                        group_summaries.append(group_name)
-
-            self._append_result_rows(result_rows)
+                    group_summaries.append(group_name)
 
-            if result_rows:
-                self._save_status(row_index, "成功")
-                result_text = f"成功 {len(result_rows)} 个专业组"
-                print(
-                    f"[W{worker_id}] 【成功】{school_name} "
-                    f"共 {len(result_rows)} 个专业组 "
-                    f"({', '.join(group_summaries)})"
-                )
-            else:
-                self._save_status(row_index, "失败-未解析到数据")
-                result_text = "失败-未解析到数据"
-                print(
-                    f"[W{worker_id}] 【失败】未解析到数据: {school_name}"
-                )
+        self.engine.append_result_rows(result_rows, target["result_path"])
 
-        except Exception as err:
-            self._save_status(row_index, "失败")
-            result_text = f"异常: {err}"
+        if result_rows:
+            self.engine.save_status(row_index, target, "成功")
+            result_text = f"成功 {len(result_rows)} 个专业组"
             print(
-                f"[W{worker_id}] 异常 | 行号{row_index} | "
-                f"{school_name} | {err}"
+                f"[W{worker_id}] 【成功】{school_name} "
+                f"共 {len(result_rows)} 个专业组 "
+                f"({', '.join(group_summaries)})"
             )
-        finally:
-            self._mark_task_finished(school_name, worker_id, result_text)
-
-    async def _init_worker_pages(self, context):
-        worker_pages = []
-        for worker_id in range(self.concurrent_workers):
-            page = await context.new_page()
-            await page.evaluate(f"document.title = '[Worker {worker_id + 1}] 夸克高考'")
-            worker_pages.append(page)
-            print(f"  - Worker {worker_id + 1} 标签页已就绪")
-
-        print(
-            f"【浏览器】当前同一窗口内共 {len(context.pages)} 个标签页 "
-            f"（请查看浏览器顶部标签栏）"
-        )
-        return worker_pages
-
-    async def _worker(self, worker_id, page, queue):
-        while True:
-            try:
-                row_index, school_name = queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-
-            self._mark_task_started(school_name, worker_id)
-            await self._scrape_school(page, row_index, school_name, worker_id)
-            await asyncio.sleep(random.uniform(1, 2))
-
-    async def _run_async(self):
-        start_time = time.time()
-
-        self._init_source_excel()
-        self._init_result_file()
-
-        pending_tasks = []
-        skip_count = 0
-        success_count = 0
-        invalid_count = 0
-        no_enrollment_count = 0
-        self._total_schools = len(self.df)
-
-        for index, row in self.df.iterrows():
-            status = str(row.get("状态", "")).strip()
-            if status in SKIP_STATUSES:
-                skip_count += 1
-                if status == "成功":
-                    success_count += 1
-                elif status == "无效数据":
-                    invalid_count += 1
-                elif status in {"本省未招生", "失败-无数据"}:
-                    no_enrollment_count += 1
-                continue
-
-            school_name = str(row["学校名称"]).strip()
-            if not school_name or school_name.lower() == "nan":
-                continue
-
-            pending_tasks.append((index, school_name))
-
-        self._total_pending = len(pending_tasks)
-        self._skip_count = skip_count
-        self._started_count = 0
-        self._finished_count = 0
-
-        if not pending_tasks:
+        else:
+            self.engine.save_status(row_index, target, "失败-未解析到数据")
+            result_text = "失败-未解析到数据"
             print(
-                f"没有待爬取的院校。"
-                f"总计 {self._total_schools} 所，已成功 {success_count}，"
-                f"无效数据 {invalid_count}，本省未招生 {no_enrollment_count}，"
-                f"跳过 {skip_count} 所。"
+                f"[W{worker_id}] 【失败】未解析到数据: {school_name}"
             )
-            return
-
-        mode_text = (
-            f"并发 {self.concurrent_workers} 标签页"
-            if self.enable_concurrent
-            else "单标签页顺序执行"
-        )
-        print(
-            f"\n>>>> 目标 {self.target_province}/{self.target_year} | "
-            f"结果表 {os.path.basename(self.result_path)}"
-        )
-        print(
-            f">>>> 院校总计 {self._total_schools} 所 | "
-            f"已成功 {success_count} | 无效数据 {invalid_count} | "
-            f"本省未招生 {no_enrollment_count} | "
-            f"跳过 {skip_count} | 本次待爬 {self._total_pending} 所"
-        )
-        print(f">>>> 模式：{mode_text}")
-        print(
-            f">>>> 状态表落盘：内存更新，每 {STATUS_FLUSH_INTERVAL_SEC:g}s 批量写入一次"
-        )
 
-        stop_status_flush = asyncio.Event()
-        status_flush_task = asyncio.create_task(
-            self._status_flush_loop(stop_status_flush)
-        )
-
-        try:
-            async with async_playwright() as playwright:
-                browser = await playwright.chromium.launch(headless=False)
-                context = await browser.new_context(
-                    viewport={"width": 1920, "height": 1080}
-                )
-
-                print(f"\n正在打开 {self.concurrent_workers} 个并发标签页...")
-                worker_pages = await self._init_worker_pages(context)
-
-                queue = asyncio.Queue()
-                for task in pending_tasks:
-                    await queue.put(task)
-
-                workers = [
-                    asyncio.create_task(
-                        self._worker(
-                            worker_id + 1, worker_pages[worker_id], queue
-                        )
-                    )
-                    for worker_id in range(self.concurrent_workers)
-                ]
-                await asyncio.gather(*workers)
-
-                for page in worker_pages:
-                    if not page.is_closed():
-                        await page.close()
-                await context.close()
-                await browser.close()
-        finally:
-            stop_status_flush.set()
-            await status_flush_task
-
-        end_time = time.time()
-        print(
-            f"\n>>>> 脚本全部执行完成！"
-            f"本次完成 {self._finished_count}/{self._total_pending} 所，"
-            f"总用时 {end_time - start_time:.2f} 秒"
-        )
-
-    def run(self):
-        asyncio.run(self._run_async())
+        return result_text
 
 
 if __name__ == "__main__":
@@ -1518,14 +655,14 @@ if __name__ == "__main__":
     school_source_path = os.path.join(current_dir, "普通高校.csv")
     status_save_path = os.path.join(current_dir, "普通高校.csv")
 
-    scraper = QuarkMajorGroupsScraper(
+    extractor = QuarkMajorGroupsExtractor(
+        target_matrix=build_target_matrix(
+            TARGET_PROVINCES, TARGET_YEARS, TARGET_BATCHES, TARGET_GENRES
+        ),
+    )
+    engine = QuarkScrapeEngine(
+        [extractor],
         school_source_path=school_source_path,
         status_save_path=status_save_path,
-        target_province=TARGET_PROVINCE,
-        target_year=TARGET_YEAR,
-        target_batch=TARGET_BATCH,
-        target_genre=TARGET_GENRE,
-        enable_concurrent=ENABLE_CONCURRENT,
-        concurrent_workers=CONCURRENT_WORKERS,
     )
-    scraper.run()
+    engine.run()
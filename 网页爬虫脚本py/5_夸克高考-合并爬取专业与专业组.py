@@ -0,0 +1,57 @@
+import os
+
+from quark_engine import QuarkScrapeEngine, build_target_matrix
+from script_loader import load_script_module
+
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+quark_majors = load_script_module(
+    "3_夸克高考-通过院校名称爬取大学专业.py", "quark_majors"
+)
+quark_major_groups = load_script_module(
+    "4_夸克高考-通过院校名称爬取大学专业组.py", "quark_major_groups"
+)
+
+# 已注册的提取器：名称 -> 提取器类（quark_engine.QuarkExtractor 子类）。
+# 名称同时作为状态列前缀（如「分数线状态」「招生计划状态」）。
+# 新增 tab 时在对应脚本里实现 QuarkExtractor 子类（scrape_target 等）并在此登记即可
+EXTRACTOR_REGISTRY = {
+    "分数线": quark_majors.QuarkMajorsExtractor,
+    "招生计划": quark_major_groups.QuarkMajorGroupsExtractor,
+}
+# 一次院校访问内按此顺序运行：第一个提取器打开院校页，后续提取器点 SPA tab 复用同一页面
+ENABLED_EXTRACTORS = ["分数线", "招生计划"]
+
+# 爬取目标矩阵（同 3_/4_ 脚本）：省份×年份×批次×科类，两张结果表共用
+TARGET_PROVINCES = ["广东"]
+TARGET_YEARS = ["2025"]
+TARGET_BATCHES = ["本科批"]
+TARGET_GENRES = ["首选物理"]
+
+# 并发标签页数、资源拦截等调度参数见 quark_engine.py（夸克 3_/4_/5_ 共用）
+
+
+def build_extractors(extractor_names, target_matrix):
+    return [
+        EXTRACTOR_REGISTRY[name](target_matrix=target_matrix, status_prefix=name)
+        for name in extractor_names
+    ]
+
+
+if __name__ == "__main__":
+    school_source_path = os.path.join(CURRENT_DIR, "普通高校.csv")
+    status_save_path = os.path.join(CURRENT_DIR, "普通高校.csv")
+
+    engine = QuarkScrapeEngine(
+        build_extractors(
+            ENABLED_EXTRACTORS,
+            build_target_matrix(
+                TARGET_PROVINCES, TARGET_YEARS, TARGET_BATCHES, TARGET_GENRES
+            ),
+        ),
+        school_source_path=school_source_path,
+        status_save_path=status_save_path,
+    )
+    engine.run()
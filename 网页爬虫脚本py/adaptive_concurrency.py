@@ -0,0 +1,136 @@
+import asyncio
+import random
+
+
+# 自适应并发（AIMD）：按窗口统计各 worker 最近完成的任务，
+# 健康时活跃标签页 +1、间隔缩短；失败率或延迟超标时活跃标签页减半、间隔拉长
+AIMD_WINDOW_SIZE = 20
+AIMD_FAILURE_RATE_THRESHOLD = 0.2
+AIMD_LATENCY_FACTOR = 2.0
+AIMD_DECREASE_FACTOR = 0.5
+AIMD_DELAY_FACTOR_RANGE = (0.25, 4.0)
+AIMD_DELAY_BACKOFF = 2.0
+AIMD_DELAY_RECOVERY = 0.8
+# 延迟基线：成功任务窗口平均延迟的指数加权平均，每个窗口以该权重向最新值靠拢
+AIMD_BASELINE_ALPHA = 0.1
+
+
+class AimdController:
+    """
+    多个 worker 共用的并发控制器，只在事件循环中使用。
+
+    标签页按 worker 编号 1..max_limit 预先打开，编号大于当前上限的 worker 在
+    wait_for_slot 处挂起，上限回升后继续取任务；任务间隔 = delay_range 随机值 × 间隔系数。
+    延迟只统计成功任务（失败往往很快返回，会把基线拉低）；基线为各窗口成功平均延迟的 EWMA，
+    既不会被一次偶然的快窗口永久钉住，也能跟随站点整体变慢；窗口平均超过基线 latency_factor 倍视为拥塞。
+    """
+
+    def __init__(
+        self,
+        initial_limit,
+        max_limit,
+        min_limit=1,
+        window_size=AIMD_WINDOW_SIZE,
+        failure_rate_threshold=AIMD_FAILURE_RATE_THRESHOLD,
+        latency_factor=AIMD_LATENCY_FACTOR,
+        baseline_alpha=AIMD_BASELINE_ALPHA,
+        delay_range=(1, 2),
+        label="",
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.window_size = max(1, window_size)
+        self.failure_rate_threshold = failure_rate_threshold
+        self.latency_factor = latency_factor
+        self.baseline_alpha = baseline_alpha
+        self.delay_range = delay_range
+        self.delay_factor = 1.0
+        self.label = label
+
+        self._condition = asyncio.Condition()
+        self._closed = False
+        self._window_count = 0
+        self._window_latencies = []
+        self._window_failures = 0
+        self._baseline_latency = None
+        self.increase_count = 0
+        self.decrease_count = 0
+
+    async def wait_for_slot(self, slot):
+        """编号 slot（从 1 开始）的 worker 取任务前调用；返回 False 表示已结束，worker 应退出。"""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._closed or slot <= self.limit
+            )
+            return not self._closed
+
+    async def close(self):
+        """队列取空后调用，唤醒所有挂起的 worker 退出。"""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def next_delay(self):
+        low, high = self.delay_range
+        return random.uniform(low, high) * self.delay_factor
+
+    async def record(self, latency_sec, ok):
+        """记录一次任务耗时与结果；凑满一个窗口时调整并发上限与间隔系数。失败任务的耗时不计入延迟。"""
+        self._window_count += 1
+        if ok:
+            self._window_latencies.append(latency_sec)
+        else:
+            self._window_failures += 1
+        if self._window_count < self.window_size:
+            return
+
+        count = self._window_count
+        failure_rate = self._window_failures / count
+        avg_latency = (
+            sum(self._window_latencies) / len(self._window_latencies)
+            if self._window_latencies
+            else None
+        )
+        self._window_count = 0
+        self._window_latencies = []
+        self._window_failures = 0
+
+        congested = failure_rate >= self.failure_rate_threshold
+        if avg_latency is not None:
+            if self._baseline_latency is None:
+                self._baseline_latency = avg_latency
+            congested = congested or avg_latency > self._baseline_latency * self.latency_factor
+            self._baseline_latency += self.baseline_alpha * (avg_latency - self._baseline_latency)
+
+        old_limit = self.limit
+        min_factor, max_factor = AIMD_DELAY_FACTOR_RANGE
+        if congested:
+            self.limit = max(self.min_limit, int(self.limit * AIMD_DECREASE_FACTOR))
+            self.delay_factor = min(max_factor, self.delay_factor * AIMD_DELAY_BACKOFF)
+            self.decrease_count += 1
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.delay_factor = max(min_factor, self.delay_factor * AIMD_DELAY_RECOVERY)
+            self.increase_count += 1
+
+        latency_text = (
+            f"成功平均 {avg_latency:.1f}s（基线 {self._baseline_latency:.1f}s）"
+            if avg_latency is not None
+            else "无成功任务"
+        )
+        print(
+            f"【并发】{self.label}最近 {count} 次：失败率 {failure_rate:.0%}，{latency_text}"
+            f"{' 拥塞' if congested else ''} | 活跃标签页 {old_limit} -> {self.limit}，"
+            f"间隔系数 {self.delay_factor:.2f}"
+        )
+
+        async with self._condition:
+            self._condition.notify_all()
+
+    def summary(self):
+        return (
+            f"【并发】{self.label}最终活跃标签页 {self.limit}/{self.max_limit}，"
+            f"间隔系数 {self.delay_factor:.2f}，"
+            f"扩容 {self.increase_count} 次，收缩 {self.decrease_count} 次"
+        )
@@ -0,0 +1,55 @@
+import os
+import time
+
+from playwright.sync_api import sync_playwright
+
+from playwright_utils import (
+    BROWSER_SERVICE_PORT,
+    ENABLE_HEADLESS,
+    USER_AGENT,
+    VIEWPORT,
+    get_profile_dir,
+    wait_for_manual_login,
+)
+
+
+def run_service(base_dir, port=BROWSER_SERVICE_PORT, headless=ENABLE_HEADLESS):
+    """
+    启动常驻浏览器：复用 .playwright_gaokao_profile 持久化目录（登录态 + HTTP 缓存），
+    开放 CDP 端口供爬虫脚本 connect_over_cdp 连接，Ctrl+C 退出。
+    """
+    profile_dir = get_profile_dir(base_dir)
+    os.makedirs(profile_dir, exist_ok=True)
+
+    with sync_playwright() as playwright:
+        context = playwright.chromium.launch_persistent_context(
+            user_data_dir=profile_dir,
+            headless=headless,
+            user_agent=USER_AGENT,
+            ignore_https_errors=True,
+            viewport=VIEWPORT,
+            args=[f"--remote-debugging-port={port}"],
+        )
+        page = context.pages[0] if context.pages else context.new_page()
+
+        # 无头服务沿用 profile 中已有的登录态；有头服务启动时登录一次
+        wait_for_manual_login(page, headless=headless)
+
+        endpoint = f"http://127.0.0.1:{port}"
+        print("=" * 56)
+        print(f"浏览器服务已就绪：{endpoint}")
+        print(f"在其他终端设置 SCRAPER_CDP_ENDPOINT={endpoint} 后运行爬虫脚本")
+        print("按 Ctrl+C 关闭服务")
+        print("=" * 56)
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("正在关闭浏览器服务...")
+        finally:
+            context.close()
+
+
+if __name__ == "__main__":
+    run_service(os.path.dirname(os.path.abspath(__file__)))
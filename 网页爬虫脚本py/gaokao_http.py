@@ -0,0 +1,175 @@
+import gzip
+import http.client
+import json
+import re
+import threading
+import zlib
+from urllib.parse import urlsplit
+
+from playwright_utils import USER_AGENT
+
+
+# 院校基础信息 JSON（gaokao.cn 院校页背后的静态数据接口）
+SCHOOL_INFO_URL_TEMPLATE = "https://static-data.gaokao.cn/www/2.0/school/{school_id}/info.json"
+SCHOOL_INFO_SUCCESS_CODE = "0000"
+SCHOOL_NAME_HTML_PATTERN = re.compile(
+    r'class="[^"]*school-tab_name__3pOZK[^"]*"[^>]*>\s*([^<]+?)\s*<'
+)
+COOKIE_DOMAINS = ("gaokao.cn",)
+HTTP_TIMEOUT_SEC = 5
+INVALID_HTTP_STATUSES = frozenset({404})
+
+
+def build_cookie_header(cookies, domains=COOKIE_DOMAINS):
+    """把 Playwright context.cookies() 导出的 cookie 拼成请求头，仅保留目标站点域名。"""
+    pairs = []
+    for cookie in cookies or []:
+        domain = str(cookie.get("domain", "")).lstrip(".")
+        if any(domain == target or domain.endswith(f".{target}") for target in domains):
+            pairs.append(f"{cookie['name']}={cookie['value']}")
+    return "; ".join(pairs)
+
+
+def _decode_body(body, content_encoding):
+    encoding = (content_encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    return body
+
+
+class GaokaoSchoolInfoClient:
+    """
+    免渲染解析院校 ID：直接请求院校 JSON（或院校页 HTML）读取校名。
+
+    每个线程复用各自的 keep-alive 连接（按 scheme/host/port 池化），
+    可在 asyncio.to_thread 中并发调用；连接池按线程 ID 登记在 _pools 中，close() 统一关闭。url_template 可指向本地桩服务，
+    例如 http://127.0.0.1:8000/school/{school_id}/info.json，用录制的响应做测试。
+
+    resolve() 返回 ("success", 校名) / ("invalid", 原因)；结论不明确时返回 None，
+    由调用方回退到浏览器渲染。
+    """
+
+    def __init__(
+        self,
+        url_template=SCHOOL_INFO_URL_TEMPLATE,
+        cookie_header="",
+        timeout=HTTP_TIMEOUT_SEC,
+        user_agent=USER_AGENT,
+    ):
+        self.url_template = url_template
+        self.cookie_header = cookie_header
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+    def _thread_pool(self):
+        # 线程退出后 ID 可能被新线程复用，复用旧连接池无妨：同一时刻只有一个线程使用
+        with self._pools_lock:
+            return self._pools.setdefault(threading.get_ident(), {})
+
+    def _get_connection(self, scheme, netloc):
+        pool = self._thread_pool()
+
+        key = (scheme, netloc)
+        conn = pool.get(key)
+        if conn is None:
+            conn_cls = (
+                http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            )
+            conn = pool[key] = conn_cls(netloc, timeout=self.timeout)
+        return conn
+
+    def _drop_connection(self, scheme, netloc):
+        conn = self._thread_pool().pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _build_headers(self):
+        headers = {
+            "User-Agent": self.user_agent,
+            "Accept": "application/json, text/html;q=0.9, */*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        }
+        if self.cookie_header:
+            headers["Cookie"] = self.cookie_header
+        return headers
+
+    def _fetch(self, url):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        # keep-alive 连接可能已被服务端关闭，重建连接后重试一次
+        for attempt in range(2):
+            conn = self._get_connection(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", path, headers=self._build_headers())
+                response = conn.getresponse()
+                body = _decode_body(
+                    response.read(), response.getheader("Content-Encoding")
+                )
+                return response.status, response.getheader("Content-Type", ""), body
+            except (http.client.HTTPException, ConnectionError):
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt == 1:
+                    raise
+
+    def _parse_json(self, body):
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            return None
+
+        if not isinstance(payload, dict):
+            return None
+
+        data = payload.get("data")
+        code = str(payload.get("code", ""))
+        if code == SCHOOL_INFO_SUCCESS_CODE and isinstance(data, dict):
+            school_name = str(data.get("name", "")).strip()
+            if school_name:
+                return "success", school_name
+            return None
+
+        if code and code != SCHOOL_INFO_SUCCESS_CODE and not data:
+            return "invalid", "ID不存在"
+
+        return None
+
+    def _parse_html(self, body):
+        match = SCHOOL_NAME_HTML_PATTERN.search(body.decode("utf-8", errors="ignore"))
+        if match:
+            return "success", match.group(1).strip()
+        return None
+
+    def resolve(self, school_id):
+        url = self.url_template.format(school_id=school_id)
+        try:
+            status_code, content_type, body = self._fetch(url)
+        except (OSError, EOFError, zlib.error, http.client.HTTPException):
+            # 含响应体解压失败（截断 / 损坏的 gzip、deflate），交给浏览器兜底
+            return None
+
+        if status_code in INVALID_HTTP_STATUSES:
+            return "invalid", "ID不存在"
+        if status_code != 200:
+            return None
+
+        if "html" in content_type:
+            return self._parse_html(body)
+        return self._parse_json(body)
+
+    def close(self):
+        """关闭所有线程（含 asyncio.to_thread 的工作线程）建立的连接，在并发调用结束后执行。"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            for conn in list(pool.values()):
+                conn.close()
+            pool.clear()
@@ -0,0 +1,116 @@
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+
+# 院校页「招生计划」表格背后的接口：页面加载时会发出一次该请求（默认省份 / 科类 / 第一页）
+PLAN_API_MARKER = "gkv3/plan/school"
+PLAN_SUCCESS_CODE = "0000"
+
+# 与 控制台-中国教育-学校专业组.js 一致：抓取江西（省份 id 36）的全部科类、全部专业组
+PLAN_PROVINCE_ID = 36
+
+# 只解析页面自己发出、带签名的那一次响应，不改写参数重放。
+# 该响应只有在「省份为江西、未按科类 / 专业组筛选、一页已含全部条目」时才算完整，否则回退
+PLAN_PROVINCE_PARAM = "local_province_id"
+PLAN_FILTER_PARAMS = ("local_type_id", "special_group", "sg_id")
+
+# 接口字段（按顺序取第一个非空值）
+PLAN_GROUP_KEYS = ("sg_name", "special_group_name", "group_name")
+PLAN_MAJOR_KEYS = ("spname", "sp_name", "special_name")
+PLAN_COUNT_KEYS = ("num", "plan_num")
+PLAN_SUBJECT_KEYS = ("sg_info", "sp_info", "level2_name")
+PLAN_TYPE_KEYS = ("local_type_name", "type_name", "local_type_id")
+
+PLAN_RESULT_HEADER = ["院校名称", "专业组", "选科", "包含专业"]
+
+
+def is_plan_response(response):
+    return PLAN_API_MARKER in response.url
+
+
+def plan_request_params(url, post_data=None):
+    """请求参数：查询串与请求体（JSON 或表单）合并，值统一为字符串。"""
+    params = dict(parse_qsl(urlsplit(url).query))
+    if post_data:
+        try:
+            body = json.loads(post_data)
+        except ValueError:
+            body = dict(parse_qsl(post_data))
+        if isinstance(body, dict):
+            params.update(body)
+    return {key: str(value) for key, value in params.items()}
+
+
+def describe_plan_request(url, method="GET"):
+    """日志用：只显示接口路径与查询参数名，不打印 cookie / 签名值。"""
+    parts = urlsplit(url)
+    keys = ",".join(key for key, _ in parse_qsl(parts.query))
+    return f"{method} {parts.netloc}{parts.path}?{keys}"
+
+
+def parse_plan_payload(params, payload, province_id=PLAN_PROVINCE_ID):
+    """
+    校验页面自身的招生计划响应是否覆盖了所需的全部数据。
+    返回 (items, None)；不完整或出错时返回 (None, 原因)，由调用方回退到控制台 JS。
+    """
+    if not isinstance(payload, dict) or str(payload.get("code")) != PLAN_SUCCESS_CODE:
+        code = payload.get("code") if isinstance(payload, dict) else None
+        return None, f"code={code}"
+
+    if params.get(PLAN_PROVINCE_PARAM) != str(province_id):
+        return None, f"页面默认省份为 {params.get(PLAN_PROVINCE_PARAM) or '未知'}"
+
+    filters = [key for key in PLAN_FILTER_PARAMS if params.get(key) not in (None, "")]
+    if filters:
+        return None, f"页面请求带筛选参数 {','.join(filters)}"
+
+    data = payload.get("data") or {}
+    items = data.get("item") or []
+    try:
+        total = int(data.get("numFound") or 0)
+    except (TypeError, ValueError):
+        total = 0
+    if total > len(items):
+        return None, f"共 {total} 条，页面只加载了 {len(items)} 条"
+    return items, None
+
+
+def _first_value(item, keys):
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def build_plan_rows(school_name, items):
+    """
+    接口 JSON -> 与控制台 JS 相同格式的二维表：
+    首行为表头，之后每个专业组一行，「包含专业」为「专业名称-计划招生」逗号拼接。
+    同名专业组按科类区分，保持接口返回顺序。
+    缺少专业组字段或没有任何专业组时返回 None 交给调用方回退。
+    """
+    groups = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+
+        group = _first_value(item, PLAN_GROUP_KEYS)
+        if not group:
+            return None
+
+        key = (_first_value(item, PLAN_TYPE_KEYS), group)
+        entry = groups.setdefault(
+            key, {"subject": _first_value(item, PLAN_SUBJECT_KEYS), "majors": []}
+        )
+        entry["majors"].append(
+            f"{_first_value(item, PLAN_MAJOR_KEYS)}-{_first_value(item, PLAN_COUNT_KEYS)}"
+        )
+
+    if not groups:
+        return None
+
+    rows = [list(PLAN_RESULT_HEADER)]
+    for (_, group), entry in groups.items():
+        rows.append([school_name, group, entry["subject"], ", ".join(entry["majors"])])
+    return rows
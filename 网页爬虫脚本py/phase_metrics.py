@@ -0,0 +1,196 @@
+import os
+import sys
+import json
+import time
+import threading
+from datetime import datetime
+
+
+# 分阶段耗时指标：每个 (院校, 组合) 一行 JSON，追加写入；报告按阶段给出 p50/p95/p99 与最慢院校
+METRICS_PERCENTILES = (50, 95, 99)
+METRICS_REPORT_TOP_N = 10
+
+# 报告中的阶段显示名；未登记的阶段直接显示键名
+PHASE_LABELS = {
+    "goto": "打开页面 goto",
+    "page_school_name": "读取院校名",
+    "tab_switch": "切换 tab",
+    "plan_card": "等待卡片",
+    "filter_switch": "页面内切换筛选",
+    "card_filters": "等待筛选项",
+    "list_ready": "等待列表",
+    "extract": "提取数据",
+    "total": "合计",
+}
+
+
+class PhaseTimer:
+    """
+    单个 (院校, 组合) 的计时器：timed 包住一次 await，同名阶段多次进入时累加；
+    begin 开启一个到记录时为止的阶段（用于提取这类有多个出口的尾段）。
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self._started = time.perf_counter()
+        self._open_phase = None
+
+    def _add(self, name, sec):
+        self.phases[name] = self.phases.get(name, 0.0) + sec
+
+    async def timed(self, name, awaitable):
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._add(name, time.perf_counter() - started)
+
+    def begin(self, name):
+        self.end()
+        self._open_phase = (name, time.perf_counter())
+
+    def end(self):
+        if self._open_phase:
+            name, started = self._open_phase
+            self._add(name, time.perf_counter() - started)
+            self._open_phase = None
+
+    def build_record(self, run_id, school_name, target_label, worker_id, outcome):
+        self.end()
+        return {
+            "run_id": run_id,
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "school": school_name,
+            "target": target_label,
+            "worker": worker_id,
+            "outcome": outcome,
+            "phases": {name: round(sec, 3) for name, sec in self.phases.items()},
+            "total": round(time.perf_counter() - self._started, 3),
+        }
+
+
+class MetricsRecorder:
+    """追加写 JSONL；每次写入单独打开文件，写入失败只提示不影响爬取。"""
+
+    def __init__(self, metrics_path):
+        self.metrics_path = metrics_path
+        self.run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            try:
+                with open(self.metrics_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as err:
+                print(f"【警告】耗时指标写入失败: {err}")
+
+    def report(self, top_n=METRICS_REPORT_TOP_N):
+        return format_metrics_report(
+            load_metrics(self.metrics_path, self.run_id), top_n
+        )
+
+
+def load_metrics(metrics_path, run_id=None):
+    """读取 JSONL；run_id 为 None 时返回全部记录，为 "latest" 时只取最后一次运行。"""
+    if not os.path.exists(metrics_path):
+        return []
+
+    records = []
+    with open(metrics_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # 中途被打断时可能留下半行
+
+    if run_id == "latest" and records:
+        run_id = records[-1].get("run_id")
+    if run_id:
+        records = [record for record in records if record.get("run_id") == run_id]
+    return records
+
+
+def percentile(sorted_values, pct):
+    """最近秩法：sorted_values 已升序。"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _outcome_category(outcome):
+    text = str(outcome)
+    for sep in (" ", ":"):
+        text = text.split(sep, 1)[0]
+    return text
+
+
+def format_metrics_report(records, top_n=METRICS_REPORT_TOP_N):
+    if not records:
+        return "【耗时】没有可统计的记录"
+
+    phase_values = {}
+    for record in records:
+        for name, sec in record.get("phases", {}).items():
+            phase_values.setdefault(name, []).append(sec)
+        phase_values.setdefault("total", []).append(record.get("total", 0.0))
+
+    ordered = [name for name in PHASE_LABELS if name in phase_values]
+    ordered += sorted(name for name in phase_values if name not in PHASE_LABELS)
+
+    pct_header = " ".join(f"{f'p{pct}':>7}" for pct in METRICS_PERCENTILES)
+    lines = [
+        f"【耗时】共 {len(records)} 条记录（单位：秒）",
+        f"  {'阶段':<14}{'次数':>6} {pct_header} {'最大':>7}",
+    ]
+    for name in ordered:
+        values = sorted(phase_values[name])
+        pct_text = " ".join(
+            f"{percentile(values, pct):>7.2f}" for pct in METRICS_PERCENTILES
+        )
+        lines.append(
+            f"  {PHASE_LABELS.get(name, name):<14}{len(values):>6} "
+            f"{pct_text} {values[-1]:>7.2f}"
+        )
+
+    outcome_counts = {}
+    for record in records:
+        category = _outcome_category(record.get("outcome", ""))
+        outcome_counts[category] = outcome_counts.get(category, 0) + 1
+    lines.append(
+        "  结果分布："
+        + "，".join(f"{name} {count}" for name, count in outcome_counts.items())
+    )
+
+    slowest = sorted(records, key=lambda record: record.get("total", 0.0), reverse=True)
+    lines.append(f"  最慢 {min(top_n, len(slowest))} 所：")
+    for record in slowest[:top_n]:
+        phases = record.get("phases", {})
+        worst = max(phases, key=phases.get) if phases else ""
+        worst_text = (
+            f"，最慢阶段 {PHASE_LABELS.get(worst, worst)} {phases[worst]:.2f}s"
+            if worst
+            else ""
+        )
+        lines.append(
+            f"    {record.get('total', 0.0):>7.2f}s | {record.get('school')} | "
+            f"{record.get('target')} | {record.get('outcome')}{worst_text}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # 用法：python phase_metrics.py <指标文件.jsonl> [run_id|latest]
+    if len(sys.argv) < 2:
+        print("用法：python phase_metrics.py <指标文件.jsonl> [run_id|latest]")
+        sys.exit(1)
+    print(
+        format_metrics_report(
+            load_metrics(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+        )
+    )
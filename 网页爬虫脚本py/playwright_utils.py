@@ -1,6 +1,10 @@
+import asyncio
 import os
+import threading
+from urllib.parse import urlsplit
 
-from playwright.sync_api import Playwright
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import Playwright, sync_playwright
 
 
 USER_AGENT = (
@@ -10,14 +14,364 @@ USER_AGENT = (
 
 LOGIN_URL = "https://www.gaokao.cn"
 PROFILE_DIR_NAME = ".playwright_gaokao_profile"
+STORAGE_STATE_FILE_NAME = ".playwright_gaokao_state.json"
+VIEWPORT = {"width": 1280, "height": 900}
+
+# 无头模式：设置环境变量 SCRAPER_HEADLESS=1 后，所有爬虫脚本改为无头运行，
+# 登录态从 STORAGE_STATE_FILE_NAME 恢复，不再等待手动登录（适合 Linux 服务器无人值守）。
+# 登录态文件需先在有桌面的机器上执行一次 `python playwright_utils.py` 生成。
+ENABLE_HEADLESS = os.environ.get("SCRAPER_HEADLESS", "") == "1"
+
+# 常驻浏览器服务：先运行 `python browser_service.py` 启动并登录一次，
+# 再设置环境变量 SCRAPER_CDP_ENDPOINT=http://127.0.0.1:9222，爬虫脚本即通过 CDP
+# 连接该浏览器、在其登录态上下文中租用标签页，跳过浏览器冷启动与手动登录。
+BROWSER_SERVICE_PORT = 9222
+BROWSER_SERVICE_ENDPOINT = os.environ.get("SCRAPER_CDP_ENDPOINT", "")
+
+# 通过 CDP 租用的上下文：id(context) -> (browser, 连接时已存在的标签页)
+_SERVICE_SESSIONS = {}
+
+# 资源拦截：按站点配置拦截的资源类型与 URL 黑/白名单（白名单优先）。
+# 图片不直接 abort，而是返回 1x1 透明 GIF，避免 <img> 选择器因尺寸为 0 而判定不可见。
+# 不用 Playwright 的 route：注册任何 route 都会让 Playwright 对整个上下文关闭 HTTP 缓存，
+# 拦截反而拖慢重复访问。改为每个标签页开 CDP 会话，Fetch 只暂停命中拦截类型 / 黑名单的请求，
+# 其余请求不经过拦截，照常走缓存。
+RESOURCE_BLOCK_PROFILES = {
+    "gaokao.cn": {
+        "block_types": {"image", "media", "font"},
+        "allow_patterns": (),
+        "deny_patterns": (
+            "hm.baidu.com",
+            "cnzz.com",
+            "umeng.com",
+            "google-analytics.com",
+            "googletagmanager.com",
+            "doubleclick.net",
+            "pos.baidu.com",
+            "cpro.baidustatic.com",
+        ),
+    },
+    "vt.quark.cn": {
+        "block_types": {"image", "media", "font"},
+        "allow_patterns": (),
+        "deny_patterns": (
+            "arms-retcode",
+            "mmstat.com",
+            "wpk-gateway",
+            "umeng.com",
+            "hm.baidu.com",
+            "doubleclick.net",
+        ),
+    },
+}
+
+# 被拦截请求不会下载，无法得知真实大小：按资源类型的固定估值累计，summary() 中标注为估算
+ESTIMATED_BLOCKED_BYTES = {
+    "image": 40 * 1024,
+    "media": 500 * 1024,
+    "font": 80 * 1024,
+    "script": 30 * 1024,
+}
+ESTIMATED_BLOCKED_BYTES_DEFAULT = 5 * 1024
+
+TRANSPARENT_GIF_BASE64 = "R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+# CDP Fetch 的资源类型名（Playwright 的 resource_type 为其小写形式）
+CDP_RESOURCE_TYPES = (
+    "Document", "Stylesheet", "Image", "Media", "Font", "Script", "TextTrack", "XHR",
+    "Fetch", "EventSource", "WebSocket", "Manifest", "Ping", "Other",
+)
+
+
+class ResourceBlocker:
+    """按站点规则拦截无用请求，并统计拦截数量与估算节省流量（估值，非实测）。"""
+
+    def __init__(self, profile_name):
+        profile = RESOURCE_BLOCK_PROFILES[profile_name]
+        self.profile_name = profile_name
+        self.block_types = set(profile["block_types"])
+        self.allow_patterns = tuple(profile["allow_patterns"])
+        self.deny_patterns = tuple(profile["deny_patterns"])
+        self.request_count = 0
+        self.blocked_count = 0
+        self.estimated_saved_bytes = 0
+        self.blocked_by_type = {}
+        self._lock = threading.Lock()
+
+    def should_block(self, url, resource_type):
+        if any(pattern in url for pattern in self.allow_patterns):
+            return False
+        if resource_type in self.block_types:
+            return True
+        host = urlsplit(url).netloc
+        return any(pattern in host or pattern in url for pattern in self.deny_patterns)
+
+    def fetch_patterns(self):
+        """Fetch.enable 的暂停规则：只暂停拦截类型与黑名单请求，其余请求不经过拦截。"""
+        cdp_types = {name.lower(): name for name in CDP_RESOURCE_TYPES}
+        patterns = [
+            {"urlPattern": "*", "resourceType": cdp_types.get(resource_type, resource_type)}
+            for resource_type in sorted(self.block_types)
+        ]
+        patterns += [{"urlPattern": f"*{pattern}*"} for pattern in self.deny_patterns]
+        return patterns
+
+    def _count_request(self, request):
+        with self._lock:
+            self.request_count += 1
+
+    def _count_blocked(self, resource_type):
+        with self._lock:
+            self.blocked_count += 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            self.estimated_saved_bytes += ESTIMATED_BLOCKED_BYTES.get(
+                resource_type, ESTIMATED_BLOCKED_BYTES_DEFAULT
+            )
+
+    def _resolve_paused(self, event):
+        """Fetch.requestPaused 事件 -> (CDP 方法, 参数)：放行白名单，图片回透明 GIF，其余中止。"""
+        request_id = event["requestId"]
+        resource_type = event.get("resourceType", "Other").lower()
+        if not self.should_block(event["request"]["url"], resource_type):
+            return "Fetch.continueRequest", {"requestId": request_id}
+
+        self._count_blocked(resource_type)
+        if resource_type == "image":
+            return "Fetch.fulfillRequest", {
+                "requestId": request_id,
+                "responseCode": 200,
+                "responseHeaders": [{"name": "Content-Type", "value": "image/gif"}],
+                "body": TRANSPARENT_GIF_BASE64,
+            }
+        return "Fetch.failRequest", {"requestId": request_id, "errorReason": "BlockedByClient"}
+
+    def attach(self, page):
+        """在标签页上开 CDP 会话启用拦截；标签页已关闭时忽略。"""
+        try:
+            session = page.context.new_cdp_session(page)
+
+            def on_paused(event):
+                try:
+                    session.send(*self._resolve_paused(event))
+                except PlaywrightError:
+                    pass  # 标签页已关闭，请求随之取消
+
+            session.on("Fetch.requestPaused", on_paused)
+            session.send("Fetch.enable", {"patterns": self.fetch_patterns()})
+            page.on("request", self._count_request)
+        except PlaywrightError:
+            pass
+
+    async def attach_async(self, page):
+        """attach 的 async 版本。"""
+        try:
+            session = await page.context.new_cdp_session(page)
+
+            async def on_paused(event):
+                try:
+                    await session.send(*self._resolve_paused(event))
+                except PlaywrightError:
+                    pass  # 标签页已关闭，请求随之取消
+
+            session.on("Fetch.requestPaused", on_paused)
+            await session.send("Fetch.enable", {"patterns": self.fetch_patterns()})
+            page.on("request", self._count_request)
+        except PlaywrightError:
+            pass
+
+    def summary(self):
+        total = self.request_count
+        by_type = "，".join(
+            f"{resource_type} {count}"
+            for resource_type, count in sorted(self.blocked_by_type.items())
+        )
+        return (
+            f"【资源拦截 {self.profile_name}】共 {total} 个请求，"
+            f"拦截 {self.blocked_count} 个（{by_type or '无'}），"
+            f"按类型估值约节省 {self.estimated_saved_bytes / 1024 / 1024:.1f} MB"
+            f"（估算，非实测）"
+        )
+
+
+def _blockable_pages(context):
+    """可启用拦截的已有标签页：从常驻服务租用的上下文排除服务端原有的标签页（如登录页）。"""
+    _, initial_pages = _SERVICE_SESSIONS.get(id(context), (None, []))
+    return [page for page in context.pages if page not in initial_pages]
+
+
+def install_resource_blocking(context, profile_name):
+    """
+    在上下文已有标签页与之后新开的标签页上启用拦截。
+    新标签页在 page 事件里挂载，挂载完成前发出的少量请求不拦截。
+    常驻服务的上下文也可使用：拦截不关闭缓存，CDP 会话随断开连接解除，服务端标签页不受影响。
+    """
+    blocker = ResourceBlocker(profile_name)
+    for page in _blockable_pages(context):
+        blocker.attach(page)
+    context.on("page", blocker.attach)
+    return blocker
+
+
+async def install_resource_blocking_async(context, profile_name):
+    """install_resource_blocking 的 async 版本。"""
+    blocker = ResourceBlocker(profile_name)
+    for page in _blockable_pages(context):
+        await blocker.attach_async(page)
+    context.on("page", blocker.attach_async)
+    return blocker
 
 
 def get_profile_dir(base_dir):
     return os.path.join(base_dir, PROFILE_DIR_NAME)
 
 
-def launch_browser(playwright: Playwright, base_dir):
-    """有头模式启动浏览器，并复用登录态目录。"""
+def get_storage_state_path(base_dir):
+    return os.path.join(base_dir, STORAGE_STATE_FILE_NAME)
+
+
+def _require_storage_state(base_dir):
+    state_path = get_storage_state_path(base_dir)
+    if not os.path.exists(state_path):
+        raise FileNotFoundError(
+            f"无头模式需要登录态文件 {state_path}，"
+            f"请先在有桌面的机器上执行 `python playwright_utils.py` 登录并生成"
+        )
+    return state_path
+
+
+def _headless_context_options(state_path):
+    return {
+        "storage_state": state_path,
+        "user_agent": USER_AGENT,
+        "ignore_https_errors": True,
+        "viewport": VIEWPORT,
+    }
+
+
+def capture_storage_state(playwright: Playwright, base_dir):
+    """有头打开持久化 profile，手动登录一次后把 cookie / localStorage 导出为登录态文件。"""
+    context, page = launch_browser(
+        playwright, base_dir, headless=False, service_endpoint=""
+    )
+    try:
+        wait_for_manual_login(page, headless=False)
+        state_path = get_storage_state_path(base_dir)
+        context.storage_state(path=state_path)
+        print(f"登录态已保存：{state_path}")
+        return state_path
+    finally:
+        context.close()
+
+
+def launch_headless_contexts(playwright: Playwright, base_dir, count, browser_count=1):
+    """
+    用登录态文件批量创建无头上下文：count 个 context 轮流分配到 browser_count 个浏览器进程。
+    返回 (browsers, contexts)；关闭 browser 即释放其下所有 context。
+    """
+    state_path = _require_storage_state(base_dir)
+    browsers = [
+        playwright.chromium.launch(headless=True) for _ in range(max(1, browser_count))
+    ]
+    contexts = [
+        browsers[index % len(browsers)].new_context(**_headless_context_options(state_path))
+        for index in range(count)
+    ]
+    return browsers, contexts
+
+
+async def launch_headless_contexts_async(playwright, base_dir, count, browser_count=1):
+    """launch_headless_contexts 的 async 版本。"""
+    state_path = _require_storage_state(base_dir)
+    browsers = [
+        await playwright.chromium.launch(headless=True)
+        for _ in range(max(1, browser_count))
+    ]
+    contexts = [
+        await browsers[index % len(browsers)].new_context(
+            **_headless_context_options(state_path)
+        )
+        for index in range(count)
+    ]
+    return browsers, contexts
+
+
+def connect_browser_service(playwright: Playwright, endpoint=BROWSER_SERVICE_ENDPOINT):
+    """通过 CDP 连接常驻浏览器服务，在其默认（已登录）上下文中租用一个新标签页。"""
+    browser = playwright.chromium.connect_over_cdp(endpoint)
+    context = browser.contexts[0] if browser.contexts else browser.new_context()
+    _SERVICE_SESSIONS[id(context)] = (browser, list(context.pages))
+    print(f"【浏览器服务】已连接 {endpoint}，复用常驻浏览器的登录态与缓存")
+    return context, context.new_page()
+
+
+async def connect_browser_service_async(playwright, endpoint=BROWSER_SERVICE_ENDPOINT):
+    """connect_browser_service 的 async 版本。"""
+    browser = await playwright.chromium.connect_over_cdp(endpoint)
+    context = browser.contexts[0] if browser.contexts else await browser.new_context()
+    _SERVICE_SESSIONS[id(context)] = (browser, list(context.pages))
+    print(f"【浏览器服务】已连接 {endpoint}，复用常驻浏览器的登录态与缓存")
+    return context, await context.new_page()
+
+
+def is_service_context(context):
+    return id(context) in _SERVICE_SESSIONS
+
+
+def close_browser(context):
+    """
+    关闭脚本自己的浏览器；若是从常驻服务租用的上下文，只关闭本次打开的标签页并断开连接，
+    服务端浏览器、登录态与 HTTP 缓存保留给下一次运行。
+    """
+    session = _SERVICE_SESSIONS.pop(id(context), None)
+    if session is None:
+        browser = context.browser
+        context.close()
+        if browser:
+            browser.close()
+        return
+
+    browser, initial_pages = session
+    for page in context.pages:
+        if page not in initial_pages and not page.is_closed():
+            page.close()
+    browser.close()
+
+
+async def close_browser_async(context):
+    """close_browser 的 async 版本。"""
+    session = _SERVICE_SESSIONS.pop(id(context), None)
+    if session is None:
+        browser = context.browser
+        await context.close()
+        if browser:
+            await browser.close()
+        return
+
+    browser, initial_pages = session
+    for page in context.pages:
+        if page not in initial_pages and not page.is_closed():
+            await page.close()
+    await browser.close()
+
+
+def launch_browser(
+    playwright: Playwright,
+    base_dir,
+    headless=ENABLE_HEADLESS,
+    service_endpoint=BROWSER_SERVICE_ENDPOINT,
+):
+    """
+    有头模式启动浏览器并复用登录态目录；无头模式从登录态文件恢复；
+    配置了常驻服务地址时改为通过 CDP 租用服务中的标签页。
+    """
+    if service_endpoint:
+        return connect_browser_service(playwright, service_endpoint)
+
+    if headless:
+        _, contexts = launch_headless_contexts(playwright, base_dir, 1)
+        context = contexts[0]
+        return context, context.new_page()
+
     profile_dir = get_profile_dir(base_dir)
     os.makedirs(profile_dir, exist_ok=True)
 
@@ -26,15 +380,60 @@ def launch_browser(playwright: Playwright, base_dir):
         headless=False,
         user_agent=USER_AGENT,
         ignore_https_errors=True,
-        viewport={"width": 1280, "height": 900},
+        viewport=VIEWPORT,
     )
 
     page = context.pages[0] if context.pages else context.new_page()
     return context, page
 
 
-def wait_for_manual_login(page):
-    """打开首页并暂停，等待用户在浏览器中手动登录。"""
+async def launch_browser_async(
+    playwright,
+    base_dir,
+    headless=ENABLE_HEADLESS,
+    service_endpoint=BROWSER_SERVICE_ENDPOINT,
+):
+    """launch_browser 的 async 版本，供多标签页并发脚本使用。"""
+    if service_endpoint:
+        return await connect_browser_service_async(playwright, service_endpoint)
+
+    if headless:
+        _, contexts = await launch_headless_contexts_async(playwright, base_dir, 1)
+        context = contexts[0]
+        return context, await context.new_page()
+
+    profile_dir = get_profile_dir(base_dir)
+    os.makedirs(profile_dir, exist_ok=True)
+
+    context = await playwright.chromium.launch_persistent_context(
+        user_data_dir=profile_dir,
+        headless=False,
+        user_agent=USER_AGENT,
+        ignore_https_errors=True,
+        viewport=VIEWPORT,
+    )
+
+    page = context.pages[0] if context.pages else await context.new_page()
+    return context, page
+
+
+async def launch_plain_context_async(
+    playwright,
+    viewport,
+    headless=ENABLE_HEADLESS,
+    service_endpoint=BROWSER_SERVICE_ENDPOINT,
+):
+    """无需登录的站点（夸克）：新启浏览器上下文，或从常驻服务租用上下文。"""
+    if service_endpoint:
+        context, page = await connect_browser_service_async(playwright, service_endpoint)
+        await page.close()
+        return context
+
+    browser = await playwright.chromium.launch(headless=headless)
+    return await browser.new_context(viewport=viewport)
+
+
+def _print_login_hint():
     print("=" * 56)
     print("浏览器已打开（有头模式）。")
     print("请在浏览器中完成登录（扫码 / 账号均可）。")
@@ -42,5 +441,41 @@ def wait_for_manual_login(page):
     print("登录完成后，回到此终端按【回车键】继续爬取...")
     print("=" * 56)
 
+
+def _print_headless_hint():
+    print("【无头模式】已从登录态文件恢复登录，跳过手动登录")
+
+
+def _skip_manual_login(page, headless):
+    if is_service_context(page.context):
+        print("【浏览器服务】常驻浏览器已登录，跳过手动登录")
+        return True
+    if headless:
+        _print_headless_hint()
+        return True
+    return False
+
+
+def wait_for_manual_login(page, headless=ENABLE_HEADLESS):
+    """打开首页并暂停，等待用户在浏览器中手动登录。"""
+    if _skip_manual_login(page, headless):
+        return
+
+    _print_login_hint()
     page.goto(LOGIN_URL, wait_until="domcontentloaded")
     input()
+
+
+async def wait_for_manual_login_async(page, headless=ENABLE_HEADLESS):
+    """wait_for_manual_login 的 async 版本；input 放到线程里，不阻塞事件循环。"""
+    if _skip_manual_login(page, headless):
+        return
+
+    _print_login_hint()
+    await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+    await asyncio.to_thread(input)
+
+
+if __name__ == "__main__":
+    with sync_playwright() as playwright:
+        capture_storage_state(playwright, os.path.dirname(os.path.abspath(__file__)))
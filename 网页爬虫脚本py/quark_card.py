@@ -0,0 +1,923 @@
+import time
+import asyncio
+import random
+from urllib.parse import quote
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from quark_engine import TARGET_FILTER_KEYS, QuarkExtractor
+
+
+# 夸克院校页卡片（3_ 分数线 / 4_ 招生计划）共用的筛选读取 / 切换与页面内等待；
+# 各脚本的卡片提取器继承 QuarkCardExtractor，只保留各自卡片的定位与列表解析
+
+# 同一院校的后续组合先点击筛选 tab 在页面内切换（读回筛选值一致才算成功），否则带参数重新打开 URL；
+# 切换后还须等到列表内容变化（或 nodata 展示）才算成功；
+# 连续失败 FILTER_SWITCH_MAX_FAILURES 次（任一次成功即清零）后本次运行不再尝试页面内切换
+ENABLE_IN_PAGE_FILTER_SWITCH = True
+FILTER_SWITCH_OPTION_TIMEOUT_MS = 3000
+FILTER_SWITCH_MAX_FAILURES = 5
+FILTER_SWITCH_LIST_TIMEOUT_MS = 8000
+
+FILTER_TAB_SELECTORS = {
+    "省份": ".select-tabs-tab-chengshi",
+    "年份": ".select-tabs-tab-nianfen",
+    "批次": ".select-tabs-tab-pici",
+    "科类": ".select-tabs-tab-kemu",
+}
+FILTER_HAS_VALUE_LOCATORS = {
+    "批次": ".qk-button-title",
+    "科类": ".select-tabs-genre",
+}
+FILTER_VALUE_POLL_COUNT = 15
+FILTER_VALUE_POLL_INTERVAL = 0.2
+
+SCORE_LOADING_SELECTOR = ".qk-loading.qk-loading-container"
+SCORE_LOADING_APPEAR_TIMEOUT_MS = 3000
+SCORE_LOADING_DISAPPEAR_TIMEOUT_MS = 8000
+NO_ENROLLMENT_HINT_SELECTOR = ".nodata-fenshuxian"
+NO_ENROLLMENT_SETTLE_SEC = 0.1
+NO_ENROLLMENT_MIN_SIZE_PX = 20
+LIST_CHANGE_DEBOUNCE_SEC = 0.2
+LIST_READY_TIMEOUT_MS = 10000
+# 省份 / 年份须与目标一致；批次 / 科类只要求有值
+VALUE_ONLY_FILTERS = ["批次", "科类"]
+
+# 合并爬取（5_夸克高考-合并爬取专业与专业组.py）时，同一院校页已由其他提取器打开，
+# 直接点击 SPA 内本卡片的 tab（提取器的 SPA_TAB_LABEL）取卡片以省一次导航；失败回退打开该卡片的 URL
+TAB_SWITCH_TIMEOUT_MS = 5000
+TAB_SWITCH_MAX_FAILURES = 5  # 连续失败次数，成功即清零
+
+# 在页面内用 MutationObserver 等待卡片状态（列表有行 / nodata 展示 / 筛选值就绪等），
+# DOM 一变化就判定，取代 Python 侧每 0.1~0.5s 的 locator 轮询；关闭或 evaluate 出错时回退轮询。
+# 列表指纹为 selectors.list 各行文本，与 QuarkCardExtractor._get_content_list_fingerprint 一致
+ENABLE_EVENT_DRIVEN_WAITS = True
+CARD_WAIT_RECHECK_MS = 250
+CARD_WAIT_JS = """
+(initialCard, { condition, field, expected, timeoutMs, settleMs, recheckMs, selectors }) => new Promise((resolve) => {
+    // 卡片节点可能被框架整体替换：失联后按选择器重新定位，观察挂在稳定的 document.body 上
+    let card = initialCard;
+    const locateCard = () => {
+        if (card.isConnected) return;
+        const { css, title, titleText } = selectors.card;
+        const found = Array.from(document.querySelectorAll(css)).find(
+            (el) => !titleText || (el.querySelector(title)?.innerText || '').includes(titleText)
+        );
+        if (found) card = found;
+    };
+    const text = (selector) => (card.querySelector(selector)?.innerText || '').trim();
+    const isVisible = (el) => {
+        if (!el) return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const readState = () => {
+        locateCard();
+        const nodataRect = card.querySelector(selectors.nodata)?.getBoundingClientRect();
+        return {
+            hasList: !!card.querySelector(selectors.list),
+            loadingVisible: isVisible(card.querySelector(selectors.loading)),
+            nodataActive: !!nodataRect
+                && nodataRect.width > selectors.nodataMinPx
+                && nodataRect.height > selectors.nodataMinPx,
+            filters: Object.fromEntries(Object.entries(selectors.filters).map(
+                ([key, candidates]) => [key, candidates.map(text).find(Boolean) || '']
+            )),
+        };
+    };
+
+    const nodataReady = (s) => !s.hasList && !s.loadingVisible && s.nodataActive;
+    const fingerprint = () => Array.from(card.querySelectorAll(selectors.list))
+        .map((item) => (item.textContent || '').trim())
+        .join('|');
+    const conditions = {
+        list_or_nodata: (s) => (s.hasList ? 'has_data' : nodataReady(s) ? 'no_enrollment' : ''),
+        // 筛选读回目标值；列表已先有数据时也返回（由调用方校验筛选）
+        filter_value: (s) => (s.filters[field] === expected ? 'value' : s.hasList ? 'has_data' : ''),
+        filter_has_value: (s) => (s.filters[field] ? 'value' : nodataReady(s) ? 'no_enrollment' : ''),
+        filter_equals: (s) => (s.filters[field] === expected ? 'value' : ''),
+        filters_filled_or_nodata: (s) => {
+            if (s.loadingVisible) return '';
+            if ((s.filters['批次'] && s.filters['科类']) || s.hasList) return 'continue';
+            return nodataReady(s) ? 'no_enrollment' : '';
+        },
+        loading_visible: (s) => (s.loadingVisible ? 'loading' : ''),
+        list_changed: () => (fingerprint() !== expected ? 'changed' : ''),
+        list_changed_or_nodata: (s) => (
+            fingerprint() !== expected ? 'changed' : nodataReady(s) ? 'no_enrollment' : ''
+        ),
+    };
+
+    const check = () => conditions[condition](readState());
+
+    let done = false;
+    let pendingReason = '';
+    let settleTimer = null;
+    const finish = (reason) => {
+        if (done) return;
+        done = true;
+        observer.disconnect();
+        clearTimeout(timeoutTimer);
+        clearTimeout(settleTimer);
+        clearInterval(recheckTimer);
+        resolve({ reason, state: readState() });
+    };
+    // 命中后按原因 settle：到期仍是同一原因才返回（nodata 等 100ms、列表变化去抖）
+    const evaluate = () => {
+        if (done) return;
+        const reason = check();
+        if (reason === pendingReason) return;
+        clearTimeout(settleTimer);
+        pendingReason = reason;
+        if (!reason) return;
+        if (!settleMs[reason]) {
+            finish(reason);
+            return;
+        }
+        settleTimer = setTimeout(() => {
+            if (check() === reason) {
+                finish(reason);
+                return;
+            }
+            pendingReason = '';
+            evaluate();
+        }, settleMs[reason]);
+    };
+
+    const observer = new MutationObserver(evaluate);
+    observer.observe(document.body, { childList: true, subtree: true, attributes: true, characterData: true });
+    // 尺寸 / 可见性可能由 CSS 过渡改变而不触发 mutation，页面内低频复查兜底
+    const recheckTimer = setInterval(evaluate, recheckMs);
+    const timeoutTimer = setTimeout(() => finish(''), timeoutMs);
+    evaluate();
+})
+"""
+
+
+class QuarkCardExtractor(QuarkExtractor):
+    """
+    夸克院校页卡片提取器的公共部分：打开院校页 / 点 tab 取卡片、读取 / 等待 / 页面内切换筛选、
+    等待卡片状态与列表刷新；scrape_target 在筛选就绪并校验通过后交给子类的 _extract_card。
+
+    子类另需提供：
+      SPA_TAB_LABEL       院校页 SPA 内本卡片的 tab 文字（如「分数线」）
+      CARD_TITLE          日志里的卡片名称（如「专业分数线」）
+      URL_APP / URL_PARAMS_KEY  卡片 URL 的 app 参数与组合参数名
+      CARD_WAIT_SELECTORS 页面内等待用的选择器（card / list / nodata / nodataMinPx / loading / filters，
+                          见 CARD_WAIT_JS）；list 同时用于列表指纹
+      ALLOW_FILTER_MISMATCH_WITH_LIST  筛选校验不符但列表已有数据时是否继续抓取
+      _wait_for_card()    等待卡片就绪
+      _extract_card()     提取卡片列表
+    """
+
+    SPA_TAB_LABEL = ""
+    CARD_TITLE = ""
+    URL_APP = ""
+    URL_PARAMS_KEY = "params"
+    CARD_WAIT_SELECTORS = {}
+    ALLOW_FILTER_MISMATCH_WITH_LIST = False
+
+    def __init__(self, target_matrix, result_path=None, status_prefix=""):
+        super().__init__(target_matrix, result_path, status_prefix)
+        self._filter_switch_failures = 0
+        self._tab_switch_failures = 0
+
+    @staticmethod
+    def _required_filter_values(target):
+        return {"省份": target["省份"], "年份": target["年份"]}
+
+    def _build_url(self, school_name, target):
+        encoded_school = quote(school_name)
+        params = quote(
+            f'{{"province":"{target["省份"]}","year":"{target["年份"]}",'
+            f'"batch":"{target["批次"]}","genre":"{target["科类"]}"}}'
+        )
+        return (
+            "https://vt.quark.cn/blm/gaokao-college-794/tab"
+            f"?app={self.URL_APP}&university_name={encoded_school}"
+            f"&{self.URL_PARAMS_KEY}={params}"
+        )
+
+    def _parse_subject_requirement(self, text):
+        if not text:
+            return ""
+        if "选科要求：" in text:
+            return text.split("选科要求：")[-1].strip()
+        if "选科要求" in text:
+            return (
+                text.split("选科要求")[-1]
+                .replace(":", "")
+                .replace("：", "")
+                .strip()
+            )
+        return text.strip()
+
+    async def _get_page_school_name(self, page, timeout=5000):
+        name_locator = page.locator(".university-logo-left .qk-title-text em")
+        try:
+            await name_locator.first.wait_for(state="visible", timeout=timeout)
+        except PlaywrightTimeoutError:
+            return None
+        return (await name_locator.first.inner_text()).strip()
+
+    def _is_invalid_filter_value(self, actual, expected):
+        actual_text = str(actual).strip()
+        return bool(actual_text) and actual_text != expected
+
+    def _validate_card_filters(self, filters, target):
+        for key, expected in self._required_filter_values(target).items():
+            actual = str(filters.get(key, "")).strip()
+            if actual != expected:
+                return False, key, expected, actual
+
+        for key in VALUE_ONLY_FILTERS:
+            actual = str(filters.get(key, "")).strip()
+            if not actual:
+                return False, key, "有值", actual
+
+        return True, "", "", ""
+
+    async def _get_locator_text(self, locator):
+        if await locator.count() == 0:
+            return ""
+        return (await locator.first.inner_text()).strip()
+
+    async def _get_card_filters(self, card):
+        genre_text = await self._get_locator_text(
+            card.locator(f"{FILTER_TAB_SELECTORS['科类']} .select-tabs-genre span")
+        )
+        if not genre_text:
+            genre_text = await self._get_locator_text(
+                card.locator(f"{FILTER_TAB_SELECTORS['科类']} .select-tabs-genre")
+            )
+
+        return {
+            "省份": await self._get_locator_text(
+                card.locator(f"{FILTER_TAB_SELECTORS['省份']} .qk-button-title")
+            ),
+            "年份": await self._get_locator_text(
+                card.locator(f"{FILTER_TAB_SELECTORS['年份']} .qk-button-title")
+            ),
+            "批次": await self._get_locator_text(
+                card.locator(f"{FILTER_TAB_SELECTORS['批次']} .qk-button-title")
+            ),
+            "科类": genre_text,
+        }
+
+    def _log_card_filters(self, filters, stage, school_name):
+        def show(value):
+            text = str(value).strip() if value is not None else ""
+            return text if text else "(空)"
+
+        print(
+            f"【筛选】{stage} | "
+            f"省份={show(filters.get('省份'))}，"
+            f"年份={show(filters.get('年份'))}，"
+            f"批次={show(filters.get('批次'))}，"
+            f"科类={show(filters.get('科类'))} "
+            f"[{school_name}]"
+        )
+
+    async def _has_list_data(self, card):
+        return await card.locator(self.CARD_WAIT_SELECTORS["list"]).count() > 0
+
+    async def _get_content_list_fingerprint(self, card):
+        return await card.locator(self.CARD_WAIT_SELECTORS["list"]).evaluate_all(
+            """(items) => items
+                .map((item) => (item.textContent || '').trim())
+                .join('|')"""
+        )
+
+    async def _wait_for_card_state(self, card, condition, timeout_ms, field="", expected=""):
+        """
+        页面内 MutationObserver 等待卡片满足 condition（见 CARD_WAIT_JS）。
+        返回 (命中原因, 页面状态)：超时原因为空串；未启用或 evaluate 出错返回 (None, None)，调用方回退轮询。
+        """
+        if not ENABLE_EVENT_DRIVEN_WAITS:
+            return None, None
+
+        try:
+            result = await card.evaluate(
+                CARD_WAIT_JS,
+                {
+                    "condition": condition,
+                    "field": field,
+                    "expected": expected,
+                    "timeoutMs": int(timeout_ms),
+                    "settleMs": {
+                        "no_enrollment": int(NO_ENROLLMENT_SETTLE_SEC * 1000),
+                        "changed": int(LIST_CHANGE_DEBOUNCE_SEC * 1000),
+                    },
+                    "recheckMs": CARD_WAIT_RECHECK_MS,
+                    "selectors": self.CARD_WAIT_SELECTORS,
+                },
+            )
+        except Exception as err:
+            print(f"【警告】页面内等待 {condition} 失败，回退轮询: {err}")
+            return None, None
+        return result["reason"], result["state"]
+
+    async def _is_nodata_visually_active(self, card):
+        """nodata 默认 block 但高度为 0；宽高均 > 20px 才表示真正展示出来。"""
+        no_data = card.locator(NO_ENROLLMENT_HINT_SELECTOR)
+        if await no_data.count() == 0:
+            return False
+
+        return await no_data.first.evaluate(
+            f"""(el) => {{
+                const rect = el.getBoundingClientRect();
+                return rect.width > {NO_ENROLLMENT_MIN_SIZE_PX}
+                    && rect.height > {NO_ENROLLMENT_MIN_SIZE_PX};
+            }}"""
+        )
+
+    async def _is_score_loading_visible(self, card):
+        loading = card.locator(SCORE_LOADING_SELECTOR)
+        if await loading.count() == 0:
+            return False
+        return await loading.first.is_visible()
+
+    async def _wait_for_score_loading_hidden(self, card, timeout_ms):
+        loading = card.locator(SCORE_LOADING_SELECTOR)
+        if await loading.count() == 0:
+            return True
+        if not await loading.first.is_visible():
+            return True
+
+        try:
+            await loading.first.wait_for(state="hidden", timeout=timeout_ms)
+            return True
+        except PlaywrightTimeoutError:
+            return False
+
+    async def _wait_loading_gone_then_settle(self, card, timeout_ms):
+        """loading 可见则等到不可见，消失后再等 100ms。"""
+        if not await self._is_score_loading_visible(card):
+            return True
+
+        if not await self._wait_for_score_loading_hidden(card, timeout_ms):
+            return False
+
+        await asyncio.sleep(NO_ENROLLMENT_SETTLE_SEC)
+        return True
+
+    async def _should_early_stop_no_enrollment(self, card):
+        """列表无数据、loading 已消失并 settle、nodata 已展示 → 本省未招生。"""
+        if await self._has_list_data(card):
+            return False
+
+        if not await self._wait_loading_gone_then_settle(
+            card, SCORE_LOADING_DISAPPEAR_TIMEOUT_MS
+        ):
+            return False
+
+        if await self._has_list_data(card):
+            return False
+
+        return await self._is_nodata_visually_active(card)
+
+    async def _wait_for_filter_has_value(self, card, field_name, school_name):
+        tab_selector = FILTER_TAB_SELECTORS[field_name]
+        value_selector = FILTER_HAS_VALUE_LOCATORS.get(
+            field_name, ".qk-button-title"
+        )
+        value_locator = card.locator(f"{tab_selector} {value_selector}").first
+
+        try:
+            await value_locator.wait_for(state="visible", timeout=5000)
+        except PlaywrightTimeoutError:
+            filters = await self._get_card_filters(card)
+            self._log_card_filters(filters, f"{field_name}筛选框未出现", school_name)
+            return False, "load", f"{field_name}筛选框未出现", filters
+
+        reason, state = await self._wait_for_card_state(
+            card,
+            "filter_has_value",
+            FILTER_VALUE_POLL_COUNT * FILTER_VALUE_POLL_INTERVAL * 1000,
+            field=field_name,
+        )
+        if reason == "value":
+            self._log_card_filters(state["filters"], f"{field_name}有值", school_name)
+            return True, "", "", state["filters"]
+        if reason == "no_enrollment":
+            self._log_card_filters(
+                state["filters"], f"{field_name}等待期间本省未招生", school_name
+            )
+            return False, "no_enrollment", "nodata-fenshuxian已展示", state["filters"]
+
+        for _ in range(FILTER_VALUE_POLL_COUNT if reason is None else 0):
+            if await self._should_early_stop_no_enrollment(card):
+                filters = await self._get_card_filters(card)
+                self._log_card_filters(
+                    filters, f"{field_name}等待期间本省未招生", school_name
+                )
+                return False, "no_enrollment", "nodata-fenshuxian已展示", filters
+
+            filters = await self._get_card_filters(card)
+            actual = str(filters.get(field_name, "")).strip()
+            if actual:
+                self._log_card_filters(filters, f"{field_name}有值", school_name)
+                return True, "", "", filters
+            await asyncio.sleep(FILTER_VALUE_POLL_INTERVAL)
+
+        if await self._should_early_stop_no_enrollment(card):
+            filters = await self._get_card_filters(card)
+            self._log_card_filters(
+                filters, f"{field_name}超时后本省未招生", school_name
+            )
+            return False, "no_enrollment", "nodata-fenshuxian已展示", filters
+
+        filters = await self._get_card_filters(card)
+        self._log_card_filters(filters, f"{field_name}值未就绪", school_name)
+        return False, "load", f"{field_name}值为空", filters
+
+    async def _wait_for_filter_equals(self, card, field_name, expected_value):
+        reason, _ = await self._wait_for_card_state(
+            card,
+            "filter_equals",
+            FILTER_SWITCH_OPTION_TIMEOUT_MS,
+            field=field_name,
+            expected=expected_value,
+        )
+        if reason is not None:
+            return reason == "value"
+
+        for _ in range(FILTER_VALUE_POLL_COUNT):
+            filters = await self._get_card_filters(card)
+            if filters.get(field_name) == expected_value:
+                return True
+            await asyncio.sleep(FILTER_VALUE_POLL_INTERVAL)
+        return False
+
+    async def _wait_for_list_refresh(self, card, previous_fingerprint):
+        """页面内切换筛选后，等列表内容相对切换前变化，或 nodata 展示（新组合无招生）。"""
+        reason, _ = await self._wait_for_card_state(
+            card,
+            "list_changed_or_nodata",
+            FILTER_SWITCH_LIST_TIMEOUT_MS,
+            expected=previous_fingerprint,
+        )
+        if reason is not None:
+            return bool(reason)
+
+        deadline = time.monotonic() + FILTER_SWITCH_LIST_TIMEOUT_MS / 1000
+        while time.monotonic() < deadline:
+            if await self._get_content_list_fingerprint(card) != previous_fingerprint:
+                await asyncio.sleep(LIST_CHANGE_DEBOUNCE_SEC)
+                return True
+            no_list = not await self._has_list_data(card)
+            if no_list and await self._is_nodata_visually_active(card):
+                return True
+            await asyncio.sleep(0.1)
+        return False
+
+    async def _switch_card_filters(
+        self, page, card, target, school_name, worker_id, fresh_card=False
+    ):
+        """
+        在已打开的院校页内把筛选切到 target：逐个点开与目标不同的筛选 tab，
+        点选文字完全一致的可见选项并等待读回一致。任一步失败返回 False，由调用方重新打开 URL。
+        fresh_card 为刚点 tab 取到的卡片，筛选值可能尚未渲染，先等各筛选有值再读取。
+        """
+        try:
+            if fresh_card:
+                for field_name in TARGET_FILTER_KEYS:
+                    value_ready, _, value_error, _ = await self._wait_for_filter_has_value(
+                        card, field_name, school_name
+                    )
+                    if not value_ready:
+                        raise RuntimeError(value_error)
+
+            filters = await self._get_card_filters(card)
+            if all(filters.get(key) == target[key] for key in TARGET_FILTER_KEYS):
+                return True
+            if not ENABLE_IN_PAGE_FILTER_SWITCH:
+                return False
+            if self._filter_switch_failures >= FILTER_SWITCH_MAX_FAILURES:
+                return False
+
+            # 点击前记下列表指纹：筛选读回一致时列表可能仍是旧组合的，须等列表刷新
+            previous_fingerprint = await self._get_content_list_fingerprint(card)
+            for field_name in TARGET_FILTER_KEYS:
+                expected_value = target[field_name]
+                if filters.get(field_name) == expected_value:
+                    continue
+
+                await card.locator(FILTER_TAB_SELECTORS[field_name]).first.click(
+                    timeout=FILTER_SWITCH_OPTION_TIMEOUT_MS
+                )
+                # 下拉层一般挂在 body 末尾，取最后一个可见的同名文字
+                option = page.get_by_text(expected_value, exact=True).locator(
+                    "visible=true"
+                )
+                await option.last.click(timeout=FILTER_SWITCH_OPTION_TIMEOUT_MS)
+                if not await self._wait_for_filter_equals(
+                    card, field_name, expected_value
+                ):
+                    raise RuntimeError(f"{field_name}未切换到「{expected_value}」")
+                filters = await self._get_card_filters(card)
+
+            if not await self._wait_for_list_refresh(card, previous_fingerprint):
+                raise RuntimeError("列表未随筛选刷新")
+        except Exception as err:
+            self._filter_switch_failures += 1
+            print(
+                f"[W{worker_id}] 【提示】页面内切换到 {target['label']} 失败，"
+                f"改为重新打开 URL: {school_name}（{err}）"
+            )
+            if self._filter_switch_failures == FILTER_SWITCH_MAX_FAILURES:
+                print(
+                    f"【警告】页面内切换筛选已失败 {FILTER_SWITCH_MAX_FAILURES} 次，"
+                    f"本次运行后续组合均重新打开 URL"
+                )
+            return False
+
+        self._filter_switch_failures = 0
+        self._log_card_filters(filters, f"页面内切换到 {target['label']}", school_name)
+        return True
+
+    async def _poll_list_or_no_enrollment(self, card, timeout_ms):
+        """
+        轮询列表与 nodata：有列表=有招生；
+        loading 可见则 wait_for(hidden) 后再等 100ms；
+        nodata 宽高>20px 则提前终止。
+        返回 has_data | no_enrollment | timeout
+        """
+        reason, _ = await self._wait_for_card_state(card, "list_or_nodata", timeout_ms)
+        if reason is None:
+            reason = await self._sleep_poll_list_or_no_enrollment(card, timeout_ms)
+        if reason:
+            return reason
+
+        if await self._has_list_data(card):
+            return "has_data"
+
+        if await self._should_early_stop_no_enrollment(card):
+            return "no_enrollment"
+
+        return "timeout"
+
+    async def _sleep_poll_list_or_no_enrollment(self, card, timeout_ms):
+        """事件等待不可用时的轮询版本；返回 has_data | no_enrollment，超时返回空串。"""
+        deadline = time.monotonic() + timeout_ms / 1000
+
+        while time.monotonic() < deadline:
+            if await self._has_list_data(card):
+                return "has_data"
+
+            remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+
+            if await self._is_score_loading_visible(card):
+                if not await self._wait_loading_gone_then_settle(card, remaining_ms):
+                    break
+
+                if await self._has_list_data(card):
+                    return "has_data"
+
+                if await self._is_nodata_visually_active(card):
+                    return "no_enrollment"
+
+                continue
+
+            if await self._is_nodata_visually_active(card):
+                return "no_enrollment"
+
+            await asyncio.sleep(NO_ENROLLMENT_SETTLE_SEC)
+
+        return ""
+
+    async def _wait_for_score_module_settled(self, card, school_name):
+        loading = card.locator(SCORE_LOADING_SELECTOR)
+        reason, _ = await self._wait_for_card_state(
+            card, "loading_visible", SCORE_LOADING_APPEAR_TIMEOUT_MS
+        )
+        loading_appeared = bool(reason)
+
+        if reason is None:
+            appear_deadline = time.monotonic() + SCORE_LOADING_APPEAR_TIMEOUT_MS / 1000
+            while time.monotonic() < appear_deadline:
+                if await self._is_score_loading_visible(card):
+                    loading_appeared = True
+                    break
+                await asyncio.sleep(FILTER_VALUE_POLL_INTERVAL)
+
+        if loading_appeared:
+            try:
+                await loading.first.wait_for(
+                    state="hidden", timeout=SCORE_LOADING_DISAPPEAR_TIMEOUT_MS
+                )
+            except PlaywrightTimeoutError:
+                return False, "load", "分数模块loading未消失"
+        else:
+            await asyncio.sleep(0.5)
+
+        poll_result = await self._poll_list_or_no_enrollment(
+            card, LIST_READY_TIMEOUT_MS
+        )
+        if poll_result == "no_enrollment":
+            filters = await self._get_card_filters(card)
+            self._log_card_filters(filters, "分数模块加载后nodata显示", school_name)
+            return False, "no_enrollment", "nodata-fenshuxian已展示"
+
+        return True, "", ""
+
+    async def _wait_for_filter_value(self, card, field_name, expected_value, school_name):
+        tab_selector = FILTER_TAB_SELECTORS[field_name]
+        title_locator = card.locator(f"{tab_selector} .qk-button-title").first
+
+        try:
+            await title_locator.wait_for(state="visible", timeout=5000)
+        except PlaywrightTimeoutError:
+            filters = await self._get_card_filters(card)
+            self._log_card_filters(filters, f"{field_name}筛选框未出现", school_name)
+            return False, "load", f"{field_name}筛选框未出现", filters
+
+        reason, state = await self._wait_for_card_state(
+            card,
+            "filter_value",
+            FILTER_VALUE_POLL_COUNT * FILTER_VALUE_POLL_INTERVAL * 1000,
+            field=field_name,
+            expected=expected_value,
+        )
+        if reason == "value":
+            self._log_card_filters(state["filters"], f"{field_name}就绪", school_name)
+            return True, "", "", state["filters"]
+        if reason == "has_data":
+            self._log_card_filters(
+                state["filters"], f"{field_name}未就绪但列表已有数据", school_name
+            )
+            return True, "", "", state["filters"]
+
+        for _ in range(15 if reason is None else 0):
+            actual = await self._get_locator_text(
+                card.locator(f"{tab_selector} .qk-button-title")
+            )
+            if actual == expected_value:
+                filters = await self._get_card_filters(card)
+                self._log_card_filters(filters, f"{field_name}就绪", school_name)
+                return True, "", "", filters
+
+            if await self._has_list_data(card):
+                filters = await self._get_card_filters(card)
+                self._log_card_filters(
+                    filters, f"{field_name}未就绪但列表已有数据", school_name
+                )
+                return True, "", "", filters
+
+            await asyncio.sleep(0.2)
+
+        filters = await self._get_card_filters(card)
+        actual = str(filters.get(field_name, "")).strip()
+        if actual == expected_value:
+            self._log_card_filters(filters, f"{field_name}就绪", school_name)
+            return True, "", "", filters
+
+        if await self._has_list_data(card):
+            self._log_card_filters(
+                filters, f"{field_name}超时但列表已有数据", school_name
+            )
+            return True, "", "", filters
+
+        if self._is_invalid_filter_value(actual, expected_value):
+            self._log_card_filters(filters, f"{field_name}无效", school_name)
+            return False, "invalid", f"{field_name}={actual}", filters
+
+        self._log_card_filters(filters, f"{field_name}值未就绪", school_name)
+        return False, "load", f"{field_name}值未就绪", filters
+
+    async def _wait_for_card_filters(self, card, school_name, target):
+        province_ready, province_error_type, province_error, filters = (
+            await self._wait_for_filter_value(
+                card, "省份", target["省份"], school_name
+            )
+        )
+        if not province_ready:
+            return False, province_error_type, province_error, filters
+
+        year_ready, year_error_type, year_error, filters = (
+            await self._wait_for_filter_value(
+                card, "年份", target["年份"], school_name
+            )
+        )
+        if not year_ready:
+            return False, year_error_type, year_error, filters
+
+        module_ready, module_error_type, module_error = (
+            await self._wait_for_score_module_settled(card, school_name)
+        )
+        if not module_ready:
+            filters = await self._get_card_filters(card)
+            return False, module_error_type, module_error, filters
+
+        for field_name in VALUE_ONLY_FILTERS:
+            value_ready, value_error_type, value_error, filters = (
+                await self._wait_for_filter_has_value(card, field_name, school_name)
+            )
+            if not value_ready:
+                return False, value_error_type, value_error, filters
+
+        filters = await self._get_card_filters(card)
+        self._log_card_filters(filters, "筛选就绪", school_name)
+        return True, "", "", filters
+
+    async def _has_no_local_enrollment_hint(self, card):
+        return await self._should_early_stop_no_enrollment(card)
+
+    async def _wait_for_card(self, page, school_name, worker_id):
+        """等待本卡片挂载并就绪，返回卡片 locator；未就绪返回 None。由子类实现。"""
+        raise NotImplementedError
+
+    async def _extract_card(
+        self, card, row_index, school_name, target, worker_id, filters, page_school_name, phases
+    ):
+        """
+        筛选已就绪并校验通过后提取卡片列表、追加结果行并写状态，返回结果文本。由子类实现。
+        抛出的异常由 scrape_target 统一记为「失败」。
+        """
+        raise NotImplementedError
+
+    async def _open_card_tab(self, page, school_name, worker_id):
+        """院校页已由其他提取器打开时点击 SPA_TAB_LABEL tab 取卡片；失败返回 None，由调用方打开 URL。"""
+        if self._tab_switch_failures >= TAB_SWITCH_MAX_FAILURES:
+            return None
+
+        try:
+            await page.get_by_text(self.SPA_TAB_LABEL, exact=True).first.click(
+                timeout=TAB_SWITCH_TIMEOUT_MS
+            )
+            card = await self._wait_for_card(page, school_name, worker_id)
+            if card is None:
+                raise RuntimeError(f"{self.CARD_TITLE}模块未就绪")
+            self._tab_switch_failures = 0
+            return card
+        except Exception as err:
+            self._tab_switch_failures += 1
+            print(
+                f"[W{worker_id}] 【提示】页面内切换到「{self.SPA_TAB_LABEL}」失败，"
+                f"改为重新打开 URL: {school_name}（{err}）"
+            )
+            if self._tab_switch_failures == TAB_SWITCH_MAX_FAILURES:
+                print(
+                    f"【警告】「{self.SPA_TAB_LABEL}」tab 切换已失败 {TAB_SWITCH_MAX_FAILURES} 次，"
+                    f"本次运行后续均重新打开 URL"
+                )
+            return None
+
+    async def scrape_target(
+        self, page, row_index, school_name, target, worker_id, visit, phases
+    ):
+        """
+        抓取单个 (院校, 组合)，各等待步骤经 phases 计时（visit / phases 说明见 QuarkExtractor）。
+        有已打开的卡片则先在页面内切换筛选；院校页已由其他提取器打开（school_loaded）则先点 tab 取卡片；
+        都不行时带组合参数打开 URL。
+        """
+        result_text = "失败"
+
+        try:
+            if visit["card"] is not None and not await phases.timed(
+                "filter_switch",
+                self._switch_card_filters(
+                    page, visit["card"], target, school_name, worker_id
+                ),
+            ):
+                visit["card"] = None
+                visit["school_loaded"] = False
+
+            if visit["card"] is None and visit["school_loaded"]:
+                card = await phases.timed(
+                    "tab_switch", self._open_card_tab(page, school_name, worker_id)
+                )
+                if card is not None and await phases.timed(
+                    "filter_switch",
+                    self._switch_card_filters(
+                        page, card, target, school_name, worker_id, fresh_card=True
+                    ),
+                ):
+                    visit["card"] = card
+
+            if visit["card"] is None:
+                url = self._build_url(school_name, target)
+                await page.bring_to_front()
+                await asyncio.sleep(random.uniform(0.1, 0.32))
+                await phases.timed(
+                    "goto", page.goto(url, wait_until="domcontentloaded")
+                )
+
+                page_school_name = await phases.timed(
+                    "page_school_name", self._get_page_school_name(page)
+                )
+                if page_school_name is None:
+                    print(
+                        f"[W{worker_id}] 【失败】未等到院校名 em 元素: {school_name}"
+                    )
+                    await asyncio.sleep(3)
+                    self.engine.save_status(row_index, target, "失败-未加载")
+                    result_text = "失败-未加载"
+                    return result_text
+
+                if page_school_name == "undefined":
+                    print(
+                        f"[W{worker_id}] 【本省未招生】页面院校名为 undefined 字符串，"
+                        f"判定该省未招生: {school_name}"
+                    )
+                    self.engine.save_status(row_index, target, "本省未招生")
+                    result_text = "本省未招生"
+                    return result_text
+
+                card = await phases.timed(
+                    "plan_card", self._wait_for_card(page, school_name, worker_id)
+                )
+                if card is None:
+                    print(
+                        f"[W{worker_id}] 【失败】未找到{self.CARD_TITLE}模块: {school_name}"
+                    )
+                    await asyncio.sleep(3)
+                    self.engine.save_status(row_index, target, "失败-未加载")
+                    result_text = "失败-未加载"
+                    return result_text
+
+                if not page_school_name:
+                    print(f"[W{worker_id}] 【警告】未读取到页面院校名称: {school_name}")
+                elif page_school_name != school_name:
+                    print(
+                        f"[W{worker_id}] 【提示】名称不一致，查询「{school_name}」，"
+                        f"页面「{page_school_name}」"
+                    )
+
+                visit["card"] = card
+                visit["page_school_name"] = page_school_name
+                visit["school_loaded"] = True
+
+            card = visit["card"]
+            page_school_name = visit["page_school_name"]
+
+            filters_ready, error_type, filter_error, filters = await phases.timed(
+                "card_filters", self._wait_for_card_filters(card, school_name, target)
+            )
+            if not filters_ready:
+                if error_type == "invalid":
+                    print(
+                        f"[W{worker_id}] 【无效数据】{filter_error}，"
+                        f"非{target['label']}: {school_name}"
+                    )
+                    self.engine.save_status(row_index, target, "无效数据")
+                    result_text = "无效数据"
+                elif error_type == "no_enrollment":
+                    print(
+                        f"[W{worker_id}] 【本省未招生】"
+                        f"{target['label']} 已就绪，"
+                        f"{filter_error or 'nodata-fenshuxian已展示'}: "
+                        f"{school_name}"
+                    )
+                    self.engine.save_status(row_index, target, "本省未招生")
+                    result_text = "本省未招生"
+                else:
+                    print(f"[W{worker_id}] 【失败】{filter_error}: {school_name}")
+                    self.engine.save_status(row_index, target, "失败-未加载")
+                    result_text = "失败-未加载"
+                return result_text
+
+            filter_ok, filter_key, expected, actual = self._validate_card_filters(
+                filters, target
+            )
+            if not filter_ok:
+                self._log_card_filters(filters, "校验失败", school_name)
+                actual_text = str(actual).strip()
+                if self.ALLOW_FILTER_MISMATCH_WITH_LIST and await self._has_list_data(card):
+                    print(
+                        f"[W{worker_id}] 【警告】「{filter_key}」"
+                        f"期望「{expected}」实际「{actual_text}」，"
+                        f"但列表已有数据，继续抓取: {school_name}"
+                    )
+                elif filter_key in self._required_filter_values(target) and actual_text:
+                    print(
+                        f"[W{worker_id}] 【无效数据】「{filter_key}」"
+                        f"期望「{expected}」实际「{actual_text}」: {school_name}"
+                    )
+                    self.engine.save_status(row_index, target, "无效数据")
+                    result_text = "无效数据"
+                    return result_text
+                else:
+                    print(
+                        f"[W{worker_id}] 【失败】「{filter_key}」不符: {school_name}"
+                    )
+                    self.engine.save_status(row_index, target, f"失败-{filter_key}错误")
+                    result_text = f"失败-{filter_key}错误"
+                    return result_text
+
+            result_text = await self._extract_card(
+                card, row_index, school_name, target, worker_id,
+                filters, page_school_name, phases,
+            )
+
+        except Exception as err:
+            self.engine.save_status(row_index, target, "失败")
+            visit["card"] = None
+            visit["school_loaded"] = False
+            result_text = f"异常: {err}"
+            print(
+                f"[W{worker_id}] 异常 | 行号{row_index} | "
+                f"{school_name} | {target['label']} | {err}"
+            )
+
+        return result_text
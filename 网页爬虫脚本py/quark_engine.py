@@ -0,0 +1,1125 @@
+import os
+import sys
+import csv
+import time
+import random
+import asyncio
+import threading
+import multiprocessing
+from queue import Empty as ReportQueueEmpty
+
+import pandas as pd
+from playwright.async_api import async_playwright
+
+from playwright_utils import (
+    BROWSER_SERVICE_ENDPOINT,
+    close_browser_async,
+    install_resource_blocking_async,
+    launch_plain_context_async,
+)
+from adaptive_concurrency import AimdController
+from phase_metrics import MetricsRecorder, PhaseTimer
+from script_loader import load_script_module
+
+
+# 夸克高考院校页爬取的公共调度：状态表、进度、运行内重试、自适应并发、多进程分片与耗时指标。
+# 3_/4_/5_ 夸克脚本只实现各自卡片的提取（QuarkExtractor 子类），交给 QuarkScrapeEngine 运行
+QUARK_HOST = "vt.quark.cn"
+TARGET_FILTER_KEYS = ("省份", "年份", "批次", "科类")
+SKIP_STATUSES = {"成功", "无效数据", "本省未招生", "失败-无数据"}
+
+# 并发：ENABLE_CONCURRENT 为 False 时单标签页顺序执行
+ENABLE_CONCURRENT = True
+CONCURRENT_WORKERS = 16
+BROWSER_VIEWPORT = {"width": 1920, "height": 1080}
+
+# 自适应并发：CONCURRENT_WORKERS 为初始活跃标签页数，预先打开 ADAPTIVE_MAX_WORKERS 个标签页，
+# 由 AIMD 控制器按最近的延迟与失败率增减活跃数量，并调整院校之间 1~2s 的随机间隔
+ENABLE_ADAPTIVE_CONCURRENCY = True
+ADAPTIVE_MAX_WORKERS = 24
+ADAPTIVE_MIN_WORKERS = 2
+# 临时性失败：加载失败或异常，多为限流 / 网络拥塞，计入失败率并参与本次运行内重试；
+# 本省未招生、无效数据等确定结果不计入也不重试
+TRANSIENT_RESULTS = {"失败", "失败-未加载"}
+
+# 运行内重试：临时性失败的组合按指数退避（BASE × 2^(n-1)，封顶 MAX）放回队列末尾，
+# 优先交给其他标签页；每所院校最多尝试 RETRY_MAX_ATTEMPTS 次，仍失败的留给下次运行
+ENABLE_IN_RUN_RETRY = True
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BACKOFF_BASE_SEC = 5
+RETRY_BACKOFF_MAX_SEC = 60
+RETRY_IDLE_POLL_SEC = 0.5
+
+# 分阶段耗时指标：每个 (院校, 组合) 的各阶段耗时与结果追加写入提取器的 METRICS_FILE_NAME
+# （JSONL，与结果表同目录），运行结束打印各阶段 p50/p95/p99 与最慢院校
+ENABLE_PHASE_METRICS = True
+
+# 资源拦截：屏蔽图片 / 字体 / 视频 / 统计广告脚本，结束时打印拦截统计
+ENABLE_RESOURCE_BLOCKING = True
+
+# 状态表落盘：内存更新后由后台定时批量写入，降低 Windows 下 os.replace 冲突
+STATUS_FLUSH_INTERVAL_SEC = 1.0
+
+# 多进程分片：协调进程把待爬院校轮流分给 SHARD_PROCESS_COUNT 个子进程，每个子进程各自启动浏览器
+# 与 SHARD_WORKERS_PER_PROCESS 个标签页；子进程只把状态与结果行发回，由协调进程单点写状态表 / 结果表。
+# 子进程按 (模块名, 模块文件, 类名) 重建提取器，3_/4_ 直接运行与 5_ 按路径加载的提取器都适用
+ENABLE_SHARDED_PROCESSES = False
+SHARD_PROCESS_COUNT = 4
+SHARD_WORKERS_PER_PROCESS = 4
+SHARD_REPORT_POLL_SEC = 0.5
+FILE_WRITE_MAX_RETRIES = 5
+FILE_WRITE_RETRY_DELAY_SEC = 0.3
+
+# 结果表：源表带入字段
+SOURCE_INFO_RESULT_COLUMNS = [
+    "主管部门",
+]
+
+# 结果表：新源表额外字段（普通高校.csv 遍历时带入，不含序号/学校名称/状态）
+# 源表「省份」写入「院校省份」，避免与爬取筛选条件「省份」重名
+SOURCE_EXTRA_RESULT_COLUMNS = [
+    "院校省份",
+    "城市",
+    "985",
+    "211",
+    "双一流",
+    "类型",
+    "层次",
+    "性质",
+]
+
+SOURCE_EXTRA_COLUMN_MAP = {
+    "院校省份": "省份",
+    "城市": "城市",
+    "985": "985",
+    "211": "211",
+    "双一流": "双一流",
+    "类型": "类型",
+    "层次": "层次",
+    "性质": "性质",
+}
+
+CSV_READ_ENCODINGS = ("utf-8-sig", "utf-8", "gbk", "gb18030")
+
+
+def read_csv_with_encodings(file_path):
+    last_err = None
+    for encoding in CSV_READ_ENCODINGS:
+        try:
+            return pd.read_csv(file_path, encoding=encoding)
+        except UnicodeDecodeError as err:
+            last_err = err
+    raise last_err
+
+
+def is_transient_result(result_text):
+    return result_text in TRANSIENT_RESULTS or result_text.startswith("异常")
+
+
+def build_target_matrix(provinces, years, batches, genres):
+    """省份×年份×批次×科类 全组合；科类变化最快，同一院校相邻组合通常只需切换一个筛选。"""
+    return [
+        {"省份": province, "年份": year, "批次": batch, "科类": genre}
+        for province in provinces
+        for year in years
+        for batch in batches
+        for genre in genres
+    ]
+
+
+def normalize_cell_value(value):
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float) and value == int(value):
+        text = str(int(value))
+    else:
+        text = str(value).strip()
+    if text.lower() == "nan":
+        return ""
+    if text.endswith(".0") and text[:-2].isdigit():
+        text = text[:-2]
+    return text
+
+
+def atomic_replace_file(file_path, write_fn, label="文件"):
+    temp_path = f"{file_path}.tmp"
+    last_err = None
+
+    for attempt in range(FILE_WRITE_MAX_RETRIES):
+        try:
+            write_fn(temp_path)
+            os.replace(temp_path, file_path)
+            return
+        except PermissionError as err:
+            last_err = err
+            if attempt < FILE_WRITE_MAX_RETRIES - 1:
+                delay = FILE_WRITE_RETRY_DELAY_SEC * (attempt + 1)
+                print(
+                    f"【警告】{label}写入被占用，"
+                    f"{delay:.1f}s 后重试 ({attempt + 1}/{FILE_WRITE_MAX_RETRIES})"
+                )
+                time.sleep(delay)
+        finally:
+            if os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    raise last_err
+
+
+def build_extractor_spec(extractor):
+    """分片子进程重建提取器所需的 (模块名, 模块文件, 类名, 构造参数)，均可 pickle。"""
+    extractor_class = type(extractor)
+    module = sys.modules[extractor_class.__module__]
+    return (
+        extractor_class.__module__,
+        os.path.abspath(module.__file__),
+        extractor_class.__name__,
+        extractor.init_kwargs,
+    )
+
+
+def load_extractor_class(module_name, module_file, class_name):
+    """
+    子进程内找回提取器类：spawn 子进程已重新导入主脚本（__main__），
+    5_ 按路径加载的 3_/4_ 模块随主脚本登记到 sys.modules；都不在时按模块文件加载。
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = load_script_module(module_file, module_name)
+    return getattr(module, class_name)
+
+
+def run_engine_shard(shard_id, extractor_specs, engine_kwargs, shard_df, tasks, report_queue):
+    """分片子进程入口：只爬分到的院校，状态 / 结果行 / 进度经 report_queue 发回协调进程。"""
+    extractors = [
+        load_extractor_class(module_name, module_file, class_name)(**init_kwargs)
+        for module_name, module_file, class_name, init_kwargs in extractor_specs
+    ]
+    engine = QuarkScrapeEngine(extractors, **engine_kwargs)
+    engine.df = shard_df
+    engine._report_queue = report_queue
+    engine._worker_id_offset = shard_id * engine.concurrent_workers
+    try:
+        asyncio.run(engine._run_workers_async(tasks, own_browser=True))
+    finally:
+        report_queue.put(("done", shard_id, None))
+
+
+class QuarkExtractor:
+    """
+    夸克院校页上一张卡片（一个 SPA tab）的提取器，由 QuarkScrapeEngine 调度。
+
+    子类需提供：
+      NAME              提取器名称，合并爬取时作为状态列前缀（如「分数线状态」）
+      RESULT_COLUMNS    结果表表头
+      RESULT_FILE_LABEL 结果表文件名后缀（如「院校专业表」）
+      METRICS_FILE_NAME 耗时指标 JSONL 文件名
+      scrape_target()   抓取单个 (院校, 组合)，见该方法说明
+
+    提取过程中经 self.engine 的 save_status / append_result_rows / get_school_info
+    写状态、追加结果行、读取源表院校信息；分片子进程中这些调用会自动转发给协调进程。
+    """
+
+    NAME = ""
+    RESULT_COLUMNS = []
+    RESULT_FILE_LABEL = ""
+    METRICS_FILE_NAME = ""
+
+    def __init__(self, target_matrix, result_path=None, status_prefix=""):
+        # 分片子进程按相同参数重建提取器
+        self.init_kwargs = {
+            "target_matrix": target_matrix,
+            "result_path": result_path,
+            "status_prefix": status_prefix,
+        }
+        self.target_matrix = target_matrix
+        self.result_path = result_path
+        self.status_prefix = status_prefix
+        self.engine = None
+        self.targets = []
+
+    def bind(self, engine, output_dir):
+        self.engine = engine
+        self.targets = self.build_targets(output_dir)
+
+    def build_result_path(self, output_dir, province, year, batch="", genre=""):
+        if batch or genre:
+            return os.path.join(
+                output_dir,
+                f"夸克-{province}-{year}-{batch}-{genre}-{self.RESULT_FILE_LABEL}.csv",
+            )
+        return os.path.join(output_dir, f"夸克-{province}-{year}-{self.RESULT_FILE_LABEL}.csv")
+
+    def build_targets(self, output_dir):
+        """
+        每个组合附带展示名、状态列与结果表路径；单组合时保持旧列名与旧文件名。
+        status_prefix 用于合并爬取时区分不同提取器的状态列。
+        """
+        multi_target = len(self.target_matrix) > 1
+        targets = []
+        for values in self.target_matrix:
+            target = {key: str(values[key]).strip() for key in TARGET_FILTER_KEYS}
+            target["label"] = "/".join(target[key] for key in TARGET_FILTER_KEYS)
+            if multi_target:
+                target["status_column"] = f"{self.status_prefix}状态-" + "-".join(
+                    target[key] for key in TARGET_FILTER_KEYS
+                )
+                target["result_path"] = self.build_result_path(
+                    output_dir,
+                    target["省份"],
+                    target["年份"],
+                    target["批次"],
+                    target["科类"],
+                )
+            else:
+                target["status_column"] = f"{self.status_prefix}状态"
+                target["result_path"] = self.result_path or self.build_result_path(
+                    output_dir, target["省份"], target["年份"]
+                )
+            targets.append(target)
+        return targets
+
+    async def scrape_target(
+        self, page, row_index, school_name, target, worker_id, visit, phases
+    ):
+        """
+        抓取单个 (院校, 组合)：写入该组合的状态与结果行，返回本次结果文本
+        （「成功 N 条」「本省未招生」「失败-…」「异常: …」等，临时性失败见 is_transient_result）。
+
+        visit 是本次院校访问内共享的字典：
+          card              本提取器已打开的卡片，有则可在页面内切换筛选；切换到下一个提取器时重置为 None
+          page_school_name  页面显示的院校名
+          school_loaded     院校页是否已打开（可能由前一个提取器打开），是则可点 SPA tab 免去导航
+        phases 为 PhaseTimer，各等待步骤经 phases.timed / phases.begin 计时。
+        """
+        raise NotImplementedError
+
+    def _create_empty_result_file(self, result_path):
+        with open(
+            result_path, mode="w", encoding="utf-8-sig", newline=""
+        ) as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+            writer.writerow(self.RESULT_COLUMNS)
+
+    def _read_result_dataframe(self, file_path):
+        try:
+            return read_csv_with_encodings(file_path)
+        except Exception as err:
+            backup_path = f"{file_path}.corrupt.bak"
+            if os.path.exists(backup_path):
+                os.remove(backup_path)
+            os.replace(file_path, backup_path)
+            print(
+                f"【警告】结果文件已损坏，已备份为 {os.path.basename(backup_path)}，"
+                f"将重建空表（原因: {err}）"
+            )
+            return pd.DataFrame(columns=self.RESULT_COLUMNS)
+
+    def _migrate_result_dataframe(self, existing_df):
+        if existing_df is None or existing_df.empty:
+            return pd.DataFrame(columns=self.RESULT_COLUMNS)
+
+        source_columns = list(existing_df.columns)
+        if source_columns == self.RESULT_COLUMNS:
+            return existing_df[self.RESULT_COLUMNS].copy()
+
+        migrated_df = pd.DataFrame(index=existing_df.index)
+        for column_name in self.RESULT_COLUMNS:
+            if column_name in existing_df.columns:
+                migrated_df[column_name] = existing_df[column_name]
+            else:
+                migrated_df[column_name] = ""
+
+        if "专业备注" in source_columns:
+            migrated_df["备注"] = existing_df["专业备注"]
+
+        return migrated_df[self.RESULT_COLUMNS]
+
+    def _save_result_dataframe(self, result_df, result_path):
+        def write_result(temp_path):
+            result_df.to_csv(temp_path, index=False, encoding="utf-8-sig")
+
+        atomic_replace_file(result_path, write_result, label="结果表")
+
+    def _migrate_legacy_xlsx_result(self, result_path):
+        legacy_xlsx = f"{os.path.splitext(result_path)[0]}.xlsx"
+        if not os.path.exists(legacy_xlsx):
+            return False
+
+        try:
+            existing_df = pd.read_excel(legacy_xlsx, engine="openpyxl")
+        except Exception as err:
+            backup_path = f"{legacy_xlsx}.corrupt.bak"
+            if os.path.exists(backup_path):
+                os.remove(backup_path)
+            os.replace(legacy_xlsx, backup_path)
+            print(
+                f"【警告】旧 xlsx 结果表已损坏，已备份为 {os.path.basename(backup_path)}"
+                f"（原因: {err}）"
+            )
+            return False
+
+        migrated_df = self._migrate_result_dataframe(existing_df)
+        self._save_result_dataframe(migrated_df, result_path)
+        backup_path = f"{legacy_xlsx}.bak"
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+        os.replace(legacy_xlsx, backup_path)
+        print(
+            f"【提示】已将旧 xlsx 结果表迁移为 csv，保留 {len(migrated_df)} 行，"
+            f"旧文件备份为 {os.path.basename(backup_path)}"
+        )
+        return True
+
+    def init_result_file(self, result_path):
+        """结果表不存在时建空表（或迁移旧 xlsx），表头不一致时对齐；之后只追加写入。"""
+        file_name = os.path.basename(result_path)
+        if not os.path.exists(result_path):
+            if self._migrate_legacy_xlsx_result(result_path):
+                return
+            self._create_empty_result_file(result_path)
+            print(f"【提示】结果表 {file_name} 不存在，已创建空 csv，后续仅追加写入")
+            return
+
+        existing_df = self._read_result_dataframe(result_path)
+        row_count = len(existing_df)
+
+        if list(existing_df.columns) == self.RESULT_COLUMNS:
+            print(f"【提示】结果表 {file_name} 已存在 {row_count} 行，后续仅追加写入")
+            return
+
+        migrated_df = self._migrate_result_dataframe(existing_df)
+        self._save_result_dataframe(migrated_df, result_path)
+        print(
+            f"【提示】结果表表头已对齐，保留 {len(migrated_df)} 行，"
+            f"后续仅追加写入"
+        )
+
+
+class QuarkScrapeEngine:
+    """
+    按院校调度一个或多个提取器：一个 worker 访问一所院校时依次运行各提取器的待爬组合，
+    各提取器写自己的状态列与结果表，共用同一份状态 DataFrame 与写锁，状态表统一定时落盘。
+    """
+
+    def __init__(
+        self,
+        extractors,
+        school_source_path,
+        status_save_path,
+        enable_concurrent=ENABLE_CONCURRENT,
+        concurrent_workers=CONCURRENT_WORKERS,
+        enable_resource_blocking=ENABLE_RESOURCE_BLOCKING,
+        enable_sharded=ENABLE_SHARDED_PROCESSES,
+        shard_process_count=SHARD_PROCESS_COUNT,
+        shard_workers_per_process=SHARD_WORKERS_PER_PROCESS,
+        enable_adaptive=ENABLE_ADAPTIVE_CONCURRENCY,
+        adaptive_max_workers=ADAPTIVE_MAX_WORKERS,
+        enable_metrics=ENABLE_PHASE_METRICS,
+        enable_retry=ENABLE_IN_RUN_RETRY,
+        retry_max_attempts=RETRY_MAX_ATTEMPTS,
+    ):
+        self.school_source_path = school_source_path
+        self.status_save_path = status_save_path
+        output_dir = os.path.dirname(os.path.abspath(school_source_path))
+        self.extractors = list(extractors)
+        for extractor in self.extractors:
+            extractor.bind(self, output_dir)
+        self.enable_concurrent = enable_concurrent
+        self.concurrent_workers = max(1, concurrent_workers if enable_concurrent else 1)
+        self.enable_resource_blocking = enable_resource_blocking
+        self.enable_sharded = enable_sharded
+        self.shard_process_count = max(1, shard_process_count)
+        self.shard_workers_per_process = max(1, shard_workers_per_process)
+        self.enable_adaptive = enable_adaptive and self.enable_concurrent
+        self.adaptive_max_workers = max(self.concurrent_workers, adaptive_max_workers)
+        self.enable_retry = enable_retry
+        self.retry_max_attempts = max(1, retry_max_attempts)
+        # 每个提取器一个耗时指标文件，下标与 self.extractors 对应
+        self.metrics = []
+        if enable_metrics:
+            self.metrics = [
+                MetricsRecorder(os.path.join(output_dir, extractor.METRICS_FILE_NAME))
+                for extractor in self.extractors
+            ]
+        # 多个提取器时进度与汇总带上提取器名称
+        self._multi_extractor = len(self.extractors) > 1
+        self._task_unit = "提取器×组合" if self._multi_extractor else "组合"
+        # 分片子进程内设置：状态与结果行改为发回协调进程，worker 编号按分片错开
+        self._report_queue = None
+        self._worker_id_offset = 0
+
+        self.df = None
+        self._save_lock = threading.Lock()
+        self._status_dirty = False
+        self._progress_lock = threading.Lock()
+        self._total_schools = 0
+        self._total_pending = 0
+        self._skip_count = 0
+        self._started_count = 0
+        self._finished_count = 0
+        self._retry_count = 0
+        self._retry_waiting = 0
+        self._tasks_in_flight = 0
+
+    def save_status(self, row_index, target, status):
+        if self._report_queue is not None:
+            self._report_queue.put(
+                ("status", (row_index, target["status_column"]), status)
+            )
+            return
+
+        with self._save_lock:
+            self.df.at[row_index, target["status_column"]] = status
+            self._status_dirty = True
+
+    def append_result_rows(self, rows_data, result_path):
+        if not rows_data:
+            return
+
+        if self._report_queue is not None:
+            self._report_queue.put(("rows", result_path, rows_data))
+            return
+
+        with self._save_lock:
+            last_err = None
+            for attempt in range(FILE_WRITE_MAX_RETRIES):
+                try:
+                    with open(
+                        result_path,
+                        mode="a",
+                        encoding="utf-8-sig",
+                        newline="",
+                    ) as f:
+                        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+                        writer.writerows(rows_data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    return
+                except PermissionError as err:
+                    last_err = err
+                    if attempt < FILE_WRITE_MAX_RETRIES - 1:
+                        delay = FILE_WRITE_RETRY_DELAY_SEC * (attempt + 1)
+                        print(
+                            f"【警告】结果表追加被占用，"
+                            f"{delay:.1f}s 后重试 ({attempt + 1}/{FILE_WRITE_MAX_RETRIES})"
+                        )
+                        time.sleep(delay)
+            raise last_err
+
+    def get_school_info(self, row_index):
+        """结果表中由源表带入的院校字段。"""
+        row = self.df.loc[row_index]
+        school_info = {
+            "主管部门": normalize_cell_value(row.get("主管部门", "")),
+        }
+        for result_col, source_col in SOURCE_EXTRA_COLUMN_MAP.items():
+            school_info[result_col] = normalize_cell_value(row.get(source_col, ""))
+        return school_info
+
+    def _read_source_table(self, file_path):
+        if file_path.endswith(".csv"):
+            return read_csv_with_encodings(file_path)
+        if file_path.endswith(".xlsx"):
+            return pd.read_excel(file_path, engine="openpyxl")
+        return pd.read_excel(file_path)
+
+    def _save_status_dataframe(self):
+        def write_status(temp_path):
+            self.df.to_csv(temp_path, index=False, encoding="utf-8-sig")
+
+        atomic_replace_file(self.status_save_path, write_status, label="状态表")
+
+    def _flush_status_to_disk(self):
+        with self._save_lock:
+            if not self._status_dirty:
+                return False
+            self._save_status_dataframe()
+            self._status_dirty = False
+            return True
+
+    async def _status_flush_loop(self, stop_event):
+        while True:
+            try:
+                self._flush_status_to_disk()
+            except PermissionError as err:
+                with self._save_lock:
+                    self._status_dirty = True
+                print(f"【警告】状态表落盘失败，将在下次定时重试: {err}")
+
+            if stop_event.is_set():
+                break
+            await asyncio.sleep(STATUS_FLUSH_INTERVAL_SEC)
+
+        try:
+            self._flush_status_to_disk()
+        except PermissionError as err:
+            with self._save_lock:
+                self._status_dirty = True
+            print(f"【警告】退出前状态表落盘失败: {err}")
+
+    def _migrate_legacy_xlsx_status(self):
+        legacy_xlsx = f"{os.path.splitext(self.status_save_path)[0]}.xlsx"
+        if not os.path.exists(legacy_xlsx):
+            return False
+
+        try:
+            status_df = pd.read_excel(legacy_xlsx, engine="openpyxl")
+        except Exception as err:
+            backup_path = f"{legacy_xlsx}.corrupt.bak"
+            if os.path.exists(backup_path):
+                os.remove(backup_path)
+            os.replace(legacy_xlsx, backup_path)
+            print(
+                f"【警告】旧 xlsx 状态表已损坏，已备份为 {os.path.basename(backup_path)}"
+                f"（原因: {err}）"
+            )
+            return False
+
+        temp_path = f"{self.status_save_path}.tmp"
+        status_df.to_csv(temp_path, index=False, encoding="utf-8-sig")
+        os.replace(temp_path, self.status_save_path)
+        backup_path = f"{legacy_xlsx}.bak"
+        if os.path.exists(backup_path):
+            os.remove(backup_path)
+        os.replace(legacy_xlsx, backup_path)
+        print(
+            f"【提示】已将旧 xlsx 状态表迁移为 csv，保留 {len(status_df)} 行，"
+            f"旧文件备份为 {os.path.basename(backup_path)}"
+        )
+        return True
+
+    def _load_status_dataframe(self):
+        if not os.path.exists(self.status_save_path):
+            if self._migrate_legacy_xlsx_status():
+                return read_csv_with_encodings(self.status_save_path)
+            return self._read_source_table(self.school_source_path)
+
+        try:
+            return read_csv_with_encodings(self.status_save_path)
+        except Exception as err:
+            backup_path = f"{self.status_save_path}.corrupt.bak"
+            if os.path.exists(backup_path):
+                os.remove(backup_path)
+            os.replace(self.status_save_path, backup_path)
+            print(
+                f"【警告】状态文件已损坏，已备份为 {os.path.basename(backup_path)}，"
+                f"将从源表重新初始化（原因: {err}）"
+            )
+            if self._migrate_legacy_xlsx_status():
+                return read_csv_with_encodings(self.status_save_path)
+            return self._read_source_table(self.school_source_path)
+
+    def _init_status_table(self):
+        self.df = self._load_status_dataframe()
+        for extractor in self.extractors:
+            for target in extractor.targets:
+                column = target["status_column"]
+                if column not in self.df.columns:
+                    self.df[column] = ""
+                self.df[column] = self.df[column].fillna("").astype(str)
+
+    def _task_label(self, extractor, target):
+        parts = []
+        if self._multi_extractor:
+            parts.append(extractor.NAME)
+        if self._multi_extractor or len(extractor.targets) > 1:
+            parts.append(target["label"])
+        return " ".join(parts)
+
+    def _mark_task_started(self, school_name, worker_id):
+        if self._report_queue is not None:
+            self._report_queue.put(("started", worker_id, school_name))
+            return None
+
+        with self._progress_lock:
+            self._started_count += 1
+            traversed = self._skip_count + self._started_count
+        print(
+            f"[W{worker_id}] [{traversed}/{self._total_schools}] "
+            f"开始 | {school_name}"
+        )
+        return traversed
+
+    def _mark_task_finished(self, school_name, worker_id, result_text):
+        if self._report_queue is not None:
+            self._report_queue.put(("finished", worker_id, (school_name, result_text)))
+            return
+
+        with self._progress_lock:
+            self._finished_count += 1
+            traversed = self._skip_count + self._finished_count
+            remaining = self._total_pending - self._finished_count
+        print(
+            f"[W{worker_id}] [{traversed}/{self._total_schools}] "
+            f"完成(剩{remaining}) | {school_name} | {result_text}"
+        )
+
+    def _mark_task_retry(self, school_name, worker_id, target_count, attempt, delay):
+        """重试的院校不算完成：回退进度计数，下次尝试时重新计入。"""
+        if self._report_queue is not None:
+            self._report_queue.put(
+                ("retry", worker_id, (school_name, target_count, attempt, delay))
+            )
+            return
+
+        with self._progress_lock:
+            self._started_count -= 1
+            self._finished_count -= 1
+            self._retry_count += 1
+        print(
+            f"[W{worker_id}] 【重试】{school_name} {target_count} 个{self._task_unit}临时失败，"
+            f"第 {attempt}/{self.retry_max_attempts} 次，{delay:.1f}s 后重试（优先换标签页）"
+        )
+
+    def _record_metrics(self, extractor_index, record):
+        if self._report_queue is not None:
+            self._report_queue.put(("metrics", extractor_index, record))
+            return
+        self.metrics[extractor_index].write(record)
+
+    async def _scrape_target(
+        self, extractor_index, page, row_index, school_name, target, worker_id, visit
+    ):
+        """抓取单个 (院校, 组合)，并记录各阶段耗时。"""
+        extractor = self.extractors[extractor_index]
+        phases = PhaseTimer()
+        result_text = await extractor.scrape_target(
+            page, row_index, school_name, target, worker_id, visit, phases
+        )
+        if self.metrics or self._report_queue:
+            self._record_metrics(
+                extractor_index,
+                phases.build_record(
+                    self.metrics[extractor_index].run_id if self.metrics else "",
+                    school_name,
+                    target["label"],
+                    worker_id,
+                    result_text,
+                ),
+            )
+        return result_text
+
+    async def _scrape_school(self, page, row_index, school_name, plan, worker_id):
+        """
+        一次院校访问依次完成各提取器的全部待爬组合，返回 [(提取器下标, target, 结果文本), ...]。
+        院校页是否已打开在提取器之间传递，后续提取器可点 SPA tab 复用同一页面。
+        """
+        school_loaded = False
+        page_school_name = None
+        results = []
+
+        for extractor_index, targets in plan:
+            visit = {
+                "card": None,
+                "page_school_name": page_school_name,
+                "school_loaded": school_loaded,
+            }
+            for target in targets:
+                result_text = await self._scrape_target(
+                    extractor_index, page, row_index, school_name, target, worker_id, visit
+                )
+                results.append((extractor_index, target, result_text))
+            school_loaded = visit["school_loaded"]
+            page_school_name = visit["page_school_name"]
+
+        summary = "；".join(
+            " ".join(
+                part
+                for part in (self._task_label(self.extractors[index], target), result_text)
+                if part
+            )
+            for index, target, result_text in results
+        )
+        self._mark_task_finished(school_name, worker_id, summary)
+        return results
+
+    async def _init_worker_pages(self, context, page_count=None):
+        worker_pages = []
+        for worker_id in range(page_count or self.concurrent_workers):
+            page = await context.new_page()
+            # 从常驻浏览器服务租用的标签页沿用服务端视口，这里统一设置
+            await page.set_viewport_size(BROWSER_VIEWPORT)
+            await page.evaluate(f"document.title = '[Worker {worker_id + 1}] 夸克高考'")
+            worker_pages.append(page)
+            print(f"  - Worker {worker_id + 1} 标签页已就绪")
+
+        print(
+            f"【浏览器】当前同一窗口内共 {len(context.pages)} 个标签页 "
+            f"（请查看浏览器顶部标签栏）"
+        )
+        return worker_pages
+
+    async def _next_task(self, queue, worker_id):
+        """
+        取下一个任务，上次由本标签页失败的重试任务尽量让给其他标签页。
+        队列空但仍有等待退避或处理中的任务（可能产生重试）时继续等待；全部结束返回 None。
+        """
+        skipped = 0
+        while True:
+            try:
+                task = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                if not self._retry_waiting and not self._tasks_in_flight:
+                    return None
+                await asyncio.sleep(RETRY_IDLE_POLL_SEC)
+                skipped = 0
+                continue
+
+            if task[4] == worker_id and skipped < queue.qsize():
+                queue.put_nowait(task)
+                skipped += 1
+                continue
+            self._tasks_in_flight += 1
+            return task
+
+    def _requeue_task(self, queue, task):
+        self._retry_waiting -= 1
+        queue.put_nowait(task)
+
+    def _schedule_retry(self, queue, task, results, worker_id):
+        """临时性失败的组合退避后放回队列末尾；已达尝试上限或无需重试时返回 False。"""
+        row_index, school_name, _, attempt, _ = task
+        retry_plan = []
+        for extractor_index, target, result_text in results:
+            if not is_transient_result(result_text):
+                continue
+            if retry_plan and retry_plan[-1][0] == extractor_index:
+                retry_plan[-1][1].append(target)
+            else:
+                retry_plan.append((extractor_index, [target]))
+        if (
+            not self.enable_retry
+            or not retry_plan
+            or attempt >= self.retry_max_attempts
+        ):
+            return False
+
+        delay = min(RETRY_BACKOFF_MAX_SEC, RETRY_BACKOFF_BASE_SEC * 2 ** (attempt - 1))
+        delay *= random.uniform(1, 1.3)
+        self._retry_waiting += 1
+        asyncio.get_running_loop().call_later(
+            delay,
+            self._requeue_task,
+            queue,
+            (row_index, school_name, retry_plan, attempt + 1, worker_id),
+        )
+        self._mark_task_retry(
+            school_name,
+            worker_id,
+            sum(len(targets) for _, targets in retry_plan),
+            attempt,
+            delay,
+        )
+        return True
+
+    async def _worker(self, worker_id, page, queue, controller=None):
+        slot = worker_id - self._worker_id_offset
+        while True:
+            if controller and not await controller.wait_for_slot(slot):
+                break
+            task = await self._next_task(queue, worker_id)
+            if task is None:
+                if controller:
+                    await controller.close()
+                break
+
+            row_index, school_name, plan, _, _ = task
+            self._mark_task_started(school_name, worker_id)
+            started = time.monotonic()
+            try:
+                results = await self._scrape_school(
+                    page, row_index, school_name, plan, worker_id
+                )
+                self._schedule_retry(queue, task, results, worker_id)
+            finally:
+                self._tasks_in_flight -= 1
+
+            if controller is None:
+                await asyncio.sleep(random.uniform(1, 2))
+                continue
+
+            # 按组合数折算单次耗时，避免多组合院校被误判为变慢
+            await controller.record(
+                (time.monotonic() - started) / max(1, len(results)),
+                not any(is_transient_result(text) for _, _, text in results),
+            )
+            await asyncio.sleep(controller.next_delay())
+
+    def _build_school_plan(self, row, status_counts):
+        """该院校每个提取器仍待爬的组合：[(提取器下标, [target, ...]), ...]；已完成的计入 status_counts。"""
+        plan = []
+        for extractor_index, extractor in enumerate(self.extractors):
+            pending_targets = []
+            for target in extractor.targets:
+                status = str(row.get(target["status_column"], "")).strip()
+                if status in SKIP_STATUSES:
+                    status_counts[status] = status_counts.get(status, 0) + 1
+                    continue
+                pending_targets.append(target)
+            if pending_targets:
+                plan.append((extractor_index, pending_targets))
+        return plan
+
+    async def _run_async(self):
+        start_time = time.time()
+
+        self._init_status_table()
+        for extractor in self.extractors:
+            for target in extractor.targets:
+                extractor.init_result_file(target["result_path"])
+
+        pending_tasks = []
+        pending_target_count = 0
+        skip_count = 0
+        status_counts = {}
+        target_count = sum(len(extractor.targets) for extractor in self.extractors)
+        self._total_schools = len(self.df)
+
+        for index, row in self.df.iterrows():
+            plan = self._build_school_plan(row, status_counts)
+            if not plan:
+                skip_count += 1
+                continue
+
+            school_name = str(row["学校名称"]).strip()
+            if not school_name or school_name.lower() == "nan":
+                continue
+
+            pending_tasks.append((index, school_name, plan))
+            pending_target_count += sum(len(targets) for _, targets in plan)
+
+        self._total_pending = len(pending_tasks)
+        self._skip_count = skip_count
+        self._started_count = 0
+        self._finished_count = 0
+
+        success_count = status_counts.get("成功", 0)
+        invalid_count = status_counts.get("无效数据", 0)
+        no_enrollment_count = status_counts.get("本省未招生", 0) + status_counts.get(
+            "失败-无数据", 0
+        )
+        if not pending_tasks:
+            print(
+                f"没有待爬取的院校。"
+                f"总计 {self._total_schools} 所 × {target_count} 个{self._task_unit}，"
+                f"已成功 {success_count}，无效数据 {invalid_count}，"
+                f"本省未招生 {no_enrollment_count}，跳过 {skip_count} 所。"
+            )
+            return
+
+        mode_text = (
+            f"并发 {self.concurrent_workers} 标签页"
+            if self.enable_concurrent
+            else "单标签页顺序执行"
+        )
+        if self.enable_sharded:
+            mode_text = (
+                f"多进程分片 {self.shard_process_count} 进程 × "
+                f"{self.shard_workers_per_process} 标签页，协调进程单点写入"
+            )
+        if self._multi_extractor:
+            mode_text += f"，每所院校一次访问依次运行 {len(self.extractors)} 个提取器"
+        print()
+        for extractor in self.extractors:
+            extractor_text = f"提取器「{extractor.NAME}」| " if self._multi_extractor else ""
+            for target in extractor.targets:
+                print(
+                    f">>>> {extractor_text}目标 {target['label']} | "
+                    f"状态列「{target['status_column']}」 | "
+                    f"结果表 {os.path.basename(target['result_path'])}"
+                )
+        print(
+            f">>>> 院校总计 {self._total_schools} 所 × {target_count} 个{self._task_unit} | "
+            f"已成功 {success_count} | 无效数据 {invalid_count} | "
+            f"本省未招生 {no_enrollment_count} | "
+            f"已完成{self._task_unit} {sum(status_counts.values())} | "
+            f"跳过 {skip_count} 所 | 本次待爬 {self._total_pending} 所"
+            f"（{pending_target_count} 个{self._task_unit}）"
+        )
+        print(f">>>> 模式：{mode_text}")
+        print(
+            f">>>> 状态表落盘：内存更新，每 {STATUS_FLUSH_INTERVAL_SEC:g}s 批量写入一次"
+        )
+        for metrics in self.metrics:
+            print(
+                f">>>> 耗时指标：{os.path.basename(metrics.metrics_path)}"
+                f"（本次 run_id {metrics.run_id}）"
+            )
+
+        stop_status_flush = asyncio.Event()
+        status_flush_task = asyncio.create_task(
+            self._status_flush_loop(stop_status_flush)
+        )
+
+        try:
+            if self.enable_sharded:
+                await self._run_sharded(pending_tasks)
+            else:
+                await self._run_workers_async(pending_tasks)
+        finally:
+            stop_status_flush.set()
+            await status_flush_task
+
+        if self._retry_count:
+            print(f"\n>>>> 运行内重试 {self._retry_count} 次")
+        for extractor, metrics in zip(self.extractors, self.metrics):
+            print()
+            if self._multi_extractor:
+                print(f">>>> 提取器「{extractor.NAME}」")
+            print(metrics.report())
+
+        end_time = time.time()
+        print(
+            f"\n>>>> 脚本全部执行完成！"
+            f"本次完成 {self._finished_count}/{self._total_pending} 所，"
+            f"总用时 {end_time - start_time:.2f} 秒"
+        )
+
+    async def _run_workers_async(self, pending_tasks, own_browser=False):
+        async with async_playwright() as playwright:
+            # 分片子进程各自启动浏览器，不共用常驻浏览器服务
+            context = await launch_plain_context_async(
+                playwright,
+                BROWSER_VIEWPORT,
+                service_endpoint="" if own_browser else BROWSER_SERVICE_ENDPOINT,
+            )
+            resource_blocker = None
+            if self.enable_resource_blocking:
+                resource_blocker = await install_resource_blocking_async(
+                    context, QUARK_HOST
+                )
+
+            controller = None
+            page_count = self.concurrent_workers
+            if self.enable_adaptive:
+                page_count = self.adaptive_max_workers
+                controller = AimdController(
+                    initial_limit=self.concurrent_workers,
+                    max_limit=page_count,
+                    min_limit=ADAPTIVE_MIN_WORKERS,
+                    delay_range=(1, 2),
+                )
+                print(
+                    f"【并发】自适应并发：初始 {self.concurrent_workers} 个活跃标签页，"
+                    f"范围 {controller.min_limit}~{page_count}"
+                )
+
+            print(f"\n正在打开 {page_count} 个并发标签页...")
+            worker_pages = await self._init_worker_pages(context, page_count)
+
+            # 队列任务：(行号, 院校, 提取计划, 第几次尝试, 上次失败的 worker)
+            queue = asyncio.Queue()
+            for task in pending_tasks:
+                await queue.put((*task, 1, None))
+
+            workers = [
+                asyncio.create_task(
+                    self._worker(
+                        self._worker_id_offset + worker_id + 1,
+                        worker_pages[worker_id],
+                        queue,
+                        controller,
+                    )
+                )
+                for worker_id in range(page_count)
+            ]
+            await asyncio.gather(*workers)
+            if controller:
+                print(controller.summary())
+
+            for page in worker_pages:
+                if not page.is_closed():
+                    await page.close()
+            await close_browser_async(context)
+            if resource_blocker:
+                print(resource_blocker.summary())
+
+    def _shard_kwargs(self):
+        return {
+            "school_source_path": self.school_source_path,
+            "status_save_path": self.status_save_path,
+            "enable_concurrent": True,
+            "concurrent_workers": self.shard_workers_per_process,
+            "enable_resource_blocking": self.enable_resource_blocking,
+            "enable_sharded": False,
+            # 各分片只在自己的标签页数以内收缩 / 回升，总标签页数不超过分片配置
+            "enable_adaptive": self.enable_adaptive,
+            "adaptive_max_workers": self.shard_workers_per_process,
+            "enable_metrics": False,
+            "enable_retry": self.enable_retry,
+            "retry_max_attempts": self.retry_max_attempts,
+        }
+
+    def _apply_shard_report(self, kind, key, payload):
+        if kind == "status":
+            row_index, status_column = key
+            with self._save_lock:
+                self.df.at[row_index, status_column] = payload
+                self._status_dirty = True
+        elif kind == "rows":
+            self.append_result_rows(payload, key)
+        elif kind == "started":
+            self._mark_task_started(payload, key)
+        elif kind == "finished":
+            school_name, result_text = payload
+            self._mark_task_finished(school_name, key, result_text)
+        elif kind == "retry":
+            school_name, target_count, attempt, delay = payload
+            self._mark_task_retry(school_name, key, target_count, attempt, delay)
+        elif kind == "metrics" and self.metrics:
+            payload["run_id"] = self.metrics[key].run_id
+            self.metrics[key].write(payload)
+
+    async def _run_sharded(self, pending_tasks):
+        """协调进程：按院校轮流分片启动子进程，单点消费回报写状态表与结果表。"""
+        shard_count = min(self.shard_process_count, len(pending_tasks))
+        mp_context = multiprocessing.get_context("spawn")
+        report_queue = mp_context.Queue()
+        extractor_specs = [build_extractor_spec(extractor) for extractor in self.extractors]
+        processes = []
+
+        for shard_id in range(shard_count):
+            tasks = pending_tasks[shard_id::shard_count]
+            shard_df = self.df.loc[[row_index for row_index, _, _ in tasks]]
+            process = mp_context.Process(
+                target=run_engine_shard,
+                args=(
+                    shard_id,
+                    extractor_specs,
+                    self._shard_kwargs(),
+                    shard_df,
+                    tasks,
+                    report_queue,
+                ),
+            )
+            process.start()
+            processes.append(process)
+            print(f"  - 分片 {shard_id + 1} 已启动：{len(tasks)} 所院校")
+
+        running = shard_count
+        while running:
+            try:
+                kind, key, payload = await asyncio.to_thread(
+                    report_queue.get, True, SHARD_REPORT_POLL_SEC
+                )
+            except ReportQueueEmpty:
+                if not any(process.is_alive() for process in processes):
+                    print("【警告】分片进程均已退出，但未全部回报完成")
+                    break
+                continue
+
+            if kind == "done":
+                running -= 1
+                print(f"【提示】分片 {key + 1} 已结束，剩余 {running} 个")
+                continue
+            self._apply_shard_report(kind, key, payload)
+
+        for process in processes:
+            await asyncio.to_thread(process.join)
+
+    def run(self):
+        asyncio.run(self._run_async())
@@ -0,0 +1,29 @@
+import os
+import sys
+import importlib.util
+
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_script_module(file_name, module_name):
+    """
+    脚本文件名以数字开头且含中文，不能直接 import，按路径加载（相对本目录，也可传绝对路径）。
+
+    加载后登记到 sys.modules，模块内的类可按模块名 pickle（夸克多进程分片按此重建提取器）；
+    同名模块已加载时直接复用。
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(
+        module_name, os.path.join(SCRIPT_DIR, file_name)
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
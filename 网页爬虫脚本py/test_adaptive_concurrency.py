@@ -0,0 +1,115 @@
+import asyncio
+import contextlib
+import io
+import unittest
+
+from adaptive_concurrency import (
+    AIMD_DELAY_BACKOFF,
+    AIMD_DELAY_RECOVERY,
+    AimdController,
+)
+
+
+def build_controller(**kwargs):
+    options = dict(initial_limit=4, max_limit=8, min_limit=1, window_size=4)
+    options.update(kwargs)
+    return AimdController(**options)
+
+
+async def record_window(controller, latency_sec, ok=True, count=None):
+    """按同一耗时 / 结果记满 count（默认一个窗口）次；屏蔽调整日志。"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(count or controller.window_size):
+            await controller.record(latency_sec, ok)
+
+
+class AimdControllerRecordTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def test_no_adjustment_before_window_full(self):
+        '''未凑满窗口时不调整'''
+        controller = build_controller()
+        await record_window(controller, 1.0, count=3)
+        self.assertEqual(controller.limit, 4)
+        self.assertEqual(controller.increase_count + controller.decrease_count, 0)
+
+    async def test_healthy_window_increases_limit(self):
+        '''健康窗口活跃标签页 +1、间隔系数缩短，不超过上限'''
+        controller = build_controller(initial_limit=7)
+        await record_window(controller, 1.0)
+        self.assertEqual(controller.limit, 8)
+        self.assertAlmostEqual(controller.delay_factor, AIMD_DELAY_RECOVERY)
+
+        await record_window(controller, 1.0)
+        self.assertEqual(controller.limit, 8)
+
+    async def test_failure_rate_halves_limit(self):
+        '''失败率达到阈值时活跃标签页减半、间隔拉长，不低于下限'''
+        controller = build_controller(initial_limit=8, failure_rate_threshold=0.5)
+        await record_window(controller, 1.0, ok=True, count=2)
+        await record_window(controller, 1.0, ok=False, count=2)
+        self.assertEqual(controller.limit, 4)
+        self.assertAlmostEqual(controller.delay_factor, AIMD_DELAY_BACKOFF)
+
+        for _ in range(5):
+            await record_window(controller, 1.0, ok=False)
+        self.assertEqual(controller.limit, 1)
+
+    async def test_failed_latency_not_in_baseline(self):
+        '''失败任务（通常很快返回）的耗时不进入延迟基线'''
+        controller = build_controller(failure_rate_threshold=1.0)
+        await record_window(controller, 0.1, ok=False)
+        self.assertIsNone(controller._baseline_latency)
+
+        await record_window(controller, 0.1, ok=False, count=2)
+        await record_window(controller, 3.0, ok=True, count=2)
+        self.assertAlmostEqual(controller._baseline_latency, 3.0)
+
+    async def test_latency_above_baseline_is_congestion(self):
+        '''成功平均延迟超过基线 latency_factor 倍视为拥塞'''
+        controller = build_controller(latency_factor=2.0)
+        await record_window(controller, 1.0)
+        limit = controller.limit
+
+        await record_window(controller, 2.5)
+        self.assertEqual(controller.limit, limit // 2)
+        self.assertEqual(controller.decrease_count, 1)
+
+    async def test_baseline_not_pinned_by_one_fast_window(self):
+        '''基线为 EWMA：一次偶然的快窗口不会永久压低基线'''
+        controller = build_controller(latency_factor=2.0, baseline_alpha=0.1)
+        await record_window(controller, 1.0)
+        await record_window(controller, 0.1)
+        self.assertAlmostEqual(controller._baseline_latency, 0.91)
+
+        # 取历史最小值作基线时 1.7s > 0.1s × 2 会被判拥塞
+        await record_window(controller, 1.7)
+        self.assertEqual(controller.decrease_count, 0)
+
+    async def test_baseline_follows_sustained_slowdown(self):
+        '''站点整体持续变慢后基线跟上，不再一直判拥塞'''
+        controller = build_controller(latency_factor=2.0, baseline_alpha=0.5)
+        await record_window(controller, 1.0)
+        for _ in range(3):
+            await record_window(controller, 3.0)
+        decreases = controller.decrease_count
+
+        await record_window(controller, 3.0)
+        self.assertEqual(controller.decrease_count, decreases)
+
+    async def test_wait_for_slot_follows_limit(self):
+        '''编号超过上限的 worker 挂起，上限回升后放行；close 后返回 False'''
+        controller = build_controller(initial_limit=1, max_limit=2)
+        waiter = asyncio.create_task(controller.wait_for_slot(2))
+        await asyncio.sleep(0)
+        self.assertFalse(waiter.done())
+
+        await record_window(controller, 1.0)
+        self.assertTrue(await asyncio.wait_for(waiter, 1))
+
+        blocked = asyncio.create_task(controller.wait_for_slot(3))
+        await controller.close()
+        self.assertFalse(await asyncio.wait_for(blocked, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
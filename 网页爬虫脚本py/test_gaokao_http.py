@@ -0,0 +1,109 @@
+import gzip
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gaokao_http import GaokaoSchoolInfoClient
+
+
+# 桩服务：/school/{id}/info.json，按 id 返回不同的录制响应
+STUB_RESPONSES = {
+    "31": (200, "application/json", json.dumps(
+        {"code": "0000", "data": {"name": "北京大学"}}, ensure_ascii=False
+    ).encode("utf-8"), ""),
+    "32": (200, "application/json", json.dumps(
+        {"code": "0000", "data": {"name": "清华大学"}}, ensure_ascii=False
+    ).encode("utf-8"), "gzip"),
+    "9999": (404, "text/html", b"not found", ""),
+    "77": (200, "application/json", b"\x1f\x8b\x08\x00broken-gzip", "gzip"),
+    "88": (200, "application/json", gzip.compress(b'{"code": "0000"}')[:12], "gzip"),
+    "500": (500, "text/plain", b"server error", ""),
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        school_id = self.path.strip("/").split("/")[1]
+        status, content_type, body, encoding = STUB_RESPONSES[school_id]
+        if encoding == "gzip" and body[:2] != b"\x1f\x8b":
+            body = gzip.compress(body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GaokaoSchoolInfoClientTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        host, port = cls.server.server_address
+        cls.url_template = f"http://{host}:{port}/school/{{school_id}}/info.json"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.client = GaokaoSchoolInfoClient(url_template=self.url_template)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_success_json(self):
+        '''200 + code=0000 的 JSON 返回校名'''
+        self.assertEqual(self.client.resolve(31), ("success", "北京大学"))
+
+    def test_success_gzip_json(self):
+        '''gzip 压缩的 JSON 正常解压'''
+        self.assertEqual(self.client.resolve(32), ("success", "清华大学"))
+
+    def test_404_is_invalid(self):
+        '''404 判定为 ID 不存在'''
+        self.assertEqual(self.client.resolve(9999), ("invalid", "ID不存在"))
+
+    def test_corrupt_gzip_returns_none(self):
+        '''损坏的 gzip 响应体不抛异常，返回 None 交给浏览器兜底'''
+        self.assertIsNone(self.client.resolve(77))
+
+    def test_truncated_gzip_returns_none(self):
+        '''截断的 gzip 响应体（EOFError）同样返回 None'''
+        self.assertIsNone(self.client.resolve(88))
+
+    def test_server_error_returns_none(self):
+        '''非 200 / 404 的状态码结论不明确'''
+        self.assertIsNone(self.client.resolve(500))
+
+    def test_close_closes_connections_from_all_threads(self):
+        '''close() 关闭各工作线程各自建立的连接，而不只是调用线程的'''
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(self.client.resolve, [31, 32, 31, 32] * 3))
+        self.assertTrue(all(result[0] == "success" for result in results))
+
+        connections = [
+            conn for pool in self.client._pools.values() for conn in pool.values()
+        ]
+        self.assertGreater(len(connections), 1)
+
+        self.client.close()
+        self.assertEqual(self.client._pools, {})
+        self.assertTrue(all(conn.sock is None for conn in connections))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import unittest
+
+from gaokao_plan import (
+    PLAN_RESULT_HEADER,
+    build_plan_rows,
+    parse_plan_payload,
+    plan_request_params,
+)
+
+
+def build_item(group, major, count, type_name="物理类", subject="首选物理，再选不限"):
+    return {
+        "sg_name": group,
+        "spname": major,
+        "num": count,
+        "local_type_name": type_name,
+        "sg_info": subject,
+    }
+
+
+def build_payload(items, total=None, code="0000"):
+    return {"code": code, "data": {"item": items, "numFound": len(items) if total is None else total}}
+
+
+class BuildPlanRowsTestCase(unittest.TestCase):
+
+    def test_groups_joined_in_order(self):
+        '''每个专业组一行，专业按「名称-计划数」拼接，保持接口顺序'''
+        items = [
+            build_item("第001组", "计算机科学与技术", 3),
+            build_item("第002组", "汉语言文学", 2, "历史类", "首选历史，再选不限"),
+            build_item("第001组", "软件工程", 1),
+        ]
+        self.assertEqual(
+            build_plan_rows("某大学", items),
+            [
+                PLAN_RESULT_HEADER,
+                ["某大学", "第001组", "首选物理，再选不限", "计算机科学与技术-3, 软件工程-1"],
+                ["某大学", "第002组", "首选历史，再选不限", "汉语言文学-2"],
+            ],
+        )
+
+    def test_same_group_name_split_by_type(self):
+        '''同名专业组按科类分成两行'''
+        items = [
+            build_item("第001组", "数学", 1, "物理类"),
+            build_item("第001组", "历史学", 1, "历史类"),
+        ]
+        rows = build_plan_rows("某大学", items)
+        self.assertEqual([row[3] for row in rows[1:]], ["数学-1", "历史学-1"])
+
+    def test_missing_group_field_returns_none(self):
+        '''缺少专业组字段时返回 None'''
+        self.assertIsNone(build_plan_rows("某大学", [{"spname": "数学", "num": 1}]))
+
+    def test_no_groups_returns_none(self):
+        '''没有任何专业组时返回 None，而不是只有表头的表'''
+        self.assertIsNone(build_plan_rows("某大学", []))
+        self.assertIsNone(build_plan_rows("某大学", ["not-a-dict"]))
+
+
+class ParsePlanPayloadTestCase(unittest.TestCase):
+
+    def test_request_params_merge_query_and_body(self):
+        '''查询串与 JSON / 表单请求体合并，值转为字符串'''
+        url = "https://api.example.com/gkv3/plan/school?school_id=31&signsafe=abc"
+        self.assertEqual(
+            plan_request_params(url, json.dumps({"local_province_id": 36, "page": 1})),
+            {"school_id": "31", "signsafe": "abc", "local_province_id": "36", "page": "1"},
+        )
+        self.assertEqual(
+            plan_request_params(url, "local_province_id=36&size=10")["local_province_id"], "36"
+        )
+
+    def test_complete_response_accepted(self):
+        '''江西、无筛选、一页含全部条目时采用'''
+        items = [build_item("第001组", "数学", 1)]
+        params = {"local_province_id": "36", "signsafe": "abc", "page": "1"}
+        self.assertEqual(parse_plan_payload(params, build_payload(items)), (items, None))
+
+    def test_incomplete_responses_rejected(self):
+        '''其他省份、带科类筛选、分页未取全、接口报错时都回退'''
+        items = [build_item("第001组", "数学", 1)]
+        cases = [
+            ({"local_province_id": "11"}, build_payload(items)),
+            ({"local_province_id": "36", "local_type_id": "2073"}, build_payload(items)),
+            ({"local_province_id": "36"}, build_payload(items, total=30)),
+            ({"local_province_id": "36"}, build_payload(items, code="1069")),
+            ({"local_province_id": "36"}, None),
+        ]
+        for params, payload in cases:
+            with self.subTest(params=params, payload=payload):
+                result, reason = parse_plan_payload(params, payload)
+                self.assertIsNone(result)
+                self.assertTrue(reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import time
+import unittest
+from datetime import date
+
+from script_loader import load_script_module
+
+
+id_sweep = load_script_module("1_掌上高考-抓取院校_id.py", "id_sweep")
+
+
+def build_records(statuses, record_date="2026-01-01"):
+    """{id: 状态} -> records：{代码: [院校名称, 代码, 状态, 错误信息, 日期]}"""
+    return {
+        str(school_id): [
+            "院校" if status == "成功" else "", str(school_id), status, "", record_date
+        ]
+        for school_id, status in statuses.items()
+    }
+
+
+def drain(planner):
+    """取完当前可派发的 ID，逐个以「无效」回报。"""
+    ids = []
+    while True:
+        school_id = planner.next_id()
+        if school_id is None:
+            return ids
+        ids.append(school_id)
+        planner.report(school_id, "无效")
+
+
+class IdSweepPlannerTestCase(unittest.TestCase):
+
+    def build_planner(self, records, **kwargs):
+        done = {code for code, record in records.items() if record[2] in ("成功", "无效")}
+        options = dict(
+            id_range=20,
+            band_size=10,
+            empty_band_min_known=5,
+            probe_step=5,
+            max_consecutive_invalid=3,
+        )
+        options.update(kwargs)
+        return id_sweep.IdSweepPlanner(
+            records, lambda school_id: str(school_id) not in done, **options
+        )
+
+    def test_known_valid_ids_first_then_range(self):
+        '''需重拉的成功 ID 最先派发，其余按 ID 顺序，已完成的不派发'''
+        records = build_records({5: "成功", 7: "失败", 8: "无效"})
+        # 成功行需要重拉时 should_process 返回 True
+        planner = id_sweep.IdSweepPlanner(
+            records,
+            lambda school_id: school_id != 8,
+            id_range=10,
+            band_size=10,
+            empty_band_min_known=5,
+            probe_step=5,
+            max_consecutive_invalid=0,
+        )
+        ids = drain(planner)
+        self.assertEqual(ids[0], 5)
+        self.assertEqual(ids[1:], [1, 2, 3, 4, 6, 7, 9, 10])
+        self.assertFalse(planner.has_in_flight())
+
+    def test_empty_band_only_probed(self):
+        '''历史全部无效的空段只派发按日期轮换的抽样 ID，其余暂缓'''
+        records = build_records({school_id: "无效" for school_id in range(11, 21)})
+        planner = id_sweep.IdSweepPlanner(
+            records,
+            lambda school_id: True,
+            id_range=20,
+            band_size=10,
+            empty_band_min_known=5,
+            probe_step=5,
+            max_consecutive_invalid=0,
+        )
+        probe_offset = date.today().toordinal() % 5
+        probes = [school_id for school_id in range(11, 21) if school_id % 5 == probe_offset]
+
+        self.assertEqual(planner.empty_band_count, 1)
+        self.assertEqual(planner.deferred_count, 10 - len(probes))
+        self.assertEqual(drain(planner), list(range(1, 11)) + probes)
+
+    def test_probe_success_enqueues_deferred_band(self):
+        '''空段探测到院校后，补扫该段剩余 ID'''
+        statuses = {school_id: "无效" for school_id in range(1, 11)}
+        records = build_records(statuses)
+        planner = id_sweep.IdSweepPlanner(
+            records,
+            lambda school_id: True,
+            id_range=10,
+            band_size=10,
+            empty_band_min_known=5,
+            probe_step=5,
+            max_consecutive_invalid=0,
+        )
+        self.assertEqual(planner.planned_count, 2)
+        self.assertEqual(planner.deferred_count, 8)
+
+        probe = planner.next_id()
+        planner.report(probe, "成功")
+        remaining = drain(planner)
+        self.assertEqual(
+            sorted([probe, *remaining]), list(range(1, 11))
+        )
+
+    def test_frontier_extends_after_last_success(self):
+        '''队列耗尽后向上扩展，直到最后一个成功 ID 之后连续 N 个无院校'''
+        records = build_records({school_id: "无效" for school_id in range(1, 21)})
+        records.update(build_records({18: "成功"}))
+        planner = self.build_planner(records)
+        # 成功 ID 18 之后连续 3 个：19、20 已知无效，21 仍需探测
+        self.assertEqual(drain(planner), [21])
+
+        planner = id_sweep.IdSweepPlanner(
+            records,
+            lambda school_id: school_id > 20,
+            id_range=20,
+            band_size=10,
+            empty_band_min_known=5,
+            probe_step=5,
+            max_consecutive_invalid=3,
+        )
+        self.assertEqual(planner.next_id(), 21)
+        # 21 仍在途时不应判定结束
+        self.assertEqual(planner.next_id(), None)
+        self.assertTrue(planner.has_in_flight())
+
+        planner.report(21, "成功")
+        self.assertEqual(drain(planner), [22, 23, 24])
+        self.assertEqual(planner.top_id, 24)
+        self.assertFalse(planner.has_in_flight())
+
+
+class RefreshPlannerTestCase(unittest.TestCase):
+
+    def parse_date(self, value):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return None
+
+    def test_failed_first_then_oldest(self):
+        '''失败行最先，其余按日期从旧到新，无日期视为最旧'''
+        records = {}
+        records.update(build_records({1: "成功"}, "2026-03-01"))
+        records.update(build_records({2: "无效"}, "2025-01-01"))
+        records.update(build_records({3: "失败"}, "2026-05-01"))
+        records.update(build_records({4: "成功"}, ""))
+        records["abc"] = ["", "abc", "成功", "", ""]
+
+        planner = id_sweep.RefreshPlanner(records, self.parse_date, budget_minutes=5)
+        self.assertEqual(planner.planned_count, 4)
+        self.assertEqual(planner.top_id, 4)
+
+        ids = []
+        while True:
+            school_id = planner.next_id()
+            if school_id is None:
+                break
+            ids.append(school_id)
+            planner.report(school_id, "成功")
+        self.assertEqual(ids, [3, 4, 2, 1])
+        self.assertEqual(planner.remaining_count(), 0)
+
+    def test_budget_stops_dispatch(self):
+        '''预算用完后不再派发，剩余留待下次'''
+        records = build_records({1: "成功", 2: "成功", 3: "成功"})
+        planner = id_sweep.RefreshPlanner(records, self.parse_date, budget_minutes=1)
+
+        first = planner.next_id()
+        self.assertIsNotNone(first)
+        self.assertTrue(planner.has_in_flight())
+
+        planner._deadline = time.monotonic() - 1
+        self.assertIsNone(planner.next_id())
+        planner.report(first, "成功")
+        self.assertFalse(planner.has_in_flight())
+        self.assertEqual(planner.remaining_count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import unittest
+
+import pandas as pd
+
+from script_loader import load_script_module
+
+
+merge = load_script_module("2_掌上高考-合并院校id到普通高校.py", "merge_ids")
+
+
+def build_gaokao_df(rows):
+    """rows：[(院校名称, 代码)]，按 id_map 文件顺序。"""
+    return pd.DataFrame(rows, columns=["院校名称", "代码"])
+
+
+def build_school_df(names):
+    school_df = pd.DataFrame({"序号": range(1, len(names) + 1), "学校名称": names})
+    school_df["_match_name"] = merge.normalize_name_series(school_df["学校名称"])
+    return school_df
+
+
+class BuildMergePlanTestCase(unittest.TestCase):
+
+    def test_name_match_writes_first_same_name_row(self):
+        '''名称匹配写入第一条同名行；多条映射到同一行时后者覆盖'''
+        school_df = build_school_df(["北京大学", "清华大学", "北京大学"])
+        gaokao_df = build_gaokao_df([("北京 大学", 31), ("清华大学", 32), ("北京大学", 33)])
+
+        base_updates, new_rows, counters, matches = merge.build_merge_plan(gaokao_df, school_df)
+
+        self.assertEqual(base_updates.to_dict(), {0: "33", 1: "32"})
+        self.assertEqual(new_rows, [])
+        self.assertEqual(
+            counters, {"campus_added": 0, "matched_updated": 3, "unmatched_added": 0}
+        )
+        self.assertEqual(
+            matches, {"31": ("base", 0), "32": ("base", 1), "33": ("base", 0)}
+        )
+
+    def test_campus_rows_always_appended(self):
+        '''含「校区」的院校每行都新增，即使普通高校表中有同名行'''
+        school_df = build_school_df(["山东大学威海校区"])
+        gaokao_df = build_gaokao_df([("山东大学威海校区", 1), ("山东大学威海校区", 2)])
+
+        base_updates, new_rows, counters, matches = merge.build_merge_plan(gaokao_df, school_df)
+
+        self.assertTrue(base_updates.empty)
+        self.assertEqual(new_rows, [("山东大学威海校区", "1"), ("山东大学威海校区", "2")])
+        self.assertEqual(counters["campus_added"], 2)
+        self.assertEqual(matches, {"1": ("append", 0), "2": ("append", 1)})
+
+    def test_unmatched_added_once_then_overwritten(self):
+        '''未匹配院校只在首次出现时新增，之后的同名行覆盖该新增行的 id'''
+        school_df = build_school_df(["北京大学"])
+        gaokao_df = build_gaokao_df(
+            [("新大学", 1), ("北京大学", 2), ("新大学", 3), ("另一学院", 4)]
+        )
+
+        base_updates, new_rows, counters, matches = merge.build_merge_plan(gaokao_df, school_df)
+
+        self.assertEqual(base_updates.to_dict(), {0: "2"})
+        self.assertEqual(new_rows, [("新大学", "3"), ("另一学院", "4")])
+        self.assertEqual(
+            counters, {"campus_added": 0, "matched_updated": 2, "unmatched_added": 2}
+        )
+        self.assertEqual(matches["1"], ("append", 0))
+        self.assertEqual(matches["3"], ("append", 0))
+        self.assertEqual(matches["4"], ("append", 1))
+
+    def test_unmatched_after_campus_overwrites_campus_row(self):
+        '''更早出现的同名校区行视为新增行，之后的未匹配同名行覆盖其 id 而不再新增'''
+        school_df = build_school_df(["北京大学"])
+        # 「校区」按原始名称判断，比对按去空格后的名称：「校 区」不算校区行，但与前者同名
+        gaokao_df = build_gaokao_df([("某大学校区", 1), ("某大学校 区", 2)])
+
+        _, new_rows, counters, matches = merge.build_merge_plan(gaokao_df, school_df)
+
+        self.assertEqual(new_rows, [("某大学校区", "2")])
+        self.assertEqual(
+            counters, {"campus_added": 1, "matched_updated": 1, "unmatched_added": 0}
+        )
+        self.assertEqual(matches, {"1": ("append", 0), "2": ("append", 0)})
+
+    def test_codes_are_stripped_strings(self):
+        '''代码统一转为去空格的字符串'''
+        school_df = build_school_df(["北京大学"])
+        gaokao_df = build_gaokao_df([("北京大学", " 31 ")])
+
+        base_updates, _, _, matches = merge.build_merge_plan(gaokao_df, school_df)
+
+        self.assertEqual(base_updates.to_dict(), {0: "31"})
+        self.assertIn("31", matches)
+
+
+class ApplyMergeDiffTestCase(unittest.TestCase):
+
+    def merge_full(self, gaokao_df, school_df):
+        base_updates, new_rows, _, matches = merge.build_merge_plan(gaokao_df, school_df)
+        base_df = school_df.drop(columns=["_match_name"])
+        base_df.loc[base_updates.index, merge.ID_COLUMN] = base_updates.to_numpy()
+        return base_df, new_rows, matches
+
+    def test_diff_matches_full_merge(self):
+        '''按差异修补只改写受影响行，结果与完整重算一致'''
+        school_df = build_school_df(["北京大学", "清华大学", "复旦大学"])
+        school_df[merge.ID_COLUMN] = pd.Series(["旧", pd.NA, pd.NA], dtype=object)
+        old_df = build_gaokao_df([("北京大学", 31), ("清华大学", 32), ("新大学", 40)])
+        new_df = build_gaokao_df([("北京大学", 31), ("清华 大学", 33), ("复旦大学", 34)])
+
+        old_base, _, old_matches = self.merge_full(old_df, school_df)
+        previous = {
+            "rows": merge.build_row_fingerprints(old_df),
+            "matches": old_matches,
+        }
+        base_updates, _, _, matches = merge.build_merge_plan(new_df, school_df)
+        fingerprints = merge.build_row_fingerprints(new_df)
+        inserted, changed, removed = merge.diff_merge_state(previous, fingerprints, matches)
+        self.assertEqual((inserted, changed, removed), (["33", "34"], [], ["32", "40"]))
+
+        rows = merge.affected_base_rows(previous, matches, inserted, changed, removed)
+        self.assertEqual(rows, [1, 2])
+        patched = merge.apply_merge_diff(old_base, school_df, base_updates, rows)
+        full_base, _, _ = self.merge_full(new_df, school_df)
+        pd.testing.assert_frame_equal(patched, full_base)
+        self.assertEqual(old_base.at[1, merge.ID_COLUMN], "32")
+
+    def test_removed_mapping_restores_original_id(self):
+        '''某行不再有映射时恢复普通高校表原有的 id'''
+        school_df = build_school_df(["北京大学"])
+        school_df[merge.ID_COLUMN] = pd.Series(["旧"], dtype=object)
+        old_base, _, _ = self.merge_full(build_gaokao_df([("北京大学", 31)]), school_df)
+        base_updates, _, _, _ = merge.build_merge_plan(build_gaokao_df([]), school_df)
+
+        patched = merge.apply_merge_diff(old_base, school_df, base_updates, [0])
+        self.assertEqual(patched.at[0, merge.ID_COLUMN], "旧")
+
+    def test_appended_rows_reuse_known_candidates(self):
+        '''新增行已算过候选的校名直接沿用，只为新校名计算'''
+        school_df = build_school_df(["华东理工大学"]).drop(columns=["_match_name"])
+        known = {
+            "旧新增学院": {
+                merge.CANDIDATE_NAME_COLUMN: "沿用",
+                merge.CANDIDATE_SCORE_COLUMN: 1.0,
+                merge.CANDIDATE_REVIEW_COLUMN: "否",
+            }
+        }
+
+        rows, computed = merge.build_appended_rows(
+            school_df, [("旧新增学院", "1"), ("华东理工学院", "2")], known
+        )
+        self.assertEqual(computed, 1)
+        self.assertEqual([row["序号"] for row in rows], [2, 3])
+        self.assertEqual(rows[0][merge.CANDIDATE_NAME_COLUMN], "沿用")
+        self.assertEqual(rows[1][merge.CANDIDATE_NAME_COLUMN], "华东理工大学")
+        self.assertEqual(merge.collect_candidates(rows)["旧新增学院"], known["旧新增学院"])
+
+
+class NameCandidateIndexTestCase(unittest.TestCase):
+
+    def test_alias_name_strips_brackets_and_campus(self):
+        '''别名去掉括号内容（全角 / 半角）和末尾「××校区」'''
+        self.assertEqual(merge.alias_name("山东大学（威海）"), "山东大学")
+        self.assertEqual(merge.alias_name("某某学院(原某某专科学校)"), "某某学院")
+        self.assertEqual(merge.alias_name("中国矿业大学徐海校区"), "中国矿业大学")
+        self.assertEqual(merge.alias_name("校区"), "校区")
+
+    def test_alias_hit_scores_at_least_alias_score(self):
+        '''别名相同的候选至少得 ALIAS_SCORE 分'''
+        index = merge.NameCandidateIndex(["山东大学", "山东师范大学"])
+        candidate, score = index.best_match("山东大学（威海）")
+        self.assertEqual(candidate, "山东大学")
+        self.assertGreaterEqual(score, merge.NameCandidateIndex.ALIAS_SCORE)
+
+    def test_bigram_dice_score(self):
+        '''无别名命中时按 bigram Dice 系数打分'''
+        index = merge.NameCandidateIndex(["华东理工大学", "华南农业大学"])
+        candidate, score = index.best_match("华东理工学院")
+        self.assertEqual(candidate, "华东理工大学")
+        # {华东,东理,理工,工学,学院} 与 {华东,东理,理工,工大,大学}：2*3/10
+        self.assertEqual(score, 0.6)
+
+    def test_frequent_bigrams_not_recalled(self):
+        '''只共享高频 bigram（如「大学」）的学校不被召回'''
+        names = ["甲乙大学", "丙丁大学", "戊己大学"]
+        index = merge.NameCandidateIndex(names, max_posting=2)
+        self.assertEqual(index.best_match("庚辛大学"), (None, 0.0))
+
+    def test_candidate_columns_thresholds(self):
+        '''低于最低分不给候选；达到接受分无需复核，其余需复核'''
+        index = merge.NameCandidateIndex(["华东理工大学", "清华大学"])
+
+        low = merge.build_candidate_columns(index, "完全无关")
+        self.assertTrue(pd.isna(low[merge.CANDIDATE_NAME_COLUMN]))
+        self.assertEqual(low[merge.CANDIDATE_REVIEW_COLUMN], "是")
+
+        review = merge.build_candidate_columns(index, "华东理工学院")
+        self.assertEqual(review[merge.CANDIDATE_NAME_COLUMN], "华东理工大学")
+        self.assertEqual(review[merge.CANDIDATE_REVIEW_COLUMN], "是")
+
+        accepted = merge.build_candidate_columns(index, "清华 大学")
+        self.assertEqual(accepted[merge.CANDIDATE_SCORE_COLUMN], 1.0)
+        self.assertEqual(accepted[merge.CANDIDATE_REVIEW_COLUMN], "否")
+
+
+if __name__ == "__main__":
+    unittest.main()
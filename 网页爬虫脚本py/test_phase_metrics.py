@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+from phase_metrics import (
+    MetricsRecorder,
+    PHASE_LABELS,
+    format_metrics_report,
+    load_metrics,
+    percentile,
+)
+
+
+def build_record(school, total, phases, outcome="成功", run_id="r1"):
+    return {
+        "run_id": run_id,
+        "school": school,
+        "target": "江西-2025",
+        "worker": 1,
+        "outcome": outcome,
+        "phases": phases,
+        "total": total,
+    }
+
+
+class PercentileTestCase(unittest.TestCase):
+
+    def test_nearest_rank(self):
+        '''最近秩法：p50 / p95 / p99 / p100 取对应秩的实际值'''
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile(values, 100), 100)
+
+    def test_small_samples(self):
+        '''样本很少时向上取秩，不做插值'''
+        self.assertEqual(percentile([3.0], 50), 3.0)
+        self.assertEqual(percentile([1.0, 2.0, 9.0], 50), 2.0)
+        self.assertEqual(percentile([1.0, 2.0, 9.0], 95), 9.0)
+        self.assertEqual(percentile([1.0, 2.0], 0), 1.0)
+
+    def test_empty(self):
+        '''空列表返回 0'''
+        self.assertEqual(percentile([], 95), 0.0)
+
+
+class FormatMetricsReportTestCase(unittest.TestCase):
+
+    def test_empty_records(self):
+        '''没有记录时给出提示'''
+        self.assertEqual(format_metrics_report([]), "【耗时】没有可统计的记录")
+
+    def test_report_phases_outcomes_and_slowest(self):
+        '''按登记顺序列出阶段，统计结果分布，列出最慢院校及其最慢阶段'''
+        records = [
+            build_record("甲大学", 3.0, {"goto": 1.0, "extract": 2.0}),
+            build_record("乙大学", 9.0, {"goto": 8.0, "custom": 1.0}, "异常: Timeout"),
+            build_record("丙大学", 1.0, {"goto": 0.5}, "本省未招生"),
+        ]
+        lines = format_metrics_report(records, top_n=2).splitlines()
+
+        self.assertEqual(lines[0], "【耗时】共 3 条记录（单位：秒）")
+        phase_names = [line.split()[0] for line in lines[2:7]]
+        self.assertEqual(
+            phase_names,
+            [
+                PHASE_LABELS["goto"].split()[0],
+                PHASE_LABELS["extract"],
+                PHASE_LABELS["total"],
+                "custom",
+                "结果分布：成功",
+            ],
+        )
+        goto_line = lines[2].split()
+        # 打开页面 goto | 次数 3 | p50 1.00 | p95 8.00 | p99 8.00 | 最大 8.00
+        self.assertEqual(goto_line[-5:], ["3", "1.00", "8.00", "8.00", "8.00"])
+
+        self.assertIn("  结果分布：成功 1，异常 1，本省未招生 1", lines)
+        self.assertEqual(lines[-3], "  最慢 2 所：")
+        self.assertTrue(lines[-2].strip().startswith("9.00s | 乙大学"))
+        self.assertTrue(lines[-2].endswith(f"最慢阶段 {PHASE_LABELS['goto']} 8.00s"))
+        self.assertIn("甲大学", lines[-1])
+
+    def test_record_without_phases(self):
+        '''没有阶段明细的记录只计入合计，不输出最慢阶段'''
+        report = format_metrics_report([build_record("甲大学", 2.0, {})])
+        self.assertIn(PHASE_LABELS["total"], report)
+        self.assertNotIn("最慢阶段", report)
+
+
+class LoadMetricsTestCase(unittest.TestCase):
+
+    def test_filters_run_and_skips_partial_line(self):
+        '''按 run_id 过滤，latest 取最后一次运行，跳过被打断的半行'''
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "metrics.jsonl")
+            recorder = MetricsRecorder(path)
+            recorder.write(build_record("甲大学", 1.0, {}, run_id="r1"))
+            recorder.write(build_record("乙大学", 2.0, {}, run_id="r2"))
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(build_record("丙大学", 3.0, {}, run_id="r2"))[:20])
+
+            self.assertEqual(len(load_metrics(path)), 2)
+            self.assertEqual(
+                [record["school"] for record in load_metrics(path, "latest")], ["乙大学"]
+            )
+            self.assertEqual(
+                [record["school"] for record in load_metrics(path, "r1")], ["甲大学"]
+            )
+            self.assertEqual(load_metrics(os.path.join(temp_dir, "missing.jsonl")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
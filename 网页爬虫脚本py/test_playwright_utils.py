@@ -0,0 +1,55 @@
+import unittest
+
+import playwright_utils
+from playwright_utils import ResourceBlocker
+
+
+def paused_event(url, resource_type):
+    return {"requestId": "r1", "resourceType": resource_type, "request": {"url": url}}
+
+
+class ResourceBlockerTestCase(unittest.TestCase):
+
+    def test_fetch_patterns_only_cover_blocked_requests(self):
+        '''Fetch 只暂停拦截类型与黑名单请求，不用匹配全部请求的「*」规则'''
+        blocker = ResourceBlocker("vt.quark.cn")
+        patterns = blocker.fetch_patterns()
+
+        self.assertIn({"urlPattern": "*", "resourceType": "Image"}, patterns)
+        self.assertIn({"urlPattern": "*mmstat.com*"}, patterns)
+        self.assertNotIn({"urlPattern": "*"}, patterns)
+
+    def test_image_fulfilled_with_transparent_gif(self):
+        '''图片返回透明 GIF 而不是中止'''
+        blocker = ResourceBlocker("gaokao.cn")
+        method, params = blocker._resolve_paused(paused_event("https://a.cn/x.png", "Image"))
+
+        self.assertEqual(method, "Fetch.fulfillRequest")
+        self.assertEqual(params["body"], playwright_utils.TRANSPARENT_GIF_BASE64)
+        self.assertEqual(blocker.blocked_by_type, {"image": 1})
+
+    def test_deny_pattern_failed_and_allow_pattern_wins(self):
+        '''黑名单请求中止；白名单优先放行'''
+        blocker = ResourceBlocker("gaokao.cn")
+        method, params = blocker._resolve_paused(
+            paused_event("https://hm.baidu.com/hm.js", "Script")
+        )
+        self.assertEqual((method, params["errorReason"]), ("Fetch.failRequest", "BlockedByClient"))
+
+        blocker.allow_patterns = ("hm.baidu.com",)
+        method, _ = blocker._resolve_paused(paused_event("https://hm.baidu.com/hm.js", "Script"))
+        self.assertEqual(method, "Fetch.continueRequest")
+        self.assertEqual(blocker.blocked_count, 1)
+
+    def test_service_initial_pages_not_blocked(self):
+        '''常驻服务原有的标签页不启用拦截，本次运行打开的标签页启用'''
+        service_page, own_page = object(), object()
+        context = type("FakeContext", (), {"pages": [service_page, own_page]})()
+        playwright_utils._SERVICE_SESSIONS[id(context)] = (None, [service_page])
+        self.addCleanup(playwright_utils._SERVICE_SESSIONS.pop, id(context), None)
+
+        self.assertEqual(playwright_utils._blockable_pages(context), [own_page])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+import quark_engine
+from quark_engine import QuarkExtractor, QuarkScrapeEngine, build_target_matrix
+
+
+class FakeExtractor(QuarkExtractor):
+    NAME = "假卡片"
+    RESULT_COLUMNS = ["查询院校名称", "专业"]
+    RESULT_FILE_LABEL = "假结果表"
+    METRICS_FILE_NAME = "假-耗时指标.jsonl"
+
+    def __init__(self, target_matrix, result_path=None, status_prefix="", outcomes=None):
+        super().__init__(target_matrix, result_path, status_prefix)
+        # (院校, 组合 label) -> 依次返回的结果文本
+        self.outcomes = outcomes or {}
+        self.calls = []
+
+    async def scrape_target(
+        self, page, row_index, school_name, target, worker_id, visit, phases
+    ):
+        self.calls.append((school_name, target["label"], dict(visit)))
+        visit["school_loaded"] = True
+        visit["page_school_name"] = school_name
+        pending = self.outcomes.get((school_name, target["label"]), ["成功"])
+        result_text = pending.pop(0) if len(pending) > 1 else pending[0]
+        status = "失败" if quark_engine.is_transient_result(result_text) else result_text
+        self.engine.save_status(row_index, target, status)
+        if result_text == "成功":
+            self.engine.append_result_rows([[school_name, "数学"]], target["result_path"])
+        return result_text
+
+
+def two_targets():
+    return build_target_matrix(["江西"], ["2025"], ["本科批"], ["首选物理", "首选历史"])
+
+
+class QuarkScrapeEngineTestCase(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.source_path = os.path.join(self.temp_dir.name, "普通高校.csv")
+        pd.DataFrame(
+            {"学校名称": ["甲大学", "乙大学"], "省份": ["江西", "湖北"], "主管部门": ["教育部", ""]}
+        ).to_csv(self.source_path, index=False, encoding="utf-8-sig")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def build_engine(self, extractors, **kwargs):
+        options = dict(enable_concurrent=False, enable_adaptive=False, enable_metrics=False)
+        options.update(kwargs)
+        engine = QuarkScrapeEngine(
+            extractors, self.source_path, self.source_path, **options
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            engine._init_status_table()
+            for extractor in extractors:
+                for target in extractor.targets:
+                    extractor.init_result_file(target["result_path"])
+        return engine
+
+    async def run_worker(self, engine):
+        queue = asyncio.Queue()
+        for index, row in engine.df.iterrows():
+            plan = engine._build_school_plan(row, {})
+            if plan:
+                queue.put_nowait((index, row["学校名称"], plan, 1, None))
+        # 去掉院校间隔与重试退避的随机等待
+        with mock.patch.object(quark_engine.random, "uniform", return_value=0), \
+                contextlib.redirect_stdout(io.StringIO()) as output:
+            await engine._worker(1, None, queue)
+        return output.getvalue()
+
+    def test_targets_status_columns_and_result_paths(self):
+        '''多组合时每个组合一列状态、一个结果表；提取器名称作状态列前缀'''
+        extractor = FakeExtractor(two_targets(), status_prefix="假卡片")
+        engine = self.build_engine([extractor])
+        self.assertEqual(
+            [target["status_column"] for target in extractor.targets],
+            ["假卡片状态-江西-2025-本科批-首选物理", "假卡片状态-江西-2025-本科批-首选历史"],
+        )
+        self.assertTrue(
+            extractor.targets[0]["result_path"].endswith("夸克-江西-2025-本科批-首选物理-假结果表.csv")
+        )
+        self.assertIn(extractor.targets[1]["status_column"], engine.df.columns)
+        self.assertEqual(engine.get_school_info(0)["院校省份"], "江西")
+
+    async def test_plan_skips_finished_targets(self):
+        '''已完成的组合不再进入计划，并计入跳过统计'''
+        extractor = FakeExtractor(two_targets())
+        engine = self.build_engine([extractor])
+        engine.df.loc[0, extractor.targets[0]["status_column"]] = "成功"
+        engine.df.loc[1, extractor.targets[0]["status_column"]] = "本省未招生"
+        engine.df.loc[1, extractor.targets[1]["status_column"]] = "无效数据"
+
+        status_counts = {}
+        plans = [engine._build_school_plan(row, status_counts) for _, row in engine.df.iterrows()]
+        self.assertEqual(plans[0], [(0, [extractor.targets[1]])])
+        self.assertEqual(plans[1], [])
+        self.assertEqual(status_counts, {"成功": 1, "本省未招生": 1, "无效数据": 1})
+
+    async def test_transient_failure_retried_then_succeeds(self):
+        '''只有临时性失败的组合退避后重试；结果行只追加成功的那次'''
+        extractor = FakeExtractor(
+            build_target_matrix(["江西"], ["2025"], ["本科批"], ["首选物理"]),
+            outcomes={("甲大学", "江西/2025/本科批/首选物理"): ["失败-未加载", "成功"]},
+        )
+        engine = self.build_engine([extractor])
+        output = await self.run_worker(engine)
+
+        self.assertEqual([call[0] for call in extractor.calls], ["甲大学", "乙大学", "甲大学"])
+        self.assertEqual(engine._retry_count, 1)
+        self.assertIn("1 个组合临时失败", output)
+        self.assertEqual(list(engine.df[extractor.targets[0]["status_column"]]), ["成功", "成功"])
+        result_df = pd.read_csv(extractor.targets[0]["result_path"], encoding="utf-8-sig")
+        self.assertEqual(sorted(result_df["查询院校名称"]), ["乙大学", "甲大学"])
+
+    async def test_no_retry_after_max_attempts(self):
+        '''达到尝试上限后不再重试，状态保留失败留给下次运行'''
+        extractor = FakeExtractor(
+            build_target_matrix(["江西"], ["2025"], ["本科批"], ["首选物理"]),
+            outcomes={("甲大学", "江西/2025/本科批/首选物理"): ["异常: Timeout"]},
+        )
+        engine = self.build_engine([extractor], retry_max_attempts=1)
+        await self.run_worker(engine)
+        self.assertEqual(engine._retry_count, 0)
+        self.assertEqual(engine.df.loc[0, extractor.targets[0]["status_column"]], "失败")
+
+    async def test_extractors_share_school_visit(self):
+        '''多个提取器依次运行：后一个提取器拿到院校页已打开的标记，但不复用前一个的卡片'''
+        matrix = build_target_matrix(["江西"], ["2025"], ["本科批"], ["首选物理"])
+        first = FakeExtractor(matrix, status_prefix="甲")
+        second = FakeExtractor(matrix, status_prefix="乙")
+        second.NAME = "另一卡片"
+        engine = self.build_engine([first, second])
+        output = await self.run_worker(engine)
+
+        self.assertFalse(first.calls[0][2]["school_loaded"])
+        self.assertTrue(second.calls[0][2]["school_loaded"])
+        self.assertIsNone(second.calls[0][2]["card"])
+        self.assertIn("假卡片 江西/2025/本科批/首选物理 成功；另一卡片 江西/2025/本科批/首选物理 成功", output)
+
+    def test_shard_reports_applied_by_coordinator(self):
+        '''分片回报的状态与结果行由协调进程写入'''
+        extractor = FakeExtractor(build_target_matrix(["江西"], ["2025"], ["本科批"], ["首选物理"]))
+        engine = self.build_engine([extractor])
+        target = extractor.targets[0]
+        engine._apply_shard_report("status", (1, target["status_column"]), "本省未招生")
+        engine._apply_shard_report("rows", target["result_path"], [["乙大学", "数学"]])
+
+        self.assertEqual(engine.df.loc[1, target["status_column"]], "本省未招生")
+        self.assertTrue(engine._status_dirty)
+        result_df = pd.read_csv(target["result_path"], encoding="utf-8-sig")
+        self.assertEqual(list(result_df["查询院校名称"]), ["乙大学"])
+
+    def test_extractor_spec_from_path_loaded_script(self):
+        '''按路径加载的脚本（5_ 合并爬取）里的提取器也能发给分片子进程重建'''
+        script_path = os.path.join(self.temp_dir.name, "9_假卡片脚本.py")
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write(
+                "from quark_engine import QuarkExtractor\n\n\n"
+                "class PathLoadedExtractor(QuarkExtractor):\n"
+                "    NAME = '按路径加载'\n"
+            )
+        module_name = "fake_path_loaded_script"
+        self.addCleanup(sys.modules.pop, module_name, None)
+        module = quark_engine.load_script_module(script_path, module_name)
+        extractor = module.PathLoadedExtractor(two_targets(), status_prefix="甲")
+
+        spec = pickle.loads(pickle.dumps(quark_engine.build_extractor_spec(extractor)))
+        # 子进程里尚未加载该模块：按模块文件重新加载
+        del sys.modules[module_name]
+        extractor_class = quark_engine.load_extractor_class(*spec[:3])
+        rebuilt = extractor_class(**spec[3])
+        self.assertEqual(extractor_class.NAME, "按路径加载")
+        self.assertEqual(rebuilt.status_prefix, "甲")
+        self.assertEqual(len(rebuilt.target_matrix), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,52 @@
 import os
 import time
+import asyncio
 import random
+import threading
+from datetime import datetime
 
 import pandas as pd
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-from playwright_utils import launch_browser, wait_for_manual_login
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from gaokao_plan import (
+    build_plan_rows,
+    describe_plan_request,
+    is_plan_response,
+    parse_plan_payload,
+    plan_request_params,
+)
+from playwright_utils import (
+    LOGIN_URL,
+    close_browser_async,
+    install_resource_blocking_async,
+    launch_browser_async,
+    wait_for_manual_login_async,
+)
+
+
+# 并发开关：True 时在同一登录态上下文中开多个标签页并发；False 时单标签页顺序执行
+ENABLE_CONCURRENT = True
+CONCURRENT_WORKERS = 3
+
+# 资源拦截：屏蔽图片 / 字体 / 视频 / 统计广告脚本，结束时打印拦截统计
+ENABLE_RESOURCE_BLOCKING = True
+
+# 抓取方式："network" 捕获页面自身（带签名）的招生计划接口响应直接解析，不改写参数重放；
+# 响应未覆盖江西全部科类 / 专业组、未捕获到或字段不符时自动回退到 "console_js"（注入控制台 JS 点击抓取）
+EXTRACTION_MODE = "network"
+PLAN_RESPONSE_TIMEOUT_MS = 8000
+# 接口模式连续失败（未捕获到响应或响应不可用）达到此次数后，本次运行后续直接用控制台 JS，
+# 不再让每所院校都白等 PLAN_RESPONSE_TIMEOUT_MS；任一次接口模式成功即清零
+NETWORK_MODE_MAX_FAILURES = 5
+
+# 批量落盘：状态与专业组结果先缓存在内存，每 N 所院校或每 T 秒写一次 Excel；
+# 正常结束 / Ctrl+C / 异常退出时都会在 finally 中把缓冲写完
+CHECKPOINT_EVERY_SCHOOLS = 20
+CHECKPOINT_INTERVAL_SEC = 60
+FILE_WRITE_MAX_RETRIES = 5
+FILE_WRITE_RETRY_DELAY_SEC = 0.3
+
+MAJOR_TABLE_SELECTOR = "#zs_plan .province_score_line_table table tbody tr td"
 
 
 class MajorsScraper:
@@ -14,44 +56,49 @@ class MajorsScraper:
         js_script_path,
         save_majors_excel_path,
         base_dir,
+        enable_concurrent=ENABLE_CONCURRENT,
+        concurrent_workers=CONCURRENT_WORKERS,
+        enable_resource_blocking=ENABLE_RESOURCE_BLOCKING,
+        checkpoint_every_schools=CHECKPOINT_EVERY_SCHOOLS,
+        checkpoint_interval_sec=CHECKPOINT_INTERVAL_SEC,
+        extraction_mode=EXTRACTION_MODE,
     ):
         self.gaokao_id_excel_path = gaokao_id_excel_path
         self.js_script_path = js_script_path
         self.save_majors_excel_path = save_majors_excel_path
         self.base_dir = base_dir
+        self.enable_concurrent = enable_concurrent
+        self.concurrent_workers = max(1, concurrent_workers if enable_concurrent else 1)
+        self.enable_resource_blocking = enable_resource_blocking
         self.df = None
         self.majors_df = None
-        self.gaokao_code = None
-        self.school_name = None
-        self.row_index = None
-        self.url = None
-        self.page = None
-        self.context = None
-        self.playwright = None
         self.js_code = None
+        self.checkpoint_every_schools = max(1, checkpoint_every_schools)
+        self.checkpoint_interval_sec = checkpoint_interval_sec
+        self._pending_majors_frames = []
+        self._pending_schools = 0
+        self._last_checkpoint_at = time.monotonic()
+        self._save_lock = threading.Lock()
+        self._checkpoint_lock = asyncio.Lock()
+        self.extraction_mode = extraction_mode
+        self.network_count = 0
+        self.console_js_count = 0
+        self.plan_response_miss_count = 0
+        self.goto_timeout_count = 0
+        self._network_failures = 0
 
     def _init_read_gaokao_id_map_excel(self):
         self.df = pd.read_excel(self.gaokao_id_excel_path)
 
-    def find_row(self, index):
-        row = self.df.loc[index]
-        self.school_name = row["院校名称"]
-
+    def _get_school_code(self, row):
         if "代码" in self.df.columns:
-            self.gaokao_code = row["代码"]
-        elif "高考教育映射代码" in self.df.columns:
-            self.gaokao_code = row["高考教育映射代码"]
-        else:
-            raise KeyError("Excel 中缺少「代码」或「高考教育映射代码」列")
+            return row["代码"]
+        if "高考教育映射代码" in self.df.columns:
+            return row["高考教育映射代码"]
+        raise KeyError("Excel 中缺少「代码」或「高考教育映射代码」列")
 
-    def prepare_url(self):
-        if self.gaokao_code is not None:
-            self.url = f"https://www.gaokao.cn/school/{self.gaokao_code}/provinceline"
-
-    def _init_browser(self):
-        self.playwright = sync_playwright().start()
-        self.context, self.page = launch_browser(self.playwright, self.base_dir)
-        wait_for_manual_login(self.page)
+    def _build_school_url(self, gaokao_code):
+        return f"https://www.gaokao.cn/school/{gaokao_code}/provinceline"
 
     def _init_js_script(self):
         with open(self.js_script_path, "r", encoding="utf-8") as f:
@@ -64,85 +111,319 @@ class MajorsScraper:
             self.majors_df = pd.DataFrame()
             self.majors_df.to_excel(self.save_majors_excel_path, index=False, header=False)
 
-    def _wait_for_element(self, selector, timeout_ms=4000):
+    async def _wait_for_element(self, page, selector, timeout_ms=4000):
         try:
-            self.page.wait_for_selector(selector, timeout=timeout_ms)
+            await page.wait_for_selector(selector, timeout=timeout_ms)
             return True
         except PlaywrightTimeoutError:
             print(f"等待元素 {selector} 超时")
             return False
 
-    def scrape_web(self):
+    async def _init_worker_pages(self, context, login_page):
+        """登录后创建 worker 标签页（同一浏览器窗口内的多个 tab）"""
+        worker_pages = []
+
+        for worker_id in range(self.concurrent_workers):
+            if worker_id == 0:
+                page = login_page
+            else:
+                page = await context.new_page()
+                await page.goto(LOGIN_URL, wait_until="domcontentloaded")
+                await page.evaluate(f"document.title = '[Worker {worker_id + 1}] 掌上高考'")
+
+            worker_pages.append(page)
+            print(f"  - Worker {worker_id + 1} 标签页已就绪")
+
+        return worker_pages
+
+    def _record_network_failure(self):
+        """接口模式失败计数；连续达到上限后本次运行改用控制台 JS。"""
+        self._network_failures += 1
+        if (
+            self.extraction_mode == "network"
+            and self._network_failures >= NETWORK_MODE_MAX_FAILURES
+        ):
+            self.extraction_mode = "console_js"
+            print(
+                f"【警告】接口模式已连续失败 {NETWORK_MODE_MAX_FAILURES} 次，"
+                f"本次运行后续直接使用控制台 JS"
+            )
+
+    async def _goto_school_page(self, page, url):
+        """
+        打开院校页；接口模式下同时捕获页面发出的招生计划响应（未捕获到返回 None）。
+        页面本身打开超时照常抛出 PlaywrightTimeoutError，由调用方按打开超时上报。
+        """
+        if self.extraction_mode != "network":
+            await page.goto(url, wait_until="domcontentloaded")
+            return None
+
+        page_loaded = False
+        try:
+            async with page.expect_response(
+                is_plan_response, timeout=PLAN_RESPONSE_TIMEOUT_MS
+            ) as response_info:
+                await page.goto(url, wait_until="domcontentloaded")
+                page_loaded = True
+            return await response_info.value
+        except PlaywrightTimeoutError:
+            if not page_loaded:
+                raise
+            self.plan_response_miss_count += 1
+            self._record_network_failure()
+            print("【提示】未捕获到招生计划接口响应，回退到控制台 JS")
+            return None
+
+    async def _extract_from_network(self, plan_response, school_name):
+        request = plan_response.request
+        try:
+            payload = await plan_response.json()
+        except (PlaywrightError, ValueError) as e:
+            print(f"【提示】招生计划接口响应无法解析，回退到控制台 JS：{e}")
+            return None
+
+        items, reason = parse_plan_payload(
+            plan_request_params(request.url, request.post_data), payload
+        )
+        if items is None:
+            print(
+                f"【提示】招生计划接口响应不完整（{reason}，"
+                f"{describe_plan_request(request.url, request.method)}），回退到控制台 JS"
+            )
+            return None
+
+        rows = build_plan_rows(school_name, items)
+        if rows is None:
+            print("【提示】招生计划接口字段与预期不符或无专业组，回退到控制台 JS")
+        return rows
+
+    async def _scrape_school(self, page, row_index, school_name, gaokao_code, worker_id):
+        url = self._build_school_url(gaokao_code)
+        status = "失败"
+
         try:
-            time.sleep(random.uniform(0.3, 0.8))
+            await page.bring_to_front()
+            await asyncio.sleep(random.uniform(0.3, 0.8))
 
-            self.page.goto(self.url, wait_until="domcontentloaded")
-            current_url = self.page.url.split("?")[0]
+            try:
+                plan_response = await self._goto_school_page(page, url)
+            except PlaywrightTimeoutError as e:
+                self.goto_timeout_count += 1
+                print(f"[W{worker_id}] 打开院校页超时：{url}，错误信息：{e}")
+                return
+            current_url = page.url.split("?")[0]
 
-            if current_url != self.url:
-                print(f"页面跳转失败，页面被重定向了：{self.url} -> {current_url}")
+            if current_url != url:
+                print(f"[W{worker_id}] 页面跳转失败，页面被重定向了：{url} -> {current_url}")
                 return
 
-            major_table_selector = "#zs_plan .province_score_line_table table tbody tr td"
+            if plan_response is not None:
+                school_majors_data = await self._extract_from_network(
+                    plan_response, school_name
+                )
+                if school_majors_data is not None:
+                    self._save_majors_result(school_majors_data)
+                    status = "成功"
+                    self.network_count += 1
+                    self._network_failures = 0
+                    return
+                self._record_network_failure()
 
-            if not self._wait_for_element(major_table_selector, 4000):
-                self.df.at[self.row_index, "状态"] = "失败"
-                print("未找到专业组单元格，等待超时或其他错误")
+            if not await self._wait_for_element(page, MAJOR_TABLE_SELECTOR, 4000):
+                print(f"[W{worker_id}] 未找到专业组单元格，等待超时或其他错误")
                 return
 
-            self.page.evaluate(self.js_code)
-            self.page.wait_for_selector("#schoolMajorsExcelDataStatus", timeout=36000)
+            await page.evaluate(self.js_code)
+            await page.wait_for_selector("#schoolMajorsExcelDataStatus", timeout=36000)
 
-            self.school_majors_data = self.page.evaluate(
-                "() => window.schoolMajorsExcelData"
-            )
+            school_majors_data = await page.evaluate("() => window.schoolMajorsExcelData")
 
-            self._save_majors_result()
-            self.df.at[self.row_index, "状态"] = "成功"
+            self._save_majors_result(school_majors_data)
+            status = "成功"
+            self.console_js_count += 1
 
         except PlaywrightTimeoutError as e:
-            self.df.at[self.row_index, "状态"] = "失败"
-            print(f"处理URL时超时：{self.url}，错误信息：{e}")
+            print(f"[W{worker_id}] 处理URL时超时：{url}，错误信息：{e}")
         except Exception as e:
-            self.df.at[self.row_index, "状态"] = "失败"
-            print(f"处理URL时出错：{self.url}，错误信息：{e}")
+            print(f"[W{worker_id}] 处理URL时出错：{url}，错误信息：{e}")
         finally:
-            self.save_gaokao_map_id_excel()
+            await self._save_status(row_index, status)
+            print(
+                f"[W{worker_id}] {status} | 行号 {row_index} | {school_name} | "
+                f"院校代码 {gaokao_code} | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            )
 
-    def save_gaokao_map_id_excel(self):
-        self.df.to_excel(self.gaokao_id_excel_path, index=False, header=False)
+    async def _worker(self, worker_id, page, queue):
+        while True:
+            try:
+                row_index, school_name, gaokao_code = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
 
-    def _save_majors_result(self):
-        python_2d_list = [list(row) for row in self.school_majors_data]
-        new_df = pd.DataFrame(python_2d_list)
-        self.majors_df = pd.concat([self.majors_df, new_df], ignore_index=True)
-        self.majors_df.to_excel(self.save_majors_excel_path, index=False, header=False)
+            await self._scrape_school(page, row_index, school_name, gaokao_code, worker_id)
+
+    def _write_excel_atomic(self, df, path, header):
+        """先写临时文件再替换，避免中断时留下半截 xlsx；文件被 Excel 占用时退避重试。"""
+        root, ext = os.path.splitext(path)
+        temp_path = f"{root}.tmp{ext}"
+        last_err = None
+
+        for attempt in range(FILE_WRITE_MAX_RETRIES):
+            try:
+                df.to_excel(temp_path, index=False, header=header)
+                os.replace(temp_path, path)
+                return
+            except PermissionError as err:
+                last_err = err
+                if attempt < FILE_WRITE_MAX_RETRIES - 1:
+                    time.sleep(FILE_WRITE_RETRY_DELAY_SEC * (attempt + 1))
+            finally:
+                if os.path.exists(temp_path):
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+
+        raise last_err
+
+    def _save_majors_result(self, school_majors_data):
+        python_2d_list = [list(row) for row in school_majors_data]
+        with self._save_lock:
+            self._pending_majors_frames.append(pd.DataFrame(python_2d_list))
+
+    async def _save_status(self, row_index, status):
+        with self._save_lock:
+            self.df.at[row_index, "状态"] = status
+            self._pending_schools += 1
+        await self._maybe_checkpoint()
+
+    async def _maybe_checkpoint(self):
+        elapsed = time.monotonic() - self._last_checkpoint_at
+        if self._checkpoint_lock.locked():
+            return  # 上一个检查点还在写，本次缓冲留给下一个
+        if (
+            self._pending_schools >= self.checkpoint_every_schools
+            or elapsed >= self.checkpoint_interval_sec
+        ):
+            await self.checkpoint()
+
+    def _write_checkpoint(self, frames, status_df):
+        """在线程池中执行：先写专业组明细，再写 id_map 状态；返回合并后的明细表。"""
+        majors_df = self.majors_df
+        if frames:
+            majors_df = pd.concat([majors_df, *frames], ignore_index=True)
+            self._write_excel_atomic(majors_df, self.save_majors_excel_path, header=False)
+        self._write_excel_atomic(status_df, self.gaokao_id_excel_path, header=False)
+        return majors_df
+
+    async def checkpoint(self):
+        """
+        把缓冲一次性写盘：锁内只取快照，Excel 写入放到线程池，不阻塞事件循环上的其他 worker。
+        先写专业组明细，再写 id_map 状态：中途中断时最多出现「结果已写、状态未写」，
+        下次重爬该校，不会出现「成功但无结果」。
+        写入失败（如文件被 Excel 占用）时把快照放回缓冲，下个检查点再试。
+        """
+        async with self._checkpoint_lock:
+            with self._save_lock:
+                if not self._pending_schools and not self._pending_majors_frames:
+                    return
+                frames = self._pending_majors_frames
+                schools = self._pending_schools
+                status_df = self.df.copy()
+                self._pending_majors_frames = []
+                self._pending_schools = 0
+
+            try:
+                self.majors_df = await asyncio.to_thread(
+                    self._write_checkpoint, frames, status_df
+                )
+            except PermissionError as e:
+                print(f"【警告】检查点写入失败（文件可能被 Excel 占用），稍后重试：{e}")
+                with self._save_lock:
+                    self._pending_majors_frames = frames + self._pending_majors_frames
+                    self._pending_schools += schools
+                self._last_checkpoint_at = time.monotonic()
+                return
+
+            print(f"【提示】检查点已保存：{schools} 所院校")
+            self._last_checkpoint_at = time.monotonic()
+
+    async def _run_async(self):
+        start_time = time.time()
 
-    def run(self):
         self._init_read_gaokao_id_map_excel()
-        self._init_browser()
         self._init_js_script()
         self._init_read_majors_excel()
 
-        try:
-            for index, row in self.df.iterrows():
-                if row["状态"] != "成功":
-                    self.row_index = index
-                    self.find_row(index)
-                    self.prepare_url()
-                    self.scrape_web()
-                    print(
-                        f"处理行号: {self.row_index}, 学校名称: {self.school_name}, "
-                        f"院校代码: {self.gaokao_code}"
+        pending_tasks = [
+            (index, row["院校名称"], self._get_school_code(row))
+            for index, row in self.df.iterrows()
+            if row["状态"] != "成功"
+        ]
+
+        if not pending_tasks:
+            print("没有待爬取的院校。")
+            return
+
+        async with async_playwright() as playwright:
+            context, login_page = await launch_browser_async(playwright, self.base_dir)
+            resource_blocker = None
+            worker_pages = []
+
+            try:
+                await wait_for_manual_login_async(login_page)
+                # 登录完成后再装拦截：登录二维码 / 验证码图片不能被替换成透明图
+                if self.enable_resource_blocking:
+                    resource_blocker = await install_resource_blocking_async(
+                        context, "gaokao.cn"
                     )
+                await login_page.evaluate("document.title = '[Worker 1] 掌上高考'")
 
-            self.save_gaokao_map_id_excel()
-            print("所有未成功的行已处理完成并保存。")
-        finally:
-            if self.context:
-                self.context.close()
-            if self.playwright:
-                self.playwright.stop()
+                print(f"\n正在打开 {self.concurrent_workers} 个并发标签页...")
+                worker_pages = await self._init_worker_pages(context, login_page)
+
+                queue = asyncio.Queue()
+                for task in pending_tasks:
+                    await queue.put(task)
+
+                mode_text = (
+                    f"并发 {self.concurrent_workers} 标签页"
+                    if self.enable_concurrent
+                    else "单标签页顺序执行"
+                )
+                print(f"开始爬取，共 {len(pending_tasks)} 所院校，模式：{mode_text}")
+
+                workers = [
+                    asyncio.create_task(
+                        self._worker(worker_id + 1, worker_pages[worker_id], queue)
+                    )
+                    for worker_id in range(self.concurrent_workers)
+                ]
+                await asyncio.gather(*workers)
+
+                print("所有未成功的行已处理完成。")
+                print(
+                    f"【提示】接口模式成功 {self.network_count} 所，"
+                    f"控制台 JS 成功 {self.console_js_count} 所；"
+                    f"未捕获到接口响应 {self.plan_response_miss_count} 次，"
+                    f"打开院校页超时 {self.goto_timeout_count} 次"
+                )
+            finally:
+                await self.checkpoint()
+
+                for page in worker_pages[1:]:
+                    if not page.is_closed():
+                        await page.close()
+
+                await close_browser_async(context)
+                if resource_blocker:
+                    print(resource_blocker.summary())
+
+        end_time = time.time()
+        print(f"脚本全部执行完成 >>>>>>>>> 处理总用时: {end_time - start_time:.2f} 秒")
+
+    def run(self):
+        asyncio.run(self._run_async())
 
 
 if __name__ == "__main__":
@@ -157,5 +438,7 @@ if __name__ == "__main__":
         js_script_path,
         save_majors_excel_path,
         current_dir,
+        enable_concurrent=ENABLE_CONCURRENT,
+        concurrent_workers=CONCURRENT_WORKERS,
     )
     scraper.run()